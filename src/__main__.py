@@ -0,0 +1,22 @@
+"""`python -m src` giriş noktası.
+
+`--profile-startup` verilirse import profiler'ı, `src.main`'in ağır
+import'larından (yaml, config, alerter, llm_analyzer) önce kurulur;
+böylece dökümde başlangıcın tamamı görünür.
+"""
+
+import sys
+
+# spawn/forkserver ile başlatılan `--workers` alt süreçleri bu modülü
+# `__mp_main__` olarak yeniden import eder; uygulama yalnızca ana süreçte başlar
+if __name__ == "__main__":
+    profiler = None
+    if "--profile-startup" in sys.argv:
+        from .startup_profile import ImportProfiler
+
+        profiler = ImportProfiler()
+        profiler.install()
+
+    from .main import main
+
+    main(profiler)
@@ -1,12 +1,24 @@
-"""Alarm gönderim modülü (Console + Email)."""
+"""Alarm gönderim modülü (Console + Email + SQLite + Webhook + NDJSON)."""
 
-import smtplib
+import json
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
+from dataclasses import asdict
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from pathlib import Path
 
 from .llm_analyzer import Alert
+from .resilience import backoff_delay
+from .tracing import record_notify_latency, span, stamp_notify_latency
+
+SEVERITY_COLORS = {
+    "critical": "#dc3545",
+    "error": "#dc3545",
+    "warning": "#ffc107",
+    "info": "#17a2b8"
+}
 
 
 class BaseAlerter(ABC):
@@ -17,6 +29,10 @@ class BaseAlerter(ABC):
         """Alarmları gönder."""
         pass
 
+    def close(self) -> None:
+        """Açık kaynakları (bağlantı, dosya) kapat."""
+        pass
+
 
 class ConsoleAlerter(BaseAlerter):
     """Terminal'e alarm yazdıran sınıf."""
@@ -60,6 +76,10 @@ class ConsoleAlerter(BaseAlerter):
             print(f"   Detay: {alert.details}")
             print(f"   Log: {alert.log_line[:100]}..." if len(alert.log_line) > 100 else f"   Log: {alert.log_line}")
             print(f"   Öneri: {alert.recommendation}")
+            if alert.degraded:
+                print("   Not: LLM erişilemedi, kural tabanlı yedek analiz")
+            if alert.notify_latency is not None:
+                print(f"   Gecikme: {alert.notify_latency:.1f}s (okuma -> bildirim)")
             print()
 
         print(f"{'='*60}")
@@ -90,12 +110,7 @@ class EmailAlerter(BaseAlerter):
 
     def _build_html_body(self, alerts: list[Alert]) -> str:
         """HTML email body oluştur."""
-        severity_colors = {
-            "critical": "#dc3545",
-            "error": "#dc3545",
-            "warning": "#ffc107",
-            "info": "#17a2b8"
-        }
+        severity_colors = SEVERITY_COLORS
 
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
@@ -144,6 +159,11 @@ class EmailAlerter(BaseAlerter):
         if not alerts:
             return True
 
+        # smtplib/email yalnızca email açıkken yüklenir (--once başlangıcı)
+        import smtplib
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
         try:
             msg = MIMEMultipart("alternative")
             msg["Subject"] = f"[LOG ALARM] {len(alerts)} yeni alarm tespit edildi"
@@ -176,6 +196,414 @@ class EmailAlerter(BaseAlerter):
             return False
 
 
+class SQLiteAlerter(BaseAlerter):
+    """Alarmları paylaşılan bir SQLite dosyasına yazan sınıf.
+
+    Çok worker'lı modda tüm worker'ların çıktısı tek bir depoda birleşir.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS alerts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT NOT NULL,
+        worker_id TEXT NOT NULL,
+        severity TEXT NOT NULL,
+        summary TEXT,
+        details TEXT,
+        log_line TEXT,
+        recommendation TEXT,
+        source_name TEXT,
+        source_type TEXT,
+        degraded INTEGER NOT NULL DEFAULT 0
+    )
+    """
+
+    def __init__(self, db_path: str, worker_id: str = ""):
+        import sqlite3
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.worker_id = worker_id
+        self._conn = sqlite3.connect(db_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self.SCHEMA)
+
+    def send(self, alerts: list[Alert]) -> bool:
+        """Alarmları veritabanına ekle."""
+        import sqlite3
+
+        if not alerts:
+            return True
+
+        timestamp = datetime.now().isoformat()
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO alerts(timestamp, worker_id, severity, summary, details, "
+                    "log_line, recommendation, source_name, source_type, degraded) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            timestamp, self.worker_id, a.severity, a.summary, a.details,
+                            a.log_line, a.recommendation, a.source_name, a.source_type,
+                            int(a.degraded)
+                        )
+                        for a in alerts
+                    ]
+                )
+            return True
+
+        except sqlite3.Error as e:
+            print(f"[HATA] Alarm veritabanına yazılamadı: {e}")
+            return False
+
+
+class WebhookAlerter(BaseAlerter):
+    """Alarmları JSON olarak bir HTTP endpoint'ine POST eden sınıf.
+
+    Keep-alive bağlantı havuzu paylaşılan bir `httpx.Client` ile sağlanır;
+    client ilk gönderimde oluşturulur. Alt sınıflar yalnızca
+    `build_payload`'ı değiştirir.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        name: str = "webhook",
+        headers: dict | None = None,
+        timeout: float = 10.0,
+        max_connections: int = 4
+    ):
+        self.url = url
+        self.name = name
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """HTTP client'ı (ilk erişimde oluşturulur)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+
+                    self._client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections
+                        ),
+                        timeout=self.timeout,
+                        headers=self.headers
+                    )
+        return self._client
+
+    def build_payload(self, alerts: list[Alert]) -> dict:
+        """Gönderilecek JSON gövdesi."""
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "count": len(alerts),
+            "alerts": [asdict(alert) for alert in alerts]
+        }
+
+    def send(self, alerts: list[Alert]) -> bool:
+        """Alarmları endpoint'e gönder; 2xx dışındaki yanıtlar başarısızdır."""
+        if not alerts:
+            return True
+
+        try:
+            response = self.client.post(self.url, json=self.build_payload(alerts))
+            if response.status_code >= 300:
+                print(f"[HATA] Webhook ({self.name}) yanıtı: HTTP {response.status_code}")
+                return False
+            return True
+
+        except Exception as e:
+            print(f"[HATA] Webhook ({self.name}) gönderimi başarısız: {e}")
+            return False
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+
+class SlackAlerter(WebhookAlerter):
+    """Slack (ve Mattermost gibi Slack-uyumlu) incoming webhook'u için alerter."""
+
+    def build_payload(self, alerts: list[Alert]) -> dict:
+        attachments = []
+        for alert in alerts:
+            text = f"{alert.details}\n`{alert.log_line[:300]}`\n*Öneri:* {alert.recommendation}"
+            if alert.degraded:
+                text += "\n_LLM erişilemedi, kural tabanlı yedek analiz_"
+            attachments.append({
+                "color": SEVERITY_COLORS.get(alert.severity.lower(), "#6c757d"),
+                "title": f"[{alert.severity.upper()}] {alert.summary}",
+                "text": text,
+                "footer": f"{alert.source_name} ({alert.source_type})"
+            })
+        return {"text": f"Log Alarm: {len(alerts)} yeni alarm", "attachments": attachments}
+
+
+class TeamsAlerter(WebhookAlerter):
+    """Microsoft Teams incoming webhook'u (MessageCard) için alerter."""
+
+    def build_payload(self, alerts: list[Alert]) -> dict:
+        peak = max(alerts, key=lambda a: a.severity_level)
+        return {
+            "@type": "MessageCard",
+            "@context": "https://schema.org/extensions",
+            "summary": f"Log Alarm: {len(alerts)} yeni alarm",
+            "themeColor": SEVERITY_COLORS.get(peak.severity.lower(), "#6c757d").lstrip("#"),
+            "title": f"Log Alarm: {len(alerts)} yeni alarm",
+            "sections": [
+                {
+                    "activityTitle": f"[{alert.severity.upper()}] {alert.summary}",
+                    "activitySubtitle": f"{alert.source_name} ({alert.source_type})",
+                    "text": alert.details,
+                    "facts": [
+                        {"name": "Log", "value": alert.log_line[:300]},
+                        {"name": "Öneri", "value": alert.recommendation}
+                    ]
+                }
+                for alert in alerts
+            ]
+        }
+
+
+class NDJSONFileAlerter(BaseAlerter):
+    """Alarmları satır başına bir JSON nesnesi olarak dosyaya ekleyen sınıf.
+
+    Dosya yalnızca sona ekleme (append) modunda açılır; `jq`, Vector,
+    Filebeat gibi araçlarla doğrudan okunabilir.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def send(self, alerts: list[Alert]) -> bool:
+        """Alarmları dosyaya ekle."""
+        if not alerts:
+            return True
+
+        timestamp = datetime.now().isoformat()
+        data = "".join(
+            json.dumps({"timestamp": timestamp, **asdict(alert)}, ensure_ascii=False) + "\n"
+            for alert in alerts
+        )
+        try:
+            with self._lock:
+                self._file.write(data)
+                self._file.flush()
+            return True
+
+        except OSError as e:
+            print(f"[HATA] Alarm dosyasına yazılamadı ({self.path}): {e}")
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class QueuedAlerter(BaseAlerter):
+    """Bir alerter'ı kendi kuyruğu ve worker thread'i arkasına alan sarmalayıcı.
+
+    `send` yalnızca kuyruğa ekler ve hemen döner; yavaş ya da erişilemeyen
+    bir hedef analiz döngüsünü ve diğer hedefleri bekletmez. Worker,
+    alarmları `batch_size`'a kadar (en fazla `linger_seconds` bekleyerek)
+    toplar ve başarısız gönderimi jitter'lı backoff ile tekrar dener.
+    Kuyruk doluysa yeni alarmlar düşürülür ve sayılır.
+    """
+
+    def __init__(
+        self,
+        alerter: BaseAlerter,
+        queue_size: int = 10000,
+        batch_size: int = 20,
+        linger_seconds: float = 0.5,
+        max_retries: int = 3,
+        retry_base_delay: float = 1.0,
+        retry_max_delay: float = 30.0
+    ):
+        self.alerter = alerter
+        self.name = getattr(alerter, "name", alerter.__class__.__name__)
+        self.batch_size = batch_size
+        self.linger_seconds = linger_seconds
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.sent = self.failed = self.dropped = self.retried = 0
+
+        self._queue: queue.Queue[Alert | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name=f"alerter-{self.name}", daemon=True)
+        self._thread.start()
+
+    def send(self, alerts: list[Alert]) -> bool:
+        """Alarmları kuyruğa ekle; hepsi sığdıysa True."""
+        accepted = True
+        for alert in alerts:
+            try:
+                self._queue.put_nowait(alert)
+            except queue.Full:
+                self.dropped += 1
+                accepted = False
+        if not accepted:
+            print(f"[UYARI] {self.name} kuyruğu dolu, alarmlar düşürüldü (toplam {self.dropped})")
+        return accepted
+
+    def _next_batch(self) -> tuple[list[Alert], bool]:
+        """Kuyruktan bir batch topla; (batch, kapanış istendi mi) döndür."""
+        first = self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.linger_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _deliver(self, batch: list[Alert]) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Alarmlar diğer hedeflerin thread'leriyle paylaşılır; damga kopyaya vurulur
+                stamped = stamp_notify_latency(batch)
+                with span(f"deliver:{self.name}", alerts=len(batch), attempt=attempt):
+                    ok = self.alerter.send(stamped)
+            except Exception as e:
+                print(f"[HATA] {self.name} gönderimi başarısız: {e}")
+                ok = False
+            if ok:
+                # Gecikme kuyrukta bekleme ve yeniden denemeler dahil, teslimde ölçülür
+                record_notify_latency(batch, self.name)
+                self.sent += len(batch)
+                return
+            if attempt < self.max_retries:
+                self.retried += 1
+                time.sleep(backoff_delay(attempt, self.retry_base_delay, self.retry_max_delay))
+
+        self.failed += len(batch)
+        print(f"[HATA] {self.name}: {len(batch)} alarm {self.max_retries + 1} denemede gönderilemedi")
+
+    def _run(self) -> None:
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._deliver(batch)
+            if stop:
+                return
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Kuyruktakileri gönder (en fazla `timeout` saniye bekle) ve kapat."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"[UYARI] {self.name} kuyruğu {timeout}s içinde boşaltılamadı")
+        self.alerter.close()
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retried": self.retried
+        }
+
+
+def create_webhook_alerter(webhook_config: dict) -> WebhookAlerter:
+    """`alerting.webhooks` girdisinden formatına uygun alerter oluştur."""
+    alerter_class = {
+        "generic": WebhookAlerter,
+        "slack": SlackAlerter,
+        "teams": TeamsAlerter
+    }.get(webhook_config.get("format", "generic"))
+    if alerter_class is None:
+        raise ValueError(f"Bilinmeyen webhook formatı: {webhook_config.get('format')}")
+
+    return alerter_class(
+        url=webhook_config["url"],
+        name=webhook_config.get("name", "webhook"),
+        headers=webhook_config.get("headers"),
+        timeout=webhook_config.get("timeout", 10.0),
+        max_connections=webhook_config.get("max_connections", 4)
+    )
+
+
+def build_alerters(config) -> list[BaseAlerter]:
+    """Config'deki hedeflerden alerter'ları kur (daemon ve web ortak kullanır).
+
+    Bir hedef kurulamazsa o ana kadar açılanlar kapatılır ve hata yükselir.
+    """
+    # Ağ ve dosya hedefleri kendi kuyruk/thread'leri arkasında çalışır;
+    # yavaş bir hedef analiz döngüsünü bekletmez
+    dispatch = config.alert_dispatch
+
+    def queued(alerter):
+        return QueuedAlerter(
+            alerter,
+            queue_size=dispatch.get("queue_size", 10000),
+            batch_size=dispatch.get("batch_size", 20),
+            linger_seconds=dispatch.get("linger_seconds", 0.5),
+            max_retries=dispatch.get("max_retries", 3),
+            retry_base_delay=dispatch.get("retry_base_delay", 1.0)
+        )
+
+    alerters = []
+    try:
+        # Console alerter
+        console_config = config.console_alerting
+        if console_config.get("enabled", True):
+            alerters.append(ConsoleAlerter(colored=console_config.get("colored", True)))
+
+        # Email alerter
+        email_config = config.email_alerting
+        if email_config.get("enabled", False):
+            alerters.append(queued(
+                EmailAlerter(
+                    smtp_host=email_config["smtp_host"],
+                    smtp_port=email_config["smtp_port"],
+                    username=email_config["username"],
+                    password=email_config["password"],
+                    from_addr=email_config["from_addr"],
+                    to_addrs=email_config["to_addrs"]
+                )
+            ))
+
+        # Webhook / Slack / Teams
+        for webhook_config in config.webhook_alerting:
+            if webhook_config.get("enabled", True):
+                alerters.append(queued(create_webhook_alerter(webhook_config)))
+
+        # NDJSON dosyası
+        file_config = config.file_alerting
+        if file_config.get("enabled", False):
+            alerters.append(
+                queued(NDJSONFileAlerter(file_config.get("path", "./alerts/alerts.ndjson")))
+            )
+    except Exception:
+        for alerter in alerters:
+            alerter.close()
+        raise
+
+    return alerters
+
+
 class AlertManager:
     """Birden fazla alerter'ı yöneten sınıf."""
 
@@ -187,9 +615,36 @@ class AlertManager:
         self.alerters.append(alerter)
 
     def send_all(self, alerts: list[Alert]) -> dict[str, bool]:
-        """Tüm alerter'lara gönder."""
+        """Tüm alerter'lara gönder.
+
+        Kuyruklu alerter'larda sonuç yalnızca kuyruğa alınıp alınmadığıdır;
+        okuma -> bildirim gecikmesi (`notify_latency`) onların worker'ında,
+        teslimden sonra ölçülür. Senkron alerter'larda ölçüm burada, başarılı
+        gönderimden sonra yapılır.
+        """
         results = {}
-        for alerter in self.alerters:
-            name = alerter.__class__.__name__
-            results[name] = alerter.send(alerts)
+        with span("send_all", alerts=len(alerts)):
+            for alerter in self.alerters:
+                name = getattr(alerter, "name", alerter.__class__.__name__)
+                if isinstance(alerter, QueuedAlerter):
+                    results[name] = alerter.send(alerts)
+                    continue
+                results[name] = alerter.send(stamp_notify_latency(alerts))
+                if results[name]:
+                    record_notify_latency(alerts, name)
         return results
+
+    def close(self, exclude: list[BaseAlerter] | None = None) -> None:
+        """Kuyrukları boşaltıp alerter'ları kapat (`exclude` dışındakileri)."""
+        for alerter in self.alerters:
+            if exclude and alerter in exclude:
+                continue
+            alerter.close()
+
+    def stats(self) -> dict[str, dict]:
+        """Kuyruklu alerter'ların sayaçları."""
+        return {
+            alerter.name: alerter.stats()
+            for alerter in self.alerters
+            if isinstance(alerter, QueuedAlerter)
+        }
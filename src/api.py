@@ -1,19 +1,29 @@
 """FastAPI Web API."""
 
 import asyncio
+import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
+from .alerter import AlertManager, build_alerters
 from .config import Config
-from .llm_analyzer import Alert, LLMAnalyzer
+from .incidents import IncidentEngine, create_incident_engine
+from .llm_analyzer import Alert, LLMAnalyzer, create_analyzer
 from .log_reader import LogReader
+from .receivers import IngestBuffer, SyslogReceiver, create_syslog_receiver
+from .sampling import AdaptiveSampler, create_sampler, merge_stats as merge_sampling_stats
+from .scheduler import SourceScheduler, create_scheduler, merge_stats as merge_scheduler_stats
+from .search_index import SearchIndex, create_search_index
+from .stats_store import StatsStore, create_stats_store
+from .tracing import configure_tracing, get_tracer, record_notify_latency, span
 
 app = FastAPI(title="Log Alarm LLM", version="0.1.0")
 
@@ -31,6 +41,18 @@ config: Optional[Config] = None
 log_reader: Optional[LogReader] = None
 analyzer: Optional[LLMAnalyzer] = None
 alert_history: list[dict] = []
+ingest_buffer: Optional[IngestBuffer] = None
+syslog_receiver: Optional[SyslogReceiver] = None
+search_index: Optional[SearchIndex] = None
+scheduler: Optional[SourceScheduler] = None
+sampler: Optional[AdaptiveSampler] = None
+stats_store: Optional[StatsStore] = None
+incident_engine: Optional[IncidentEngine] = None
+alert_manager = AlertManager()
+alert_counter = 0
+# Analyzer (korelasyon indeksi, breaker'lar, retry bütçesi), örnekleyici ve
+# zamanlayıcı thread-safe değil; ingest turu ve /api/analyze sırayla kullanır
+analysis_lock = threading.Lock()
 
 
 class AnalyzeRequest(BaseModel):
@@ -47,17 +69,132 @@ class LogLine(BaseModel):
 @app.on_event("startup")
 async def startup():
     """Uygulama başlangıcında config yükle."""
-    global config, log_reader, analyzer
+    global config, log_reader, analyzer, ingest_buffer, syslog_receiver, search_index, scheduler, sampler
+    global incident_engine
 
     config = Config()
+    configure_tracing(config.tracing)
     log_reader = LogReader(config.log_sources)
-    analyzer = LLMAnalyzer(
-        api_key=config.openai_api_key,
-        model=config.openai_model,
-        max_tokens=config.openai_max_tokens,
-        prompt_template=config.prompt_template,
-        severity_threshold=config.severity_threshold
+    analyzer = create_analyzer(config)
+    scheduler = create_scheduler(config)
+    sampler = create_sampler(config.sampling)
+    incident_engine = create_incident_engine(config.incidents)
+    search_index = create_search_index(config.search)
+    # Ağdan alınan satırların alarmları dosya kaynaklarınınkiyle aynı hedeflere gider
+    for alerter in build_alerters(config):
+        alert_manager.add_alerter(alerter)
+
+    network_config = config.network_sources
+    ingest_buffer = IngestBuffer(
+        max_size=network_config.get("buffer_size", 10000),
+        max_lines_per_sender=network_config.get("max_lines_per_sender", 0),
+        max_senders=network_config.get("max_senders", 1024),
+        max_sources=network_config.get("max_sources", 256)
     )
+    syslog_receiver = create_syslog_receiver(network_config, ingest_buffer)
+    if syslog_receiver is not None:
+        await syslog_receiver.start()
+
+    flush_interval = (network_config.get("http") or {}).get("flush_interval", 5)
+    asyncio.create_task(_flush_ingest_buffer(flush_interval))
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Ağ alıcılarını kapat, alarm kuyruklarını boşalt ve backend bağlantılarını kapat."""
+    if syslog_receiver is not None:
+        await syslog_receiver.stop()
+    await asyncio.to_thread(alert_manager.close)
+    if analyzer is not None:
+        analyzer.close()
+    if stats_store is not None:
+        stats_store.close()
+
+
+def _record_alerts(alerts: list[Alert], notify: bool = False) -> None:
+    """Alarmları geçmişe ekle (son 100 alarm tutulur).
+
+    `notify` ise alarmlar (olay motoru açıksa olay bildirimleri olarak)
+    daemon'daki gibi yapılandırılmış hedeflere de gönderilir. Ağ ve dosya
+    hedefleri kuyruklu olduğundan gönderim event loop'u bekletmez.
+    """
+    global alert_history, alert_counter
+
+    if notify:
+        _notify(alerts)
+    else:
+        record_notify_latency(alerts)
+        if incident_engine is not None:
+            incident_engine.ingest(alerts)
+
+    timestamp = datetime.now().isoformat()
+    for alert in alerts:
+        alert_counter += 1
+        alert_history.append({
+            "id": alert_counter,
+            "timestamp": timestamp,
+            "severity": alert.severity,
+            "summary": alert.summary,
+            "details": alert.details,
+            "log_line": alert.log_line,
+            "recommendation": alert.recommendation,
+            "source_name": alert.source_name,
+            "source_type": alert.source_type,
+            "incident_id": alert.incident_id,
+            "notify_latency": alert.notify_latency
+        })
+
+    alert_history = alert_history[-100:]
+
+
+def _notify(alerts: list[Alert]) -> None:
+    """Alarmları hedeflere gönder (olay motoru açıksa olay bildirimleri olarak)."""
+    if not alerts:
+        return
+    if incident_engine is None:
+        alert_manager.send_all(alerts)
+        return
+
+    notifications = incident_engine.notifications(alerts)
+    if config.incidents.get("notify", "incident") == "alert":
+        alert_manager.send_all(alerts)
+    elif notifications:
+        alert_manager.send_all(notifications)
+
+
+def _analyze_ingested(entries: list) -> list[Alert]:
+    """Tampondan alınan satırları indeksle, örnekle, kotala ve analiz et."""
+    with analysis_lock, get_tracer().profile("ingest turu"), span("tick"):
+        if search_index is not None:
+            with span("search_index"):
+                search_index.add(entries)
+        summaries = {}
+        candidates = entries
+        with span("select"):
+            if sampler is not None:
+                candidates, summaries = sampler.process(entries)
+            admitted, overflow = scheduler.schedule(candidates)
+        for name, text in overflow.items():
+            summaries[name] = f"{summaries[name]}\n{text}" if name in summaries else text
+        with span("analyze_batch", lines=len(admitted)):
+            return analyzer.analyze_batch(admitted, config.batch_size, summaries)
+
+
+async def _flush_ingest_buffer(interval: float) -> None:
+    """Ağdan gelen satırları periyodik olarak analiz et."""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(interval)
+        entries = ingest_buffer.drain()
+        if not entries:
+            continue
+        try:
+            # Analiz bloklayıcı, event loop'u tutmasın
+            alerts = await loop.run_in_executor(None, _analyze_ingested, entries)
+            _record_alerts(alerts, notify=True)
+            get_tracer().end_tick()
+        except Exception as e:
+            print(f"[HATA] Ingest analizi başarısız: {e}")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -85,6 +222,64 @@ async def get_sources():
     }
 
 
+def _parse_time(value: Optional[str]) -> Optional[float]:
+    """ISO zaman parametresini epoch saniyeye çevir."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Geçersiz zaman: {value}")
+
+
+@app.get("/api/logs/search")
+async def search_logs(
+    q: str = "",
+    source: Optional[str] = None,
+    type: Optional[str] = None,
+    level: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    page: int = 1,
+    page_size: int = 50
+):
+    """Alınan loglarda terim, alan ve zaman aralığına göre ara."""
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="Arama indeksi kapalı")
+
+    page = max(1, page)
+    page_size = min(max(1, page_size), 500)
+    return await asyncio.to_thread(
+        search_index.search,
+        term=q,
+        source=source,
+        source_type=type,
+        level=level,
+        since=_parse_time(since),
+        until=_parse_time(until),
+        page=page,
+        page_size=page_size
+    )
+
+
+@app.get("/api/logs/context")
+async def get_log_context(id: str, before: int = 5, after: int = 5):
+    """Arama sonucundaki bir satırın (`bölüm:id`) çevresindeki satırlar."""
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="Arama indeksi kapalı")
+
+    partition, _, entry_id = id.partition(":")
+    if not entry_id.isdigit():
+        raise HTTPException(status_code=400, detail=f"Geçersiz satır id: {id}")
+
+    lines = await asyncio.to_thread(
+        search_index.context, partition, int(entry_id), min(before, 100), min(after, 100)
+    )
+    if not lines:
+        raise HTTPException(status_code=404, detail=f"Satır bulunamadı: {id}")
+    return {"id": id, "lines": lines}
+
+
 @app.get("/api/logs/{source_name}")
 async def get_logs(source_name: str, lines: int = 50):
     """Belirli bir kaynaktan son logları getir."""
@@ -108,49 +303,41 @@ async def get_logs(source_name: str, lines: int = 50):
     }
 
 
+def _analyze_requested(sources: list[dict], line_count: int) -> tuple[int, list[Alert]]:
+    """Kaynakların son satırlarını oku ve analiz et (bloklayıcı, thread'de çalışır)."""
+    entries = []
+    for source in sources:
+        entries.extend(log_reader.read_last_n_lines(source, n=line_count))
+    if not entries:
+        return 0, []
+
+    with analysis_lock, get_tracer().profile("/api/analyze"), span("analyze_batch", lines=len(entries)):
+        return len(entries), analyzer.analyze_batch(entries, config.batch_size)
+
+
 @app.post("/api/analyze")
 async def analyze_logs(request: AnalyzeRequest):
-    """Logları analiz et ve alarmları döndür."""
-    global alert_history
-
-    entries = []
+    """Logları analiz et ve alarmları döndür.
 
+    Okuma ve analiz (retry backoff'ları dahil) event loop'u bloklamasın diye
+    bir thread'de, ingest turlarıyla sırayla çalışır.
+    """
+    sources = config.log_sources
     if request.source_name:
         # Tek kaynak
-        source = next((s for s in config.log_sources if s["name"] == request.source_name), None)
-        if not source:
+        sources = [s for s in sources if s["name"] == request.source_name]
+        if not sources:
             raise HTTPException(status_code=404, detail=f"Kaynak bulunamadı: {request.source_name}")
-        entries = log_reader.read_last_n_lines(source, n=request.line_count)
-    else:
-        # Tüm kaynaklar
-        for source in config.log_sources:
-            entries.extend(log_reader.read_last_n_lines(source, n=request.line_count))
 
-    if not entries:
+    analyzed_lines, alerts = await asyncio.to_thread(_analyze_requested, sources, request.line_count)
+    if not analyzed_lines:
         return {"alerts": [], "message": "Analiz edilecek log bulunamadı"}
 
-    # Analiz
-    alerts = analyzer.analyze_batch(entries, config.batch_size)
-
     # Geçmişe ekle
-    timestamp = datetime.now().isoformat()
-    for alert in alerts:
-        alert_history.append({
-            "timestamp": timestamp,
-            "severity": alert.severity,
-            "summary": alert.summary,
-            "details": alert.details,
-            "log_line": alert.log_line,
-            "recommendation": alert.recommendation,
-            "source_name": alert.source_name,
-            "source_type": alert.source_type
-        })
-
-    # Son 100 alarm tut
-    alert_history = alert_history[-100:]
+    _record_alerts(alerts)
 
     return {
-        "analyzed_lines": len(entries),
+        "analyzed_lines": analyzed_lines,
         "alert_count": len(alerts),
         "alerts": [
             {
@@ -166,6 +353,185 @@ async def analyze_logs(request: AnalyzeRequest):
     }
 
 
+@app.post("/api/ingest", status_code=202)
+async def ingest_logs(request: Request):
+    """NDJSON formatında toplu log al.
+
+    Her satır ya `{"source": ..., "type": ..., "line": ...}` nesnesi ya da
+    düz bir JSON string'idir. Gövde satır satır stream edilir ve ortak
+    tampona yazılır; satırlar dosya kaynaklarıyla aynı batch/analiz
+    hattından geçer. Gövde `max_body_bytes`'ı aşarsa 413 döner (o ana
+    kadar okunan satırlar tampondadır).
+    """
+    http_config = config.network_sources.get("http") or {}
+    if not http_config.get("enabled", True):
+        raise HTTPException(status_code=404, detail="HTTP ingest kapalı")
+
+    max_body = http_config.get("max_body_bytes", 10 * 1024 * 1024)
+    max_source_length = http_config.get("max_source_length", 128)
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_body:
+        raise HTTPException(status_code=413, detail=f"Gövde en fazla {max_body} bayt olabilir")
+
+    sender = request.client.host if request.client else "unknown"
+    counts = {"accepted": 0, "dropped": 0, "rejected": 0}
+
+    def handle(raw: bytes) -> None:
+        if not raw.strip():
+            return
+        try:
+            item = json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            counts["rejected"] += 1
+            return
+
+        if isinstance(item, str):
+            item = {"line": item}
+        if not isinstance(item, dict) or not isinstance(item.get("line") or item.get("message"), str):
+            counts["rejected"] += 1
+            return
+
+        source = item.get("source", "http")
+        if (
+            not isinstance(source, str)
+            or len(source) > max_source_length
+            or not ingest_buffer.accepts_source(source)
+        ):
+            counts["rejected"] += 1
+            return
+
+        ok = ingest_buffer.push(
+            sender,
+            source,
+            item.get("type", "application"),
+            item.get("line") or item.get("message")
+        )
+        counts["accepted" if ok else "dropped"] += 1
+
+    received = 0
+    pending = b""
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_body:
+            raise HTTPException(status_code=413, detail=f"Gövde en fazla {max_body} bayt olabilir")
+        *lines, pending = (pending + chunk).split(b"\n")
+        for raw in lines:
+            handle(raw)
+    handle(pending)
+
+    return counts
+
+
+@app.get("/api/ingest/stats")
+async def get_ingest_stats():
+    """Ingest tamponu ve gönderici bazlı sayaçlar."""
+    return ingest_buffer.stats()
+
+
+def _daemon_stats(kind: str) -> dict[str, dict]:
+    """Daemon worker'larının paylaşılan depoya yayınladığı `kind` istatistikleri.
+
+    Depo salt okunur açılır; daemon web'den sonra başlamışsa dosya
+    oluştuğu ilk istekte açılır. Depo yoksa boş döner.
+    """
+    global stats_store
+    if stats_store is None:
+        stats_store = create_stats_store(config.stats, readonly=True)
+        if stats_store is None:
+            return {}
+    return stats_store.read(kind, config.stats.get("max_age", 300))
+
+
+@app.get("/api/scheduler")
+async def get_scheduler_stats():
+    """Kaynak bazlı öncelik, kota kullanımı ve gecikme.
+
+    Web sürecinin (ingest) sayaçları daemon worker'larının her turda
+    yayınladıklarıyla birleştirilir: sayaçlar toplanır, kota kullanımı
+    ve gecikmede en yüksek değer alınır. `daemons` her worker'ın son
+    yayın zamanıdır.
+    """
+    daemons = await asyncio.to_thread(_daemon_stats, "scheduler")
+    merged = merge_scheduler_stats([scheduler.stats(), *(d["data"] for d in daemons.values())])
+    return {**merged, "daemons": {worker: d["updated_at"] for worker, d in daemons.items()}}
+
+
+@app.get("/api/sampling")
+async def get_sampling_stats():
+    """Kaynak bazlı pencere sayaçları (satır, seviye, farklı IP/kullanıcı).
+
+    Web sürecinin (ingest) sayaçları daemon worker'larının her turda
+    yayınladıklarıyla birleştirilir; farklı IP/kullanıcı sayıları HLL
+    birleşimiyle hesaplanır. `daemons` her worker'ın son yayın zamanıdır.
+    """
+    daemons = await asyncio.to_thread(_daemon_stats, "sampling")
+    if sampler is None and not daemons:
+        raise HTTPException(status_code=404, detail="Örnekleme kapalı")
+    exports = [sampler.export()] if sampler is not None else []
+    sources = merge_sampling_stats([*exports, *(d["data"] for d in daemons.values())])
+    return {"sources": sources, "daemons": {worker: d["updated_at"] for worker, d in daemons.items()}}
+
+
+@app.get("/api/incidents")
+async def get_incidents(status: Optional[str] = None, limit: int = 50):
+    """Olayları en son güncellenen önce listele (`status`: open/resolved)."""
+    if incident_engine is None:
+        raise HTTPException(status_code=404, detail="Olay gruplama kapalı")
+    incidents = incident_engine.list_incidents(status, min(max(1, limit), 500))
+    return {"count": len(incidents), "incidents": incidents}
+
+
+@app.get("/api/incidents/{incident_id}")
+async def get_incident(incident_id: int):
+    """Tek bir olayın özeti ve son alarmları."""
+    if incident_engine is None:
+        raise HTTPException(status_code=404, detail="Olay gruplama kapalı")
+    incident = incident_engine.get(incident_id)
+    if incident is None:
+        raise HTTPException(status_code=404, detail=f"Olay bulunamadı: {incident_id}")
+    return incident.to_dict(incident_engine.window_seconds, with_samples=True)
+
+
+@app.get("/api/debug/timings")
+async def get_debug_timings(profile: bool = False):
+    """Aşama bazlı süre yüzdelikleri, son turun dökümü ve son cProfile çıktısı.
+
+    `profile=true` bir sonraki analizin (ingest turu veya /api/analyze)
+    cProfile ile ölçülmesini ister; sonuç sonraki çağrılarda `last_profile`'da.
+    Üst düzey alanlar web sürecine aittir. Tracing açık daemon worker'larının
+    her turda `stats.path` deposuna yayınladığı ölçümler `daemons` altındadır
+    (daemon profili SIGUSR1 ile istenir).
+    """
+    tracer = get_tracer()
+    if profile:
+        tracer.request_profile()
+    daemons = await asyncio.to_thread(_daemon_stats, "timings")
+    return {
+        "enabled": tracer.enabled,
+        **tracer.timings(),
+        "profile_requested": tracer.profile_requested,
+        "last_profile": tracer.last_profile,
+        "daemons": {worker: {"updated_at": d["updated_at"], **d["data"]} for worker, d in daemons.items()}
+    }
+
+
+@app.get("/api/alerts/{alert_id}/context")
+async def get_alert_context(alert_id: int, before: int = 5, after: int = 5):
+    """Bir alarmın log satırını indekste bul ve çevresindeki satırları getir."""
+    if search_index is None:
+        raise HTTPException(status_code=404, detail="Arama indeksi kapalı")
+
+    alert = next((a for a in alert_history if a.get("id") == alert_id), None)
+    if alert is None:
+        raise HTTPException(status_code=404, detail=f"Alarm bulunamadı: {alert_id}")
+
+    hit = await asyncio.to_thread(search_index.find_line, alert["source_name"], alert["log_line"])
+    if hit is None:
+        raise HTTPException(status_code=404, detail="Alarm satırı indekste bulunamadı")
+
+    return await get_log_context(hit["id"], before, after)
+
+
 @app.get("/api/alerts/history")
 async def get_alert_history(limit: int = 50):
     """Alarm geçmişini getir."""
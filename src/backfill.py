@@ -0,0 +1,362 @@
+"""Dönmüş ve sıkıştırılmış log arşivleri üzerinde geçmişe dönük (backfill) analiz."""
+
+import bz2
+import glob
+import gzip
+import lzma
+import os
+import pickle
+import re
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import BinaryIO, Generator, Iterator
+
+from .log_reader import LogEntry
+
+try:
+    import zstandard
+except ImportError:  # Opsiyonel bağımlılık
+    zstandard = None
+
+CHUNK_SIZE = 1024 * 1024
+
+# Worker'dan ana sürece tek seferde aktarılan en fazla satır sayısı
+BATCH_LINES = 10000
+
+# Binary search bu aralığa inince lineer taramaya geçilir
+SEARCH_RESOLUTION = 64 * 1024
+
+MONTHS = {
+    m: i for i, m in enumerate(
+        ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"],
+        start=1
+    )
+}
+
+# [16/Dec/2025:10:00:01 +0000] (nginx/apache)
+CLF_PATTERN = re.compile(rb"\[(\d{2})/(\w{3})/(\d{4}):(\d{2}):(\d{2}):(\d{2})")
+# 2025-12-16 10:00:01 / 2025-12-16T10:00:01
+ISO_PATTERN = re.compile(rb"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})")
+# Dec 16 10:00:01 (syslog, yılsız)
+SYSLOG_PATTERN = re.compile(rb"^(\w{3}) +(\d{1,2}) (\d{2}):(\d{2}):(\d{2})")
+
+COMPRESSED_SUFFIXES = {".gz", ".bz2", ".xz", ".zst"}
+
+# logrotate `dateext`: access.log-20251216, access.log-2025-12-16, access.log-2025121612
+DATE_SUFFIX_PATTERN = re.compile(r"(\d{4})-?(\d{2})-?(\d{2})(?:-?(\d{2}))?(?!\d)")
+
+
+def parse_timestamp(line: bytes, year_hint: int, reference: datetime | None = None) -> datetime | None:
+    """Satırdaki zaman damgasını çözümle; yılsız formatlarda `year_hint` kullanılır.
+
+    `reference` (dosyanın son yazılma zamanı) verilirse, yılsız bir zaman
+    damgası ondan bir günden fazla ileride kalıyorsa önceki yıla aittir;
+    Aralık satırları Ocak'ta sıkıştırılan ya da kopyalanan arşivlerde
+    yanlış yıla düşmez.
+    """
+    try:
+        match = ISO_PATTERN.search(line, 0, 64)
+        if match:
+            return datetime(*(int(g) for g in match.groups()))
+
+        match = CLF_PATTERN.search(line, 0, 128)
+        if match:
+            day, month, year, hour, minute, second = match.groups()
+            return datetime(
+                int(year), MONTHS[month.decode()], int(day),
+                int(hour), int(minute), int(second)
+            )
+
+        match = SYSLOG_PATTERN.match(line)
+        if match:
+            month, day, hour, minute, second = match.groups()
+            month = MONTHS[month.decode()]
+            ts = datetime(year_hint, month, int(day), int(hour), int(minute), int(second))
+            if reference is not None and ts > reference + timedelta(days=1):
+                ts = datetime(year_hint - 1, month, int(day), int(hour), int(minute), int(second))
+            return ts
+    except (KeyError, ValueError):
+        pass
+    return None
+
+
+def _rotation_key(path: str, base: str) -> tuple:
+    """Arşivin yaşına göre sıralama anahtarı (küçük = daha eski).
+
+    Tarih sonekli arşivler (access.log-20251216) tarihe göre, numaralı
+    arşivler (access.log.2.gz) indeksin tersine göre sıralanır; aktif
+    dosya en sondadır. Tarih soneki indeks olarak okunmaz.
+    """
+    suffix = path[len(base):].lstrip(".-")
+    if not suffix:
+        return (2, 0)
+    match = DATE_SUFFIX_PATTERN.match(suffix)
+    if match:
+        year, month, day, hour = match.groups()
+        try:
+            return (0, datetime(int(year), int(month), int(day), int(hour or 0)).timestamp())
+        except ValueError:
+            pass
+    match = re.match(r"(\d+)", suffix)
+    if match:
+        return (1, -int(match.group(1)))
+    return (1, -1)
+
+
+def expand_source_files(source: dict) -> list[Path]:
+    """Kaynağın aktif dosyası ve dönmüş arşivlerini eskiden yeniye sırala.
+
+    Varsayılan desen `<path>*`'tır; kaynakta `archive_glob` ile
+    değiştirilebilir (örn. `/var/log/nginx/access.log-*`).
+    """
+    base = source["path"]
+    pattern = source.get("archive_glob", f"{base}*")
+    paths = set(glob.glob(pattern))
+    if Path(base).exists():
+        paths.add(base)
+
+    # Eşitlikte (tanınmayan sonekler) mtime
+    return [
+        Path(p) for p in sorted(
+            paths,
+            key=lambda p: (_rotation_key(p, base), os.path.getmtime(p))
+        )
+    ]
+
+
+def open_archive(path: Path) -> BinaryIO | None:
+    """Dosyayı uzantısına göre stream olarak (sıkıştırmayı açarak) aç."""
+    suffix = path.suffix
+    if suffix == ".gz":
+        return gzip.open(path, "rb")
+    if suffix == ".bz2":
+        return bz2.open(path, "rb")
+    if suffix == ".xz":
+        return lzma.open(path, "rb")
+    if suffix == ".zst":
+        if zstandard is None:
+            print(f"[UYARI] {path} atlandı: zstandard paketi kurulu değil")
+            return None
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+    return open(path, "rb")
+
+
+def iter_lines(f: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Dosyayı büyük parçalar halinde okuyup satırlara böl."""
+    carry = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        lines = (carry + chunk).split(b"\n")
+        carry = lines.pop()
+        yield from lines
+    if carry:
+        yield carry
+
+
+def _timestamp_after(
+    f: BinaryIO, offset: int, year_hint: int, reference: datetime | None = None
+) -> datetime | None:
+    """`offset`'ten sonraki ilk tam satırın zaman damgası (dosya sonunda None)."""
+    f.seek(offset)
+    if offset > 0:
+        f.readline()  # Yarım satırı atla
+    for _ in range(100):
+        line = f.readline()
+        if not line:
+            return None
+        ts = parse_timestamp(line, year_hint, reference)
+        if ts is not None:
+            return ts
+    return None
+
+
+def seek_to_time(
+    f: BinaryIO, size: int, since: datetime, year_hint: int, reference: datetime | None = None
+) -> int:
+    """Sıkıştırılmamış dosyada `since`'ten önceki son güvenli offset'i binary search ile bul.
+
+    Satırların zaman sırasında olduğu varsayılır; dönen offset'ten
+    itibaren lineer tarama `since` öncesi birkaç satırı atlar.
+    """
+    lo, hi = 0, size
+    while hi - lo > SEARCH_RESOLUTION:
+        mid = (lo + hi) // 2
+        ts = _timestamp_after(f, mid, year_hint, reference)
+        if ts is None or ts >= since:
+            hi = mid
+        else:
+            lo = mid
+    return lo
+
+
+def iter_file_entries(
+    source: dict,
+    path: str,
+    since: datetime | None,
+    until: datetime | None,
+    chunk_size: int = CHUNK_SIZE,
+    year: int | None = None
+) -> Iterator[LogEntry]:
+    """Tek bir dosyadan zaman penceresine düşen satırları sırayla üret.
+
+    Zaman damgası olmayan satırlar (stack trace vb.) önceki satırın
+    zamanını devralır. Yılsız (syslog) satırların yılı `year` verilmemişse
+    dosyanın mtime'ından çıkarılır. Binary search ile ortasından başlanan
+    dosyalarda önceki kısım tekrar okunmaz; satır numarası yerine satırın
+    bayt offset'i kullanılır.
+    """
+    path = Path(path)
+    modified = datetime.fromtimestamp(path.stat().st_mtime)
+    if since is not None and modified < since:
+        # Son yazma pencereden önceyse dosyayı hiç açma
+        return
+
+    if year is not None:
+        year_hint, reference = year, None
+    else:
+        year_hint, reference = modified.year, modified
+    f = open_archive(path)
+    if f is None:
+        return
+
+    with f:
+        start = 0
+        if since is not None and path.suffix not in COMPRESSED_SUFFIXES:
+            start = seek_to_time(f, path.stat().st_size, since, year_hint, reference)
+            f.seek(start)
+            if start > 0:
+                f.readline()
+
+        # Ortasından başlanan dosyada satır kimliği bayt offset'idir
+        use_offsets = start > 0
+        position = f.tell() if use_offsets else 0
+        line_number = 0
+        current_ts = None
+        for raw in iter_lines(f, chunk_size):
+            if use_offsets:
+                line_number = position
+                position += len(raw) + 1
+            else:
+                line_number += 1
+            ts = parse_timestamp(raw, year_hint, reference)
+            if ts is not None:
+                current_ts = ts
+            if until is not None and current_ts is not None and current_ts > until:
+                break
+            if since is not None and (current_ts is None or current_ts < since):
+                continue
+
+            line = raw.decode("utf-8", errors="ignore").strip()
+            if line:
+                yield LogEntry(
+                    source_name=source["name"],
+                    source_type=source["type"],
+                    line=line,
+                    line_number=line_number
+                )
+
+
+def scan_file(
+    source: dict,
+    path: str,
+    since: datetime | None,
+    until: datetime | None,
+    spool_path: str,
+    chunk_size: int = CHUNK_SIZE,
+    year: int | None = None,
+    batch_lines: int = BATCH_LINES
+) -> int:
+    """Dosyayı tara ve satırları `batch_lines`'lık parçalar halinde `spool_path`'e yaz.
+
+    Worker süreçte çalışır; sonuç listesi bellekte birikmez ve süreçler
+    arasında tek parça olarak taşınmaz. Yazılan satır sayısını döndürür.
+    """
+    count = 0
+    batch: list[LogEntry] = []
+    with open(spool_path, "wb") as spool:
+        for entry in iter_file_entries(source, path, since, until, chunk_size, year):
+            batch.append(entry)
+            if len(batch) >= batch_lines:
+                pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+                count += len(batch)
+                batch = []
+        if batch:
+            pickle.dump(batch, spool, protocol=pickle.HIGHEST_PROTOCOL)
+            count += len(batch)
+    return count
+
+
+def read_spool(spool_path: str) -> Iterator[list[LogEntry]]:
+    """`scan_file`'ın yazdığı parçaları sırayla oku."""
+    with open(spool_path, "rb") as spool:
+        while True:
+            try:
+                yield pickle.load(spool)
+            except EOFError:
+                return
+
+
+def run_backfill(
+    sources: list[dict],
+    since: datetime | None,
+    until: datetime | None,
+    workers: int = 4,
+    chunk_size: int = CHUNK_SIZE,
+    year: int | None = None,
+    batch_lines: int = BATCH_LINES
+) -> Generator[tuple[Path, list[LogEntry]], None, None]:
+    """Tüm kaynakların arşivlerini paralel tara; (dosya, en fazla `batch_lines` entry) üret.
+
+    Sonuçlar dosya sırasıyla (kaynak başına eskiden yeniye), her dosya
+    içinde satır sırasıyla döner. Aynı anda en fazla `workers` dosya
+    taranır; worker'lar satırları geçici bir spool dosyasına parça parça
+    yazar ve ana süreç bunları parça parça okur. Böylece bellekte ne bir
+    dosyanın ne de tüm geçmişin sonucu birikir. Satırı olmayan dosyalar
+    için boş bir parça üretilir.
+    """
+    jobs = iter([(source, path) for source in sources for path in expand_source_files(source)])
+    spool_dir = tempfile.mkdtemp(prefix="backfill-")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight: deque = deque()
+            submitted = 0
+
+            def submit_next() -> None:
+                nonlocal submitted
+                job = next(jobs, None)
+                if job is not None:
+                    source, path = job
+                    spool_path = os.path.join(spool_dir, f"{submitted}.pickle")
+                    submitted += 1
+                    in_flight.append((path, spool_path, executor.submit(
+                        scan_file, source, str(path), since, until, spool_path, chunk_size, year, batch_lines
+                    )))
+
+            for _ in range(max(1, workers)):
+                submit_next()
+
+            while in_flight:
+                path, spool_path, future = in_flight.popleft()
+                try:
+                    count = future.result()
+                except Exception as e:
+                    print(f"[HATA] {path} taranırken hata: {e}")
+                    count = None
+                del future
+                submit_next()
+                if count is None:
+                    continue
+                if count == 0:
+                    yield path, []
+                else:
+                    yield from ((path, batch) for batch in read_spool(spool_path))
+                os.unlink(spool_path)
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
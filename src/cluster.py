@@ -0,0 +1,274 @@
+"""Çok worker'lı daemon için kaynak kiralama (lease) ve consistent hashing."""
+
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from .log_reader import LogReader
+
+
+class HashRing:
+    """Virtual node'lu consistent hash halkası.
+
+    Worker eklenip çıktığında kaynakların yalnızca ~1/N'i yer değiştirir.
+    """
+
+    def __init__(self, nodes: list[str], vnodes: int = 64):
+        self.vnodes = vnodes
+        self._ring: list[tuple[int, str]] = sorted(
+            (self._hash(f"{node}#{i}"), node)
+            for node in nodes
+            for i in range(vnodes)
+        )
+        self._keys = [h for h, _ in self._ring]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def owner(self, key: str) -> str | None:
+        """Anahtarın sahibi olan node'u döndür."""
+        if not self._ring:
+            return None
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._ring)
+        return self._ring[index][1]
+
+
+class LeaseTable:
+    """Paylaşılan SQLite dosyasında worker heartbeat'leri, kaynak lease'leri ve offset'ler.
+
+    Aynı dizini paylaşan birden fazla süreç veya host tarafından
+    kullanılabilir; tüm yazmalar kısa, `BEGIN IMMEDIATE` transaction'larıdır.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS workers (
+        worker_id TEXT PRIMARY KEY,
+        last_heartbeat REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS leases (
+        source TEXT PRIMARY KEY,
+        worker_id TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        position INTEGER
+    );
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def heartbeat(self, worker_id: str) -> None:
+        """Worker'ın canlı olduğunu kaydet."""
+        self._conn.execute(
+            "INSERT INTO workers(worker_id, last_heartbeat) VALUES(?, ?) "
+            "ON CONFLICT(worker_id) DO UPDATE SET last_heartbeat = excluded.last_heartbeat",
+            (worker_id, time.time())
+        )
+
+    def live_workers(self, ttl: float) -> list[str]:
+        """Son `ttl` saniyede heartbeat gönderen worker'lar."""
+        rows = self._conn.execute(
+            "SELECT worker_id FROM workers WHERE last_heartbeat >= ? ORDER BY worker_id",
+            (time.time() - ttl,)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def remove_worker(self, worker_id: str) -> None:
+        """Worker'ı kayıttan sil (düzgün kapanışta)."""
+        self._conn.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def acquire(self, source: str, worker_id: str, ttl: float) -> tuple[bool, int | None]:
+        """Lease'i al veya yenile.
+
+        Lease boşsa, süresi dolmuşsa ya da zaten bu worker'daysa başarılı
+        olur. (başarılı mı, kayıtlı offset) döndürür.
+        """
+        now = time.time()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT INTO leases(source, worker_id, expires_at, position) VALUES(?, ?, ?, NULL) "
+                "ON CONFLICT(source) DO UPDATE SET "
+                "worker_id = excluded.worker_id, expires_at = excluded.expires_at "
+                "WHERE leases.worker_id = excluded.worker_id OR leases.expires_at < ?",
+                (source, worker_id, now + ttl, now)
+            )
+            row = self._conn.execute(
+                "SELECT worker_id, position FROM leases WHERE source = ?", (source,)
+            ).fetchone()
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        return row[0] == worker_id, row[1]
+
+    def release(self, source: str, worker_id: str) -> None:
+        """Lease'i bırak; offset korunur, bir sonraki sahip kaldığı yerden devam eder."""
+        self._conn.execute(
+            "UPDATE leases SET expires_at = 0 WHERE source = ? AND worker_id = ?",
+            (source, worker_id)
+        )
+
+    def save_position(self, source: str, worker_id: str, position: int) -> bool:
+        """Lease hâlâ bu worker'daysa ve süresi dolmadıysa offset'i kaydet."""
+        cursor = self._conn.execute(
+            "UPDATE leases SET position = ? WHERE source = ? AND worker_id = ? AND expires_at >= ?",
+            (position, source, worker_id, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def owners(self) -> dict[str, str]:
+        """Süresi dolmamış lease'lerin kaynak -> worker eşlemesi."""
+        rows = self._conn.execute(
+            "SELECT source, worker_id FROM leases WHERE expires_at >= ?", (time.time(),)
+        ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def default_worker_id(index: int | None = None) -> str:
+    """host-pid[-index] biçiminde worker kimliği üret."""
+    worker_id = f"{socket.gethostname()}-{os.getpid()}"
+    return f"{worker_id}-{index}" if index is not None else worker_id
+
+
+class ClusterCoordinator:
+    """Bir worker'ın hangi kaynakları işleyeceğine karar veren koordinatör.
+
+    Canlı worker listesinden consistent hash halkası kurulur; worker
+    yalnızca halkada kendisine düşen kaynakların lease'ini alır. Ölen
+    worker'ın heartbeat'i düşünce kaynakları halkada diğerlerine geçer,
+    lease süresi dolunca kaldığı offset'ten devralınır. Lease'ler ayrı bir
+    thread'de yenilenir; LLM retry'ları yüzünden uzayan bir tur lease'i
+    düşürüp aynı satırların iki worker'da analiz edilmesine yol açmaz.
+    """
+
+    def __init__(
+        self,
+        log_reader: LogReader,
+        db_path: str,
+        worker_id: str | None = None,
+        lease_ttl: float = 30.0,
+        heartbeat_interval: float = 10.0,
+        vnodes: int = 64
+    ):
+        self.log_reader = log_reader
+        self.table = LeaseTable(db_path)
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_ttl = lease_ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.vnodes = vnodes
+        self.owned: dict[str, dict] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._heartbeat_thread: threading.Thread | None = None
+
+    def heartbeat(self, table: LeaseTable | None = None) -> None:
+        """Heartbeat gönder ve sahip olunan lease'leri yenile."""
+        table = table or self.table
+        with self._lock:
+            table.heartbeat(self.worker_id)
+            for name in list(self.owned):
+                acquired, _ = table.acquire(name, self.worker_id, self.lease_ttl)
+                if not acquired:
+                    print(f"[UYARI] {name} lease'i kaybedildi")
+                    del self.owned[name]
+
+    def start_heartbeat(self) -> None:
+        """Lease'leri tur süresinden bağımsız olarak arka planda yenile."""
+        self._stop.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name="cluster-heartbeat", daemon=True
+        )
+        self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        # SQLite bağlantıları thread'ler arasında paylaşılmaz
+        table = LeaseTable(self.table.db_path)
+        try:
+            while not self._stop.wait(self.heartbeat_interval):
+                try:
+                    self.heartbeat(table)
+                except sqlite3.Error as e:
+                    print(f"[UYARI] Cluster heartbeat başarısız: {e}")
+        finally:
+            table.close()
+
+    def rebalance(self) -> list[dict]:
+        """Halkaya göre kaynakları al/bırak ve işlenecek kaynakları döndür."""
+        with self._lock:
+            return self._rebalance()
+
+    def _rebalance(self) -> list[dict]:
+        self.table.heartbeat(self.worker_id)
+        ring = HashRing(self.table.live_workers(self.lease_ttl), self.vnodes)
+
+        # Config'den çıkarılan kaynakların lease'lerini bırak
+        current = {source["name"] for source in self.log_reader.log_sources}
+        for name in [n for n in self.owned if n not in current]:
+            self.table.release(name, self.worker_id)
+            del self.owned[name]
+
+        for source in self.log_reader.log_sources:
+            name = source["name"]
+            if ring.owner(name) != self.worker_id:
+                if name in self.owned:
+                    self.table.release(name, self.worker_id)
+                    del self.owned[name]
+                    print(f"[INFO] {name} kaynağı bırakıldı (rebalance)")
+                continue
+
+            acquired, position = self.table.acquire(name, self.worker_id, self.lease_ttl)
+            if not acquired:
+                # Önceki sahip henüz bırakmadı; lease süresi dolunca alınır
+                self.owned.pop(name, None)
+                continue
+
+            if name not in self.owned:
+                if position is None:
+                    # Hiç işlenmemiş kaynak: tek worker modundaki gibi sondan başla
+                    self.log_reader.initialize_positions([source])
+                else:
+                    self.log_reader.restore_position(source["path"], position)
+                self.owned[name] = source
+                print(f"[INFO] {name} kaynağı devralındı ({self.worker_id})")
+
+        return list(self.owned.values())
+
+    def commit_positions(self) -> None:
+        """Analizi biten kaynakların offset'lerini paylaşılan tabloya yaz.
+
+        Lease'i bu arada kaybedilen kaynağın offset'i yazılmaz; yeni sahibin
+        ilerlemesi geri alınmasın.
+        """
+        with self._lock:
+            for name, source in list(self.owned.items()):
+                saved = self.table.save_position(
+                    name, self.worker_id, self.log_reader.position_of(source["path"])
+                )
+                if not saved:
+                    print(f"[UYARI] {name} lease'i kaybedildi, offset kaydedilmedi")
+                    del self.owned[name]
+
+    def shutdown(self) -> None:
+        """Heartbeat thread'ini durdur, lease'leri bırak ve worker kaydını sil."""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout=self.heartbeat_interval + 5)
+        self.commit_positions()
+        for name in self.owned:
+            self.table.release(name, self.worker_id)
+        self.owned.clear()
+        self.table.remove_worker(self.worker_id)
+        self.table.close()
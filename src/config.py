@@ -6,9 +6,24 @@ from pathlib import Path
 from typing import Any
 
 import yaml
-from dotenv import load_dotenv
 
-load_dotenv()
+# libyaml varsa C parser'ı kullan (büyük prompt şablonlarında belirgin fark)
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# path -> ((mtime_ns, size), ham YAML); aynı süreçte tekrar parse etmemek için
+_parse_cache: dict[str, tuple[tuple[int, int], Any]] = {}
+_dotenv_loaded = False
+
+
+def load_env() -> None:
+    """.env dosyasını süreç başına bir kez yükle."""
+    global _dotenv_loaded
+    if _dotenv_loaded:
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _dotenv_loaded = True
 
 
 def resolve_env_vars(value: Any) -> Any:
@@ -27,27 +42,195 @@ def resolve_env_vars(value: Any) -> Any:
     return value
 
 
+def resolve_config_path(config_path: str | None = None) -> Path:
+    """Config dosyasının yolunu döndür (verilmemişse varsayılan)."""
+    if config_path is None:
+        return Path(__file__).parent.parent / "config" / "config.yaml"
+    return Path(config_path)
+
+
 def load_config(config_path: str | None = None) -> dict:
     """Konfigürasyon dosyasını yükle."""
-    if config_path is None:
-        config_path = Path(__file__).parent.parent / "config" / "config.yaml"
-    else:
-        config_path = Path(config_path)
+    config_path = resolve_config_path(config_path)
 
     if not config_path.exists():
         raise FileNotFoundError(f"Config dosyası bulunamadı: {config_path}")
 
-    with open(config_path, "r", encoding="utf-8") as f:
-        config = yaml.safe_load(f)
+    load_env()
+
+    # Parse sonucu dosya değişmedikçe yeniden kullanılır; env değişkenleri
+    # her seferinde çözülür (yeni bir kopya da döner)
+    stat = config_path.stat()
+    key = str(config_path.resolve())
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _parse_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        config = cached[1]
+    else:
+        with open(config_path, "r", encoding="utf-8") as f:
+            try:
+                config = yaml.load(f, Loader=YamlLoader)
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML parse hatası: {e}") from e
+        _parse_cache[key] = (signature, config)
 
     return resolve_env_vars(config)
 
 
+SEVERITIES = ("info", "warning", "error", "critical")
+WEBHOOK_FORMATS = ("generic", "slack", "teams")
+EMAIL_KEYS = ("smtp_host", "smtp_port", "username", "password", "from_addr", "to_addrs")
+
+
+def _validate_alerting(alerting: Any) -> list[str]:
+    """`alerting` bölümündeki sorunları döndür (alerter'lar kurulmadan yakalansın)."""
+    if not isinstance(alerting, dict):
+        return ["alerting bölümü eksik"]
+
+    errors = []
+    if not isinstance(alerting.get("console"), dict):
+        errors.append("alerting.console bölümü eksik")
+
+    email = alerting.get("email")
+    if not isinstance(email, dict):
+        errors.append("alerting.email bölümü eksik")
+    elif email.get("enabled", False):
+        for key in EMAIL_KEYS:
+            if key not in email:
+                errors.append(f"alerting.email.{key} eksik")
+
+    webhooks = alerting.get("webhooks") or []
+    if not isinstance(webhooks, list):
+        errors.append("alerting.webhooks bir liste olmalı")
+        webhooks = []
+    for i, webhook in enumerate(webhooks):
+        if not isinstance(webhook, dict):
+            errors.append(f"alerting.webhooks[{i}] bir sözlük olmalı")
+            continue
+        if webhook.get("enabled", True) and not webhook.get("url"):
+            errors.append(f"alerting.webhooks[{i}].url eksik")
+        if webhook.get("format", "generic") not in WEBHOOK_FORMATS:
+            errors.append(
+                f"alerting.webhooks[{i}].format şunlardan biri olmalı: {', '.join(WEBHOOK_FORMATS)}"
+            )
+
+    file_config = alerting.get("file") or {}
+    if not isinstance(file_config, dict) or not isinstance(file_config.get("path", ""), str):
+        errors.append("alerting.file.path bir dosya yolu olmalı")
+
+    dispatch = alerting.get("dispatch") or {}
+    if not isinstance(dispatch, dict):
+        errors.append("alerting.dispatch bir sözlük olmalı")
+    else:
+        for key in ("queue_size", "batch_size", "max_retries"):
+            value = dispatch.get(key, 1)
+            if not isinstance(value, int) or value < 0:
+                errors.append(f"alerting.dispatch.{key} negatif olmayan bir tam sayı olmalı")
+        for key in ("linger_seconds", "retry_base_delay"):
+            value = dispatch.get(key, 0)
+            if not isinstance(value, (int, float)) or value < 0:
+                errors.append(f"alerting.dispatch.{key} negatif olamaz")
+    return errors
+
+
+def validate_config(config: Any) -> None:
+    """Konfigürasyonu doğrula; hatalıysa tüm sorunları içeren ValueError fırlat.
+
+    Hot reload'da geçersiz bir dosyanın çalışan duruma dokunmadan
+    reddedilmesi için de kullanılır.
+    """
+    if not isinstance(config, dict):
+        raise ValueError("Config kök seviyesi bir sözlük olmalı")
+
+    errors = []
+
+    openai_config = config.get("openai")
+    if not isinstance(openai_config, dict):
+        errors.append("openai bölümü eksik")
+    else:
+        for key in ("api_key", "model", "max_tokens"):
+            if key not in openai_config:
+                errors.append(f"openai.{key} eksik")
+
+    backend_names = {"default", *(config.get("llm_backends") or {})}
+    sources = config.get("log_sources")
+    if not isinstance(sources, list):
+        errors.append("log_sources bir liste olmalı")
+    else:
+        names = set()
+        for i, source in enumerate(sources):
+            if not isinstance(source, dict):
+                errors.append(f"log_sources[{i}] bir sözlük olmalı")
+                continue
+            for key in ("name", "path", "type"):
+                if not source.get(key):
+                    errors.append(f"log_sources[{i}].{key} eksik")
+            if source.get("name") in names:
+                errors.append(f"log_sources: tekrarlanan kaynak adı {source['name']}")
+            names.add(source.get("name"))
+            if source.get("backend", "default") not in backend_names:
+                errors.append(f"log_sources[{i}]: tanımsız backend {source['backend']}")
+            priority = source.get("priority", 1)
+            if not isinstance(priority, (int, float)) or priority <= 0:
+                errors.append(f"log_sources[{i}].priority pozitif bir sayı olmalı")
+            for key in ("include", "exclude"):
+                for pattern in source.get(key) or []:
+                    try:
+                        re.compile(pattern)
+                    except re.error as e:
+                        errors.append(f"log_sources[{i}].{key}: geçersiz regex {pattern!r}: {e}")
+            for key in ("max_tokens_per_minute", "max_lines_per_tick"):
+                value = source.get(key, 0)
+                if not isinstance(value, (int, float)) or value < 0:
+                    errors.append(f"log_sources[{i}].{key} negatif olamaz")
+
+    analysis = config.get("analysis")
+    if not isinstance(analysis, dict):
+        errors.append("analysis bölümü eksik")
+    else:
+        for key in ("batch_size", "interval_seconds"):
+            value = analysis.get(key)
+            if not isinstance(value, (int, float)) or value <= 0:
+                errors.append(f"analysis.{key} pozitif bir sayı olmalı")
+        if str(analysis.get("severity_threshold", "")).lower() not in SEVERITIES:
+            errors.append(f"analysis.severity_threshold şunlardan biri olmalı: {', '.join(SEVERITIES)}")
+
+    template = config.get("prompt_template")
+    if not isinstance(template, str) or "{logs}" not in template:
+        errors.append("prompt_template {logs} yer tutucusunu içermeli")
+    else:
+        try:
+            template.format(logs="")
+        except (KeyError, IndexError, ValueError) as e:
+            errors.append(f"prompt_template format hatası: {e}")
+
+    errors.extend(_validate_alerting(config.get("alerting")))
+
+    window = (config.get("tracing") or {}).get("window", 1000)
+    if not isinstance(window, int) or window <= 0:
+        errors.append("tracing.window pozitif bir tam sayı olmalı")
+
+    if errors:
+        raise ValueError("; ".join(errors))
+
+
 class Config:
     """Konfigürasyon erişim sınıfı."""
 
     def __init__(self, config_path: str | None = None):
+        self.path = resolve_config_path(config_path)
         self._config = load_config(config_path)
+        validate_config(self._config)
+
+    @property
+    def raw(self) -> dict:
+        """Ham (env değişkenleri çözülmüş) konfigürasyon sözlüğü."""
+        return self._config
+
+    def changed_sections(self, other: "Config") -> set[str]:
+        """İki konfigürasyon arasında değişen üst seviye bölümler."""
+        keys = set(self._config) | set(other._config)
+        return {k for k in keys if self._config.get(k) != other._config.get(k)}
 
     @property
     def openai_api_key(self) -> str:
@@ -61,6 +244,76 @@ class Config:
     def openai_max_tokens(self) -> int:
         return self._config["openai"]["max_tokens"]
 
+    @property
+    def openai_backend(self) -> dict:
+        """Varsayılan backend ayarları (`openai` bölümü)."""
+        return {"type": "openai", **self._config["openai"]}
+
+    @property
+    def llm_backends(self) -> dict[str, dict]:
+        """Ek, isimli LLM backend'leri (örn. lokal model sunucusu)."""
+        return self._config.get("llm_backends") or {}
+
+    @property
+    def resilience(self) -> dict:
+        """Retry, circuit breaker ve spill kuyruğu ayarları."""
+        return self._config.get("resilience") or {}
+
+    @property
+    def cluster(self) -> dict:
+        """Çok worker'lı daemon ayarları."""
+        return self._config.get("cluster") or {}
+
+    @property
+    def network_sources(self) -> dict:
+        """Ağ üzerinden log alma (syslog, HTTP ingest) ayarları."""
+        return self._config.get("network_sources") or {}
+
+    @property
+    def backfill(self) -> dict:
+        """Arşiv (backfill) tarama ayarları."""
+        return self._config.get("backfill") or {}
+
+    @property
+    def correlation(self) -> dict:
+        """Kaynaklar/turlar arası varlık korelasyonu ayarları."""
+        return self._config.get("correlation") or {}
+
+    @property
+    def search(self) -> dict:
+        """Log arama indeksi ayarları."""
+        return self._config.get("search") or {}
+
+    @property
+    def incidents(self) -> dict:
+        """Alarm -> olay (incident) gruplama ayarları."""
+        return self._config.get("incidents") or {}
+
+    @property
+    def sampling(self) -> dict:
+        """Yüksek hacimli kaynaklar için örnekleme ayarları."""
+        return self._config.get("sampling") or {}
+
+    @property
+    def scheduler(self) -> dict:
+        """Kaynak zamanlayıcı ve ortak token kotası ayarları."""
+        return self._config.get("scheduler") or {}
+
+    @property
+    def stats(self) -> dict:
+        """Daemon'ların web süreciyle paylaştığı istatistik deposu ayarları."""
+        return self._config.get("stats") or {}
+
+    @property
+    def tracing(self) -> dict:
+        """Aşama süresi ölçümü (span) ayarları."""
+        return self._config.get("tracing") or {}
+
+    @property
+    def reload(self) -> dict:
+        """Hot reload ayarları."""
+        return self._config.get("reload") or {}
+
     @property
     def log_sources(self) -> list[dict]:
         return [s for s in self._config["log_sources"] if s.get("enabled", True)]
@@ -88,3 +341,17 @@ class Config:
     @property
     def email_alerting(self) -> dict:
         return self._config["alerting"]["email"]
+
+    @property
+    def webhook_alerting(self) -> list[dict]:
+        """Webhook / Slack / Teams hedefleri."""
+        return self._config["alerting"].get("webhooks") or []
+
+    @property
+    def file_alerting(self) -> dict:
+        return self._config["alerting"].get("file") or {}
+
+    @property
+    def alert_dispatch(self) -> dict:
+        """Kuyruklu gönderim (batch, retry, kuyruk boyu) ayarları."""
+        return self._config["alerting"].get("dispatch") or {}
@@ -0,0 +1,205 @@
+"""Kaynaklar ve daemon turları arası varlık (IP, kullanıcı, host) korelasyonu."""
+
+import re
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+
+from .log_reader import LogEntry
+
+IP_PATTERN = re.compile(r"\b(?:(?:25[0-5]|2[0-4]\d|1?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|1?\d?\d)\b")
+USER_PATTERNS = [
+    re.compile(r"\bfor (?:invalid user )?([\w.-]+) from\b"),
+    re.compile(r"\b(?:user|USER)=([\w.-]+)"),
+    re.compile(r"\buser ['\"]?([\w.-]+)['\"]?", re.IGNORECASE),
+    re.compile(r"^\w{3} +\d{1,2} [\d:]{8} \S+ sudo: +([\w.-]+) :"),
+]
+# Dec 16 10:00:01 <host> ...
+SYSLOG_HOST_PATTERN = re.compile(r"^\w{3} +\d{1,2} [\d:]{8} (\S+) ")
+
+IGNORED_USERS = {"root", "invalid", "unknown", "-"}
+
+# Host çok kaba bir anahtar (bir dosyadaki tüm satırlar aynı host'tan gelir);
+# satırları birleştirmede kullanılmaz, yalnızca geçmiş özetine girer
+GROUPING_KINDS = {"ip", "user"}
+
+
+def extract_entities(line: str) -> set[tuple[str, str]]:
+    """Satırdaki (tür, değer) varlıklarını çıkar."""
+    entities = {("ip", ip) for ip in IP_PATTERN.findall(line)}
+
+    for pattern in USER_PATTERNS:
+        for user in pattern.findall(line):
+            # root brute force'ta anlamlı ama her sudo satırını birleştirmesin
+            if user.lower() not in IGNORED_USERS or "failed" in line.lower():
+                entities.add(("user", user))
+
+    host_match = SYSLOG_HOST_PATTERN.match(line)
+    if host_match:
+        entities.add(("host", host_match.group(1)))
+
+    return entities
+
+
+@dataclass
+class EntityHistory:
+    """Bir varlığın pencere içindeki özet geçmişi."""
+    first_seen: float
+    last_seen: float
+    count: int = 0
+    sources: Counter = field(default_factory=Counter)
+    samples: deque = field(default_factory=lambda: deque(maxlen=3))
+
+
+class EntityIndex:
+    """Zaman pencereli ve boyutu sınırlı varlık indeksi.
+
+    En uzun süredir görülmeyen varlık LRU sırasıyla ilk düşer; böylece
+    bellek `max_entities` ile sınırlı kalır.
+    """
+
+    def __init__(self, window_seconds: float = 900, max_entities: int = 50000, max_samples: int = 3):
+        self.window_seconds = window_seconds
+        self.max_entities = max_entities
+        self.max_samples = max_samples
+        self._entities: OrderedDict[tuple[str, str], EntityHistory] = OrderedDict()
+
+    def observe(self, entity: tuple[str, str], entry: LogEntry, now: float) -> None:
+        """Varlığın görüldüğünü kaydet."""
+        history = self._entities.pop(entity, None)
+        if history is None:
+            history = EntityHistory(first_seen=now, last_seen=now, samples=deque(maxlen=self.max_samples))
+        history.last_seen = now
+        history.count += 1
+        history.sources[entry.source_name] += 1
+        history.samples.append(f"[{entry.source_name}] {entry.line[:160]}")
+        self._entities[entity] = history
+
+        if len(self._entities) > self.max_entities:
+            self._entities.popitem(last=False)
+
+    def expire(self, now: float) -> None:
+        """Pencere dışına çıkan varlıkları sil (en eskiden başlayarak)."""
+        cutoff = now - self.window_seconds
+        while self._entities:
+            entity, history = next(iter(self._entities.items()))
+            if history.last_seen >= cutoff:
+                break
+            del self._entities[entity]
+
+    def get(self, entity: tuple[str, str]) -> EntityHistory | None:
+        return self._entities.get(entity)
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+
+class CorrelationEngine:
+    """Aynı varlığı paylaşan satırları tek analiz biriminde toplayan motor.
+
+    Bir turdaki satırlar ortak varlıklar üzerinden birleştirilir (union-find);
+    ilişkisiz küçük gruplar `batch_size`'a kadar paketlenir. Her birim için
+    indeksteki varlık geçmişinden prompt'a eklenecek bir özet üretilir.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 900,
+        max_entities: int = 50000,
+        max_samples: int = 3,
+        max_summary_entities: int = 10
+    ):
+        self.index = EntityIndex(window_seconds, max_entities, max_samples)
+        self.max_summary_entities = max_summary_entities
+
+    def group(self, entries: list[LogEntry], batch_size: int) -> list[tuple[list[LogEntry], str]]:
+        """Entry'leri ilişkili birimlere ayır; (birim, bağlam özeti) listesi döndür."""
+        now = time.time()
+        self.index.expire(now)
+
+        parent = list(range(len(entries)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        entry_entities: list[set[tuple[str, str]]] = []
+        first_owner: dict[tuple[str, str], int] = {}
+        for i, entry in enumerate(entries):
+            entities = extract_entities(entry.line)
+            entry_entities.append(entities)
+            for entity in entities:
+                self.index.observe(entity, entry, now)
+                if entity[0] not in GROUPING_KINDS:
+                    continue
+                if entity in first_owner:
+                    parent[find(i)] = find(first_owner[entity])
+                else:
+                    first_owner[entity] = i
+
+        components: dict[int, list[int]] = {}
+        for i in range(len(entries)):
+            components.setdefault(find(i), []).append(i)
+
+        # Büyük (ilişkili) gruplar önce, küçükler paketlenerek
+        units: list[list[int]] = []
+        pending: list[int] = []
+        for members in sorted(components.values(), key=len, reverse=True):
+            if len(members) >= batch_size:
+                units.extend(members[i:i + batch_size] for i in range(0, len(members), batch_size))
+                continue
+            if len(pending) + len(members) > batch_size:
+                units.append(pending)
+                pending = []
+            pending.extend(members)
+        if pending:
+            units.append(pending)
+
+        result = []
+        for unit in units:
+            unit.sort()
+            unit_counts = Counter(entity for i in unit for entity in entry_entities[i])
+            result.append(([entries[i] for i in unit], self.summarize(unit_counts)))
+        return result
+
+    def summarize(self, unit_counts: Counter) -> str:
+        """Birimdeki varlıkların pencere içi geçmişini metin olarak özetle.
+
+        Yalnızca bu birimin dışında da görülmüş (başka kaynak veya
+        önceki tur) varlıklar dahil edilir.
+        """
+        histories = []
+        for entity, count in unit_counts.items():
+            history = self.index.get(entity)
+            if history is None:
+                continue
+            if entity[0] not in GROUPING_KINDS and len(history.sources) < 2:
+                continue
+            if history.count > count or len(history.sources) > 1:
+                histories.append((entity, history))
+
+        # Önce IP/kullanıcı, sonra host; her grupta en sık görülen önce
+        histories.sort(key=lambda item: (item[0][0] not in GROUPING_KINDS, -item[1].count))
+
+        lines = []
+        for (kind, value), history in histories[:self.max_summary_entities]:
+            span = int(history.last_seen - history.first_seen)
+            sources = ", ".join(f"{name}({count})" for name, count in history.sources.most_common())
+            lines.append(f"- {kind} {value}: son {span}s içinde {history.count} satır, kaynaklar: {sources}")
+            for sample in list(history.samples)[:-1]:
+                lines.append(f"    örnek: {sample}")
+        return "\n".join(lines)
+
+
+def create_correlator(correlation_config: dict) -> CorrelationEngine | None:
+    """`correlation` ayarlarından motor oluştur (kapalıysa None)."""
+    if not correlation_config.get("enabled", False):
+        return None
+    return CorrelationEngine(
+        window_seconds=correlation_config.get("window_seconds", 900),
+        max_entities=correlation_config.get("max_entities", 50000),
+        max_samples=correlation_config.get("max_samples", 3),
+        max_summary_entities=correlation_config.get("max_summary_entities", 10)
+    )
@@ -0,0 +1,252 @@
+"""Alarmları parmak izi, ortak varlık ve zaman yakınlığına göre olaylarda (incident) toplama."""
+
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from .correlation import GROUPING_KINDS, extract_entities
+from .llm_analyzer import Alert
+
+SEVERITY_LEVELS = {"info": 0, "warning": 1, "error": 2, "critical": 3}
+
+# Parmak izinde değişken kısımlar (sayı, IP, tırnak içi değerler) atılır
+FINGERPRINT_NOISE = re.compile(r"'[^']*'|\"[^\"]*\"|[\d.:]+")
+
+
+def fingerprint(alert: Alert) -> str:
+    """Alarmın kaynak tipi ve normalize edilmiş özetinden parmak izi üret."""
+    summary = FINGERPRINT_NOISE.sub(" ", alert.summary.lower())
+    return f"{alert.source_type}|{' '.join(summary.split())}"
+
+
+@dataclass
+class Incident:
+    """Aynı olaya ait alarmların özeti."""
+    id: int
+    fingerprint: str
+    title: str
+    severity: str
+    first_seen: float
+    last_seen: float
+    count: int = 0
+    sources: Counter = field(default_factory=Counter)
+    entities: set = field(default_factory=set)
+    samples: deque = field(default_factory=lambda: deque(maxlen=5))
+    notified_at: float = 0.0
+    notified_severity: str = ""
+    notified_count: int = 0
+
+    @property
+    def severity_level(self) -> int:
+        return SEVERITY_LEVELS.get(self.severity.lower(), 0)
+
+    def to_dict(self, window_seconds: float, with_samples: bool = False) -> dict:
+        data = {
+            "id": self.id,
+            "title": self.title,
+            "severity": self.severity,
+            "status": "open" if time.time() - self.last_seen < window_seconds else "resolved",
+            "first_seen": datetime.fromtimestamp(self.first_seen).isoformat(),
+            "last_seen": datetime.fromtimestamp(self.last_seen).isoformat(),
+            "count": self.count,
+            "sources": dict(self.sources),
+            "entities": sorted(f"{kind}:{value}" for kind, value in self.entities)
+        }
+        if with_samples:
+            data["samples"] = [
+                {"severity": a.severity, "summary": a.summary, "log_line": a.log_line,
+                 "source_name": a.source_name}
+                for a in self.samples
+            ]
+        return data
+
+
+class IncidentEngine:
+    """Alarmları artımlı olarak olaylara bağlayan motor.
+
+    Her alarm için parmak izi ve ortak IP/kullanıcı sözlüklerde aranır;
+    son `window_seconds` içinde güncellenmiş bir olay bulunursa alarm ona
+    eklenir, yoksa yeni olay açılır. Alarm başına iş sabittir (sözlük
+    erişimi, varlık sayısı kadar). En eski olaylar `max_incidents`'ta düşer.
+    Yalnızca ortak varlıkla bağlanan alarm indeksleri başka olaydan bu
+    olaya taşımaz; böylece olaylar zincirleme birleşmez.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 1800,
+        renotify_seconds: float = 3600,
+        max_incidents: int = 1000,
+        max_entities: int = 20
+    ):
+        self.window_seconds = window_seconds
+        self.renotify_seconds = renotify_seconds
+        self.max_incidents = max_incidents
+        self.max_entities = max_entities
+        self.incidents: OrderedDict[int, Incident] = OrderedDict()
+        self._by_fingerprint: dict[str, int] = {}
+        self._by_entity: dict[tuple[str, str], int] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _active(self, incident_id: int | None, now: float) -> Incident | None:
+        """İndeksteki olay hâlâ açıksa döndür."""
+        if incident_id is None:
+            return None
+        incident = self.incidents.get(incident_id)
+        if incident is None or now - incident.last_seen >= self.window_seconds:
+            return None
+        return incident
+
+    def _evict(self) -> None:
+        """En uzun süredir güncellenmeyen olayı ve indeks kayıtlarını sil."""
+        _, incident = self.incidents.popitem(last=False)
+        if self._by_fingerprint.get(incident.fingerprint) == incident.id:
+            del self._by_fingerprint[incident.fingerprint]
+        for entity in incident.entities:
+            if self._by_entity.get(entity) == incident.id:
+                del self._by_entity[entity]
+
+    def add(self, alert: Alert, now: float | None = None) -> tuple[Incident, bool]:
+        """Alarmı bir olaya bağla; (olay, yeni mi) döndür."""
+        now = now or time.time()
+        key = fingerprint(alert)
+        entities = {e for e in extract_entities(alert.log_line) if e[0] in GROUPING_KINDS}
+
+        with self._lock:
+            incident = self._active(self._by_fingerprint.get(key), now)
+            # Yalnızca ortak varlıkla bağlanan alarm, parmak izini ve başka
+            # olaylara ait varlıkları bu olaya taşımaz (zincirleme birleşme olmasın)
+            owns_fingerprint = incident is not None
+            if incident is None:
+                for entity in entities:
+                    incident = self._active(self._by_entity.get(entity), now)
+                    if incident is not None:
+                        break
+
+            created = incident is None
+            owns_fingerprint = owns_fingerprint or created
+            if created:
+                incident = Incident(
+                    id=self._next_id,
+                    fingerprint=key,
+                    title=alert.summary,
+                    severity=alert.severity,
+                    first_seen=now,
+                    last_seen=now
+                )
+                self._next_id += 1
+                self.incidents[incident.id] = incident
+                if len(self.incidents) > self.max_incidents:
+                    self._evict()
+            else:
+                self.incidents.move_to_end(incident.id)
+
+            incident.last_seen = now
+            incident.count += 1
+            incident.sources[alert.source_name] += 1
+            incident.samples.append(alert)
+            if SEVERITY_LEVELS.get(alert.severity.lower(), 0) > incident.severity_level:
+                incident.severity = alert.severity
+
+            if owns_fingerprint:
+                self._by_fingerprint[key] = incident.id
+            for entity in entities:
+                owner = self._by_entity.get(entity)
+                if owner != incident.id and self._active(owner, now) is not None:
+                    continue
+                if entity in incident.entities or len(incident.entities) < self.max_entities:
+                    incident.entities.add(entity)
+                    self._by_entity[entity] = incident.id
+
+            alert.incident_id = incident.id
+            return incident, created
+
+    def ingest(self, alerts: list[Alert]) -> list[Incident]:
+        """Alarmları ekle ve bildirim gerektiren olayları döndür.
+
+        Bildirim: olay ilk açıldığında, tepe severity yükseldiğinde ya da
+        açık olay `renotify_seconds` boyunca bildirilmediyse.
+        """
+        now = time.time()
+        touched: dict[int, Incident] = {}
+        for alert in alerts:
+            incident, _ = self.add(alert, now)
+            touched[incident.id] = incident
+
+        to_notify = []
+        for incident in touched.values():
+            escalated = incident.severity_level > SEVERITY_LEVELS.get(incident.notified_severity, -1)
+            if escalated or now - incident.notified_at >= self.renotify_seconds:
+                to_notify.append(incident)
+        return to_notify
+
+    def mark_notified(self, incidents: list[Incident]) -> None:
+        now = time.time()
+        for incident in incidents:
+            incident.notified_at = now
+            incident.notified_severity = incident.severity.lower()
+            incident.notified_count = incident.count
+
+    def as_alert(self, incident: Incident) -> Alert:
+        """Olayı mevcut alerter'ların gönderebileceği tek bir alarma çevir."""
+        latest = incident.samples[-1]
+        sources = ", ".join(f"{name}({count})" for name, count in incident.sources.most_common())
+        entities = ", ".join(sorted(value for _, value in incident.entities)[:5])
+        new_alerts = incident.count - incident.notified_count
+        details = (
+            f"{incident.count} alarm ({new_alerts} yeni), "
+            f"{datetime.fromtimestamp(incident.first_seen):%H:%M:%S} - "
+            f"{datetime.fromtimestamp(incident.last_seen):%H:%M:%S}, kaynaklar: {sources}"
+        )
+        if entities:
+            details += f", varlıklar: {entities}"
+        return Alert(
+            severity=incident.severity,
+            summary=f"[Olay #{incident.id}] {incident.title}",
+            details=details,
+            log_line=latest.log_line,
+            recommendation=latest.recommendation,
+            source_name=latest.source_name,
+            source_type=latest.source_type,
+            degraded=latest.degraded,
+            incident_id=incident.id,
+            ingested_at=latest.ingested_at
+        )
+
+    def notifications(self, alerts: list[Alert]) -> list[Alert]:
+        """Alarmları olaylara bağla ve gönderilecek olay bildirimlerini döndür."""
+        incidents = self.ingest(alerts)
+        notifications = [self.as_alert(incident) for incident in incidents]
+        self.mark_notified(incidents)
+        return notifications
+
+    def get(self, incident_id: int) -> Incident | None:
+        return self.incidents.get(incident_id)
+
+    def list_incidents(self, status: str | None = None, limit: int = 50) -> list[dict]:
+        """Olayları en son güncellenen önce listele."""
+        result = []
+        with self._lock:
+            for incident in reversed(self.incidents.values()):
+                data = incident.to_dict(self.window_seconds)
+                if status and data["status"] != status:
+                    continue
+                result.append(data)
+                if len(result) >= limit:
+                    break
+        return result
+
+
+def create_incident_engine(incidents_config: dict) -> IncidentEngine | None:
+    """`incidents` ayarlarından motor oluştur (kapalıysa None)."""
+    if not incidents_config.get("enabled", False):
+        return None
+    return IncidentEngine(
+        window_seconds=incidents_config.get("window_seconds", 1800),
+        renotify_seconds=incidents_config.get("renotify_seconds", 3600),
+        max_incidents=incidents_config.get("max_incidents", 1000)
+    )
@@ -2,12 +2,15 @@
 
 import json
 import re
+import time
 from dataclasses import dataclass
 from typing import Any
 
-from openai import OpenAI
-
+from .correlation import CorrelationEngine, create_correlator
+from .llm_backends import BaseLLMBackend, RuleBasedBackend, build_backends
 from .log_reader import LogEntry
+from .resilience import CircuitBreaker, RetryBudget, SpillQueue, backoff_delay
+from .tracing import span
 
 
 @dataclass
@@ -20,6 +23,10 @@ class Alert:
     recommendation: str
     source_name: str = ""
     source_type: str = ""
+    degraded: bool = False  # LLM yerine kural tabanlı yedek analizden geldiyse
+    incident_id: int | None = None  # Bağlandığı olay (incident motoru açıksa)
+    ingested_at: float = 0.0  # Kaynak satırın okunduğu an (epoch)
+    notify_latency: float | None = None  # Okumadan bildirime geçen süre (saniye)
 
     @property
     def severity_level(self) -> int:
@@ -29,31 +36,132 @@ class Alert:
 
 
 class LLMAnalyzer:
-    """OpenAI API kullanarak log analizi yapan sınıf."""
+    """LLM backend'leri kullanarak log analizi yapan sınıf."""
 
     SEVERITY_LEVELS = {"info": 0, "warning": 1, "error": 2, "critical": 3}
 
     def __init__(
         self,
-        api_key: str,
-        model: str = "gpt-4o-mini",
+        backend: BaseLLMBackend,
         max_tokens: int = 500,
         prompt_template: str = "",
-        severity_threshold: str = "warning"
+        severity_threshold: str = "warning",
+        source_backends: dict[str, BaseLLMBackend] | None = None,
+        resilience: dict | None = None,
+        correlator: CorrelationEngine | None = None,
+        backends: dict[str, BaseLLMBackend] | None = None
     ):
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
+        self.backend = backend
+        self.source_backends = source_backends or {}
+        # Tanımlı tüm backend'ler (kaynağa atanmamışlar dahil); reload'da
+        # kaynak atamaları bunlardan yapılır, kapanışta hepsi kapatılır
+        self.backends = backends or {
+            "default": backend,
+            **{b.name: b for b in self.source_backends.values()}
+        }
         self.max_tokens = max_tokens
         self.prompt_template = prompt_template
         self.severity_threshold = severity_threshold
-
-    def _build_prompt(self, entries: list[LogEntry]) -> str:
-        """Log entry'lerinden prompt oluştur."""
-        logs_text = "\n".join([
-            f"[{e.source_name}:{e.line_number}] {e.line}"
-            for e in entries
-        ])
-        return self.prompt_template.format(logs=logs_text)
+        self.correlator = correlator
+
+        resilience = resilience or {}
+        self.retry_budget = RetryBudget()
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.configure_resilience(resilience, create_spill_queue(resilience))
+
+    def configure_resilience(self, resilience: dict, spill_queue: SpillQueue | None) -> None:
+        """Dayanıklılık ayarlarını uygula.
+
+        Breaker durumları ve retry bütçesindeki jetonlar korunur; yalnızca
+        eşikler ve oranlar değişir. `spill_queue` önceden kurulmuş olarak
+        verilir (`create_spill_queue`), böylece dizin oluşturulamazsa
+        analyzer değişmeden kalır.
+        """
+        self.max_retries = resilience.get("max_retries", 3)
+        self.base_delay = resilience.get("base_delay", 1.0)
+        self.max_delay = resilience.get("max_delay", 20.0)
+        self.failure_threshold = resilience.get("failure_threshold", 5)
+        self.reset_timeout = resilience.get("reset_timeout", 60.0)
+        self.retry_budget.ratio = resilience.get("retry_budget_ratio", 0.2)
+        self.retry_budget.max_tokens = resilience.get("retry_budget_max", 10.0)
+        for breaker in self.breakers.values():
+            breaker.failure_threshold = self.failure_threshold
+            breaker.reset_timeout = self.reset_timeout
+        self.spill_queue = spill_queue
+        self.fallback = (
+            RuleBasedBackend("degraded")
+            if resilience.get("degraded_rules", True) else None
+        )
+
+    def assign_sources(self, log_sources: list[dict]) -> None:
+        """Kaynakları `backend` ayarlarına göre tanımlı backend'lere ata."""
+        source_backends = {}
+        for source in log_sources:
+            backend_name = source.get("backend", "default")
+            if backend_name not in self.backends:
+                raise ValueError(f"{source['name']} için tanımsız backend: {backend_name}")
+            source_backends[source["name"]] = self.backends[backend_name]
+        self.source_backends = source_backends
+
+    def adopt_state(self, previous: "LLMAnalyzer", keep_correlator: bool = True) -> None:
+        """Reload'da yerine geçilen analyzer'ın çalışma durumunu devral.
+
+        Aynı adlı backend'lerin breaker'ları, retry bütçesi ve (korelasyon
+        ayarları değişmediyse) varlık indeksi korunur.
+        """
+        self.breakers = {name: b for name, b in previous.breakers.items() if name in self.backends}
+        for breaker in self.breakers.values():
+            breaker.failure_threshold = self.failure_threshold
+            breaker.reset_timeout = self.reset_timeout
+        previous.retry_budget.ratio = self.retry_budget.ratio
+        previous.retry_budget.max_tokens = self.retry_budget.max_tokens
+        self.retry_budget = previous.retry_budget
+        if keep_correlator:
+            self.correlator = previous.correlator
+
+    def close(self) -> None:
+        """Tüm backend'lerin bağlantı havuzlarını kapat."""
+        backends = [self.backend, *self.backends.values(), *self.source_backends.values()]
+        for backend in {id(b): b for b in backends}.values():
+            backend.close()
+
+    def _backend_for(self, entry: LogEntry) -> BaseLLMBackend:
+        """Entry'nin kaynağına atanmış backend'i döndür."""
+        return self.source_backends.get(entry.source_name, self.backend)
+
+    def _breaker_for(self, backend: BaseLLMBackend) -> CircuitBreaker:
+        """Backend'in circuit breaker'ını döndür (yoksa oluştur)."""
+        if backend.name not in self.breakers:
+            self.breakers[backend.name] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[backend.name]
+
+    def _backend_by_name(self, name: str) -> BaseLLMBackend:
+        """İsimden backend bul; bilinmiyorsa varsayılanı döndür."""
+        return self.backends.get(name, self.backend)
+
+    def _build_prompt(self, entries: list[LogEntry], context: str = "", overflow: str = "") -> str:
+        """Log entry'lerinden prompt oluştur.
+
+        `context` (varlık geçmişi özeti) ve `overflow` (örnekleme veya kota
+        nedeniyle analiz edilmeyen satırların özeti) verilirse log
+        satırlarının arkasına ayrı bölümler olarak eklenir.
+        """
+        with span("build_prompt", lines=len(entries)):
+            logs_text = "\n".join([
+                f"[{e.source_name}:{e.line_number}] {e.line}"
+                for e in entries
+            ])
+            if context:
+                logs_text += (
+                    "\n\nİlişkili varlık geçmişi (önceki batch'ler ve diğer kaynaklar, "
+                    "yalnızca bağlam içindir):\n" + context
+                )
+            if overflow:
+                logs_text += (
+                    "\n\nÖrnekleme veya kota nedeniyle analiz edilmeyen satırların özeti "
+                    "(hacim artışı kendi başına bir bulgu olabilir):\n" + overflow
+                )
+            return self.prompt_template.format(logs=logs_text)
 
     def _extract_json(self, text: str) -> str | None:
         """Metinden JSON bloğunu çıkar."""
@@ -79,100 +187,257 @@ class LLMAnalyzer:
 
     def _parse_response(self, response_text: str, entries: list[LogEntry]) -> list[Alert]:
         """LLM yanıtını parse et."""
-        alerts = []
-
-        print(f"[DEBUG] LLM Response:\n{response_text[:500]}...")
+        with span("parse_response"):
+            alerts = []
+
+            print(f"[DEBUG] LLM Response:\n{response_text[:500]}...")
+
+            try:
+                with span("extract_json"):
+                    json_str = self._extract_json(response_text)
+
+                if not json_str:
+                    print("[HATA] JSON bloğu bulunamadı")
+                    return alerts
+
+                data = json.loads(json_str)
+
+                if not data.get("has_issues", False):
+                    print("[INFO] has_issues=false, alarm yok")
+                    return alerts
+
+                # Entry'lerin source bilgisini ve okunma anını bir dict'e koy
+                source_map = {e.line: (e.source_name, e.source_type, e.ingested_at) for e in entries}
+                # Satır eşleşmezse gecikme batch'in en eski satırından ölçülür
+                oldest = min((e.ingested_at for e in entries if e.ingested_at), default=0.0)
+
+                for alert_data in data.get("alerts", []):
+                    log_line = alert_data.get("log_line", "")
+                    source_name, source_type, ingested_at = source_map.get(
+                        log_line, ("unknown", "unknown", oldest)
+                    )
+
+                    # Eğer source bulunamadıysa demo olarak ata
+                    if source_name == "unknown":
+                        source_name = "demo"
+                        source_type = "application"
+
+                    alert = Alert(
+                        severity=alert_data.get("severity", "info"),
+                        summary=alert_data.get("summary", ""),
+                        details=alert_data.get("details", ""),
+                        log_line=log_line,
+                        recommendation=alert_data.get("recommendation", ""),
+                        source_name=source_name,
+                        source_type=source_type,
+                        ingested_at=ingested_at
+                    )
+                    alerts.append(alert)
+
+                print(f"[INFO] {len(alerts)} alarm parse edildi")
+
+            except json.JSONDecodeError as e:
+                print(f"[HATA] JSON parse hatası: {e}")
+                print(f"[DEBUG] JSON string: {json_str[:300] if json_str else 'None'}...")
+            except Exception as e:
+                print(f"[HATA] Response parse hatası: {e}")
+
+            return alerts
 
-        try:
-            json_str = self._extract_json(response_text)
-
-            if not json_str:
-                print("[HATA] JSON bloğu bulunamadı")
-                return alerts
-
-            data = json.loads(json_str)
-
-            if not data.get("has_issues", False):
-                print("[INFO] has_issues=false, alarm yok")
-                return alerts
+    def _filter_by_severity(self, alerts: list[Alert]) -> list[Alert]:
+        """Severity threshold'a göre filtrele."""
+        threshold_level = self.SEVERITY_LEVELS.get(self.severity_threshold.lower(), 1)
+        return [a for a in alerts if a.severity_level >= threshold_level]
 
-            # Entry'lerin source bilgisini bir dict'e koy
-            source_map = {e.line: (e.source_name, e.source_type) for e in entries}
+    def _call_with_retry(self, backend: BaseLLMBackend, prompt: str) -> str:
+        """Backend'i jitter'lı backoff ve retry bütçesiyle çağır."""
+        breaker = self._breaker_for(backend)
+        self.retry_budget.record_request()
+        attempt = 0
+
+        while True:
+            try:
+                with span("llm_call", backend=backend.name, attempt=attempt):
+                    response_text = backend.complete(prompt, self.max_tokens)
+                breaker.record_success()
+                return response_text
+            except Exception as e:
+                breaker.record_failure()
+                if breaker.is_open or attempt >= self.max_retries:
+                    raise
+                if not self.retry_budget.try_acquire():
+                    print("[UYARI] Retry bütçesi tükendi")
+                    raise
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                print(f"[UYARI] LLM API hatası ({backend.name}): {e}, {delay:.1f}s sonra tekrar denenecek")
+                time.sleep(delay)
+                attempt += 1
+
+    def _degrade(self, entries: list[LogEntry], backend: BaseLLMBackend, spill: bool = True) -> list[Alert]:
+        """LLM'e ulaşılamadığında batch'i diske bırak ve kural tabanlı alarm üret."""
+        if spill and self.spill_queue is not None:
+            self.spill_queue.push(backend.name, entries)
+            print(f"[INFO] {len(entries)} satır spill kuyruğuna alındı")
+
+        if self.fallback is None:
+            return []
 
-            for alert_data in data.get("alerts", []):
-                log_line = alert_data.get("log_line", "")
-                source_name, source_type = source_map.get(log_line, ("unknown", "unknown"))
+        response_text = self.fallback.complete(self._build_prompt(entries), self.max_tokens)
+        alerts = self._parse_response(response_text, entries)
+        for alert in alerts:
+            alert.degraded = True
+        return self._filter_by_severity(alerts)
 
-                # Eğer source bulunamadıysa demo olarak ata
-                if source_name == "unknown":
-                    source_name = "demo"
-                    source_type = "application"
+    def analyze(
+        self,
+        entries: list[LogEntry],
+        backend: BaseLLMBackend | None = None,
+        spill: bool = True,
+        context: str = "",
+        overflow: str = ""
+    ) -> list[Alert]:
+        """Log entry'lerini analiz et ve alert'leri döndür.
+
+        Backend'e ulaşılamazsa (ya da circuit açıksa) batch kaybolmaz:
+        spill kuyruğuna yazılır ve kural tabanlı yedek alarmlar döner.
+        """
+        if not entries:
+            return []
 
-                alert = Alert(
-                    severity=alert_data.get("severity", "info"),
-                    summary=alert_data.get("summary", ""),
-                    details=alert_data.get("details", ""),
-                    log_line=log_line,
-                    recommendation=alert_data.get("recommendation", ""),
-                    source_name=source_name,
-                    source_type=source_type
-                )
-                alerts.append(alert)
+        backend = backend or self._backend_for(entries[0])
 
-            print(f"[INFO] {len(alerts)} alarm parse edildi")
+        with span("analyze", backend=backend.name, lines=len(entries)):
+            if not self._breaker_for(backend).allow_request():
+                return self._degrade(entries, backend, spill)
 
-        except json.JSONDecodeError as e:
-            print(f"[HATA] JSON parse hatası: {e}")
-            print(f"[DEBUG] JSON string: {json_str[:300] if json_str else 'None'}...")
-        except Exception as e:
-            print(f"[HATA] Response parse hatası: {e}")
+            prompt = self._build_prompt(entries, context, overflow)
 
-        return alerts
+            try:
+                response_text = self._call_with_retry(backend, prompt)
+            except Exception as e:
+                print(f"[HATA] LLM API hatası ({backend.name}): {e}")
+                return self._degrade(entries, backend, spill)
 
-    def _filter_by_severity(self, alerts: list[Alert]) -> list[Alert]:
-        """Severity threshold'a göre filtrele."""
-        threshold_level = self.SEVERITY_LEVELS.get(self.severity_threshold.lower(), 1)
-        return [a for a in alerts if a.severity_level >= threshold_level]
+            alerts = self._parse_response(response_text, entries)
+            return self._filter_by_severity(alerts)
 
-    def analyze(self, entries: list[LogEntry]) -> list[Alert]:
-        """Log entry'lerini analiz et ve alert'leri döndür."""
-        if not entries:
+    def replay_spilled(self, max_batches: int = 10) -> list[Alert]:
+        """Spill kuyruğundaki batch'leri, backend'leri tekrar sağlıklıysa analiz et."""
+        if self.spill_queue is None:
             return []
 
-        prompt = self._build_prompt(entries)
-
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "Sen bir sistem güvenlik ve log analiz uzmanısın. Yanıtlarını her zaman belirtilen JSON formatında ver."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0.1  # Daha tutarlı sonuçlar için düşük temperature
-            )
+        all_alerts = []
+        for path in self.spill_queue.pending()[:max_batches]:
+            # Kuyruk birden fazla worker tarafından paylaşılabilir
+            claimed = self.spill_queue.claim(path)
+            if claimed is None:
+                continue
+
+            backend_name, entries = self.spill_queue.load(claimed)
+            backend = self._backend_by_name(backend_name)
+            breaker = self._breaker_for(backend)
+            if not breaker.allow_request():
+                self.spill_queue.unclaim(claimed)
+                continue
+
+            try:
+                response_text = self._call_with_retry(backend, self._build_prompt(entries))
+            except Exception as e:
+                print(f"[UYARI] Spill replay başarısız ({backend.name}): {e}")
+                self.spill_queue.unclaim(claimed)
+                continue
 
-            response_text = response.choices[0].message.content or ""
             alerts = self._parse_response(response_text, entries)
-            return self._filter_by_severity(alerts)
+            all_alerts.extend(self._filter_by_severity(alerts))
+            self.spill_queue.remove(claimed)
+            print(f"[INFO] Spill kuyruğundan {len(entries)} satır analiz edildi")
 
-        except Exception as e:
-            print(f"[HATA] OpenAI API hatası: {e}")
-            return []
+        return all_alerts
 
-    def analyze_batch(self, entries: list[LogEntry], batch_size: int = 50) -> list[Alert]:
-        """Büyük log listelerini batch'ler halinde analiz et."""
+    def analyze_batch(
+        self,
+        entries: list[LogEntry],
+        batch_size: int = 50,
+        overflow: dict[str, str] | None = None
+    ) -> list[Alert]:
+        """Büyük log listelerini batch'ler halinde analiz et.
+
+        Batch'ler hiçbir zaman iki farklı backend'e bölünmez. Korelasyon
+        açıksa tüm kaynakların satırları tek seferde ortak varlık (IP,
+        kullanıcı) üzerinden birimlere ayrılır; böylece farklı backend'lere
+        atanmış kaynaklar arasındaki ilişkiler de indekse ve özetlere girer.
+        Birden fazla backend'e düşen bir birim backend başına bölünür ve
+        her parça birimin varlık geçmişini taşır. Korelasyon kapalıysa
+        entry'ler backend'e göre gruplanıp sıralı dilimlere ayrılır.
+        `overflow` (kaynak -> örnekleme/taşma özeti) verilirse her özet,
+        kaynağın backend'ine giden ilk batch'e bir kez eklenir.
+        """
         all_alerts = []
+        overflow = overflow or {}
+        pending_summaries: dict[str, str] = {}
+        for name, text in overflow.items():
+            backend_name = self.source_backends.get(name, self.backend).name
+            pending_summaries[backend_name] = (
+                f"{pending_summaries[backend_name]}\n{text}" if backend_name in pending_summaries else text
+            )
 
-        for i in range(0, len(entries), batch_size):
-            batch = entries[i:i + batch_size]
-            alerts = self.analyze(batch)
-            all_alerts.extend(alerts)
+        def by_backend(batch: list[LogEntry]) -> dict[str, tuple[BaseLLMBackend, list[LogEntry]]]:
+            groups: dict[str, tuple[BaseLLMBackend, list[LogEntry]]] = {}
+            for entry in batch:
+                backend = self._backend_for(entry)
+                groups.setdefault(backend.name, (backend, []))[1].append(entry)
+            return groups
+
+        if self.correlator is not None:
+            for unit, context in self.correlator.group(entries, batch_size):
+                for backend, part in by_backend(unit).values():
+                    summary = pending_summaries.pop(backend.name, "")
+                    all_alerts.extend(self.analyze(part, backend, context=context, overflow=summary))
+            return all_alerts
+
+        for backend, group in by_backend(entries).values():
+            summary = pending_summaries.pop(backend.name, "")
+            for i in range(0, len(group), batch_size):
+                batch = group[i:i + batch_size]
+                alerts = self.analyze(batch, backend, overflow=summary)
+                summary = ""
+                all_alerts.extend(alerts)
 
         return all_alerts
+
+
+def resilience_settings(config, spill: bool = False) -> dict:
+    """`resilience` ayarları; spill yalnızca `spill=True` iken (daemon) açık kalır."""
+    return config.resilience if spill else {**config.resilience, "spill_dir": None}
+
+
+def create_spill_queue(resilience: dict) -> SpillQueue | None:
+    """`resilience.spill_dir` verilmişse spill kuyruğunu kur."""
+    spill_dir = resilience.get("spill_dir")
+    if not spill_dir:
+        return None
+    return SpillQueue(
+        spill_dir,
+        resilience.get("spill_max_batches", 1000),
+        resilience.get("spill_inflight_timeout", 600.0)
+    )
+
+
+def create_analyzer(config, spill: bool = False) -> LLMAnalyzer:
+    """Config'den backend'leri ve kaynak atamalarını kurarak analyzer oluştur.
+
+    Spill kuyruğu yalnızca `spill=True` iken (daemon) kurulur; kuyruğu
+    tekrar oynatan tek mod daemon'dur, tek seferlik çalışmalar dosya bırakmaz.
+    """
+    backends = build_backends(config)
+    analyzer = LLMAnalyzer(
+        backend=backends["default"],
+        max_tokens=config.openai_max_tokens,
+        prompt_template=config.prompt_template,
+        severity_threshold=config.severity_threshold,
+        resilience=resilience_settings(config, spill),
+        correlator=create_correlator(config.correlation),
+        backends=backends
+    )
+    analyzer.assign_sources(config.log_sources)
+    return analyzer
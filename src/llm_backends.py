@@ -0,0 +1,242 @@
+"""LLM backend soyutlaması (OpenAI, OpenAI-uyumlu lokal sunucu, kural tabanlı)."""
+
+import json
+import re
+import threading
+from abc import ABC, abstractmethod
+
+SYSTEM_PROMPT = (
+    "Sen bir sistem güvenlik ve log analiz uzmanısın. "
+    "Yanıtlarını her zaman belirtilen JSON formatında ver."
+)
+
+
+class BaseLLMBackend(ABC):
+    """Temel LLM backend sınıfı.
+
+    Her backend kendi eşzamanlılık limitini taşır; `complete` çağrıları
+    bu limiti aşamaz, fazlası semafor üzerinde bekler.
+    """
+
+    def __init__(self, name: str, max_concurrency: int = 4):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def complete(self, prompt: str, max_tokens: int) -> str:
+        """Prompt'u gönder ve ham yanıt metnini döndür."""
+        with self._semaphore:
+            return self._complete(prompt, max_tokens)
+
+    @abstractmethod
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        """Backend'e özgü çağrı."""
+        pass
+
+    def close(self) -> None:
+        """Açık bağlantıları kapat."""
+        pass
+
+
+class OpenAIBackend(BaseLLMBackend):
+    """OpenAI API (veya OpenAI-uyumlu bir `base_url`) kullanan backend.
+
+    Bağlantı havuzu ve keep-alive, paylaşılan bir `httpx.Client` ile sağlanır.
+    SDK ve client ilk çağrıda oluşturulur; `openai` paketinin import
+    maliyeti, bu backend'e hiç istek gitmeyen çalıştırmalarda ödenmez.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        base_url: str | None = None,
+        max_concurrency: int = 4,
+        max_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 60.0,
+        temperature: float = 0.1
+    ):
+        super().__init__(name, max_concurrency)
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.timeout = timeout
+        self.temperature = temperature
+        self._http_client = None
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """OpenAI client'ı (ilk erişimde oluşturulur)."""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    import httpx
+                    from openai import OpenAI
+
+                    self._http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections,
+                            keepalive_expiry=self.keepalive_expiry
+                        ),
+                        timeout=self.timeout
+                    )
+                    # Tekrar denemeler yalnızca analyzer'ın retry bütçesi ve
+                    # circuit breaker'ı üzerinden yapılır; SDK kendi başına denemez
+                    self._client = OpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        http_client=self._http_client,
+                        max_retries=0,
+                        timeout=self.timeout
+                    )
+        return self._client
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            max_tokens=max_tokens,
+            temperature=self.temperature  # Daha tutarlı sonuçlar için düşük temperature
+        )
+        return response.choices[0].message.content or ""
+
+    def close(self) -> None:
+        if self._http_client is not None:
+            self._http_client.close()
+
+
+class OpenAICompatibleBackend(OpenAIBackend):
+    """OpenAI-uyumlu lokal sunucu (llama.cpp, vLLM vb.) için backend."""
+
+    def __init__(self, name: str, base_url: str, api_key: str = "", **kwargs):
+        # Lokal sunucular genelde anahtar istemez ama SDK boş anahtarı reddeder
+        super().__init__(name, api_key=api_key or "not-needed", base_url=base_url, **kwargs)
+
+
+# (pattern, severity, summary, recommendation)
+DEFAULT_RULES: list[tuple[str, str, str, str]] = [
+    (r"union\s+select|'\s*or\s*'?1'?\s*=\s*'?1|sqlmap", "critical",
+     "SQL injection denemesi", "WAF kurallarını güçlendirin ve kaynak IP'yi engelleyin"),
+    (r"<script|%3cscript|javascript:", "error",
+     "XSS denemesi", "Girdi doğrulamasını ve CSP başlıklarını kontrol edin"),
+    (r"\.\./\.\./|%2e%2e%2f|/etc/passwd", "critical",
+     "Directory traversal denemesi", "Path normalizasyonunu kontrol edin ve IP'yi engelleyin"),
+    (r"failed password|authentication failure|invalid user", "warning",
+     "Başarısız kimlik doğrulama", "Tekrarlıyorsa fail2ban ile IP'yi engelleyin"),
+    (r"out of memory|oom-killer|killed process", "critical",
+     "Bellek yetersizliği (OOM)", "Bellek kullanımını ve limitleri gözden geçirin"),
+    (r"syn flood|possible syn flooding", "critical",
+     "SYN flood şüphesi", "SYN cookie ve rate limit ayarlarını kontrol edin"),
+    (r"no space left|disk (usage|full)|smart.*(fail|error)", "error",
+     "Disk sorunu", "Disk doluluğunu ve sağlığını kontrol edin"),
+    (r"deadlock", "error",
+     "Veritabanı deadlock", "İşlem sıralamasını ve indeksleri gözden geçirin"),
+    (r"too many connections|connection limit", "error",
+     "Bağlantı limiti aşıldı", "Connection pool ayarlarını gözden geçirin"),
+    (r"slow query|timeout|timed out", "warning",
+     "Yavaş sorgu / zaman aşımı", "Sorgu planını ve kaynak kullanımını inceleyin"),
+    (r"\b(critical|fatal|panic)\b", "critical",
+     "Kritik hata kaydı", "İlgili servisi hemen kontrol edin"),
+    (r"\berror\b", "error",
+     "Hata kaydı", "Hata detayını inceleyin"),
+]
+
+
+class RuleBasedBackend(BaseLLMBackend):
+    """Ağa çıkmayan, deterministik kural tabanlı backend.
+
+    Prompt içindeki `[kaynak:satır] log` satırlarını regex kurallarıyla
+    tarar ve LLM ile aynı JSON formatında yanıt üretir.
+    """
+
+    LINE_PATTERN = re.compile(r"^\[[^\]:]+:\d+\] (.*)$")
+
+    def __init__(
+        self,
+        name: str = "rules",
+        rules: list[tuple[str, str, str, str]] | None = None,
+        max_concurrency: int = 16
+    ):
+        super().__init__(name, max_concurrency)
+        self.rules = [
+            (re.compile(pattern, re.IGNORECASE), severity, summary, recommendation)
+            for pattern, severity, summary, recommendation in (rules or DEFAULT_RULES)
+        ]
+
+    def match(self, line: str) -> dict | None:
+        """Satıra uyan ilk kuralın alarm sözlüğünü döndür."""
+        for pattern, severity, summary, recommendation in self.rules:
+            if pattern.search(line):
+                return {
+                    "severity": severity,
+                    "summary": summary,
+                    "details": f"Kural eşleşmesi: {pattern.pattern}",
+                    "log_line": line,
+                    "recommendation": recommendation
+                }
+        return None
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        alerts = []
+        for raw in prompt.splitlines():
+            line_match = self.LINE_PATTERN.match(raw)
+            if not line_match:
+                continue
+            alert = self.match(line_match.group(1))
+            if alert:
+                alerts.append(alert)
+        return json.dumps({"alerts": alerts, "has_issues": bool(alerts)}, ensure_ascii=False)
+
+
+def create_backend(name: str, backend_config: dict) -> BaseLLMBackend:
+    """Konfigürasyon sözlüğünden backend oluştur."""
+    backend_type = backend_config.get("type", "openai")
+    common = {
+        "max_concurrency": backend_config.get("max_concurrency", 4),
+        "max_connections": backend_config.get("max_connections", 10),
+        "keepalive_expiry": backend_config.get("keepalive_expiry", 30.0),
+        "timeout": backend_config.get("timeout", 60.0),
+    }
+
+    if backend_type == "openai":
+        return OpenAIBackend(
+            name,
+            api_key=backend_config["api_key"],
+            model=backend_config.get("model", "gpt-4o-mini"),
+            base_url=backend_config.get("base_url") or None,
+            **common
+        )
+    if backend_type == "openai_compatible":
+        return OpenAICompatibleBackend(
+            name,
+            base_url=backend_config["base_url"],
+            api_key=backend_config.get("api_key", ""),
+            model=backend_config.get("model", "local-model"),
+            **common
+        )
+    if backend_type == "rules":
+        return RuleBasedBackend(name, max_concurrency=backend_config.get("max_concurrency", 16))
+
+    raise ValueError(f"Bilinmeyen LLM backend tipi: {backend_type}")
+
+
+def build_backends(config) -> dict[str, BaseLLMBackend]:
+    """Config'deki tüm backend'leri oluştur.
+
+    `default` backend `openai` bölümünden, diğerleri `llm_backends`
+    bölümünden gelir.
+    """
+    backends = {"default": create_backend("default", config.openai_backend)}
+    for name, backend_config in config.llm_backends.items():
+        backends[name] = create_backend(name, backend_config)
+    return backends
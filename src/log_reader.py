@@ -1,26 +1,72 @@
 """Log dosyası okuma ve izleme modülü."""
 
 import os
+import re
+import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Generator
+from typing import Callable, Generator
 
+from .tracing import span
 
-@dataclass
+CHUNK_SIZE = 1024 * 1024
+# Sonunda newline olmayan satır bu kadar süre değişmezse yine de işlenir
+PARTIAL_LINE_TIMEOUT = 30.0
+
+
+@dataclass(slots=True)
 class LogEntry:
     """Tek bir log satırını temsil eder."""
     source_name: str
     source_type: str
     line: str
     line_number: int
+    ingested_at: float = 0.0  # Satırın okunduğu/alındığı an (epoch)
+
+
+def compile_line_filter(source: dict) -> Callable[[bytes], bool] | None:
+    """Kaynağın `include`/`exclude` regex listelerinden bayt düzeyinde filtre üret.
+
+    Satır, `include` verilmişse en az birine uymalı ve hiçbir `exclude`
+    kalıbına uymamalıdır. Filtre yoksa None döner.
+    """
+    include = [re.compile(p.encode("utf-8")) for p in source.get("include") or []]
+    exclude = [re.compile(p.encode("utf-8")) for p in source.get("exclude") or []]
+    if not include and not exclude:
+        return None
+
+    def line_filter(line: bytes) -> bool:
+        if include and not any(p.search(line) for p in include):
+            return False
+        return not any(p.search(line) for p in exclude)
+
+    return line_filter
 
 
 class LogReader:
-    """Log dosyalarını okuyan ve izleyen sınıf."""
+    """Log dosyalarını okuyan ve izleyen sınıf.
+
+    Yeni satırlar ikili modda büyük parçalar halinde okunup `b"\n"` ile
+    bölünür; yalnızca filtreden geçen satırlar decode edilir. Pozisyon her
+    zaman son tam satırın sonunda tutulur, yazılmakta olan yarım satır bir
+    sonraki turda tamamıyla okunur.
+    """
 
-    def __init__(self, log_sources: list[dict]):
+    def __init__(
+        self,
+        log_sources: list[dict],
+        chunk_size: int = CHUNK_SIZE,
+        partial_timeout: float = PARTIAL_LINE_TIMEOUT
+    ):
         self.log_sources = log_sources
+        self.chunk_size = chunk_size
+        self.partial_timeout = partial_timeout
         self._file_positions: dict[str, int] = {}
+        # path -> (yarım satırın başlangıcı, uzunluğu, ilk görülme zamanı)
+        self._partials: dict[str, tuple[int, int, float]] = {}
+        # path -> zaman aşımıyla yarım olarak verilmiş satırın bittiği offset
+        self._emitted_partials: dict[str, int] = {}
+        self._filters: dict[str, tuple[tuple, Callable[[bytes], bool] | None]] = {}
 
     def _get_file_position(self, path: str) -> int:
         """Dosyanın son okunan pozisyonunu döndür."""
@@ -30,55 +76,158 @@ class LogReader:
         """Dosyanın son okunan pozisyonunu kaydet."""
         self._file_positions[path] = position
 
-    def read_new_lines(self, source: dict) -> Generator[LogEntry, None, None]:
-        """Bir log kaynağından yeni satırları oku."""
-        path = source["path"]
-        name = source["name"]
-        log_type = source["type"]
+    def update_sources(self, log_sources: list[dict]) -> tuple[list[dict], list[dict]]:
+        """Kaynak listesini değiştir; (eklenen, çıkarılan) kaynakları döndür.
 
-        if not Path(path).exists():
-            return
+        Yolu değişmeyen kaynakların pozisyonları korunur; çıkarılanların
+        pozisyonları silinir.
+        """
+        old_paths = {s["path"] for s in self.log_sources}
+        new_paths = {s["path"] for s in log_sources}
+        added = [s for s in log_sources if s["path"] not in old_paths]
+        removed = [s for s in self.log_sources if s["path"] not in new_paths]
 
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                # Dosya boyutunu kontrol et (log rotation durumu)
-                file_size = os.path.getsize(path)
-                last_position = self._get_file_position(path)
+        for source in removed:
+            self._file_positions.pop(source["path"], None)
+            self._partials.pop(source["path"], None)
+            self._emitted_partials.pop(source["path"], None)
+        self.log_sources = log_sources
+        return added, removed
+
+    def position_of(self, path: str) -> int:
+        """Dosyanın son okunan pozisyonu (dışarıda saklamak için)."""
+        return self._get_file_position(path)
+
+    def restore_position(self, path: str, position: int) -> None:
+        """Dışarıda saklanan pozisyonu geri yükle."""
+        self._set_file_position(path, position)
+
+    def _line_filter(self, source: dict) -> Callable[[bytes], bool] | None:
+        """Kaynağın derlenmiş filtresi (config değişirse yeniden derlenir)."""
+        key = (tuple(source.get("include") or ()), tuple(source.get("exclude") or ()))
+        cached = self._filters.get(source["name"])
+        if cached is None or cached[0] != key:
+            cached = (key, compile_line_filter(source))
+            self._filters[source["name"]] = cached
+        return cached[1]
+
+    def read_new_raw(self, source: dict) -> Generator[tuple[int, bytes], None, None]:
+        """Yeni satırları decode etmeden (satır no, bayt) olarak döndür.
+
+        Boş satırlar atlanır. Dosyanın sonundaki newline'sız satır,
+        `partial_timeout` boyunca değişmeden kalmadıkça döndürülmez ve
+        pozisyon onun başında bırakılır. Zaman aşımıyla yarım olarak
+        verilen satırı yazan sonradan tamamlarsa, devamı (ilk `\n`'e
+        kadar) ayrı bir satır olarak verilmez.
+        """
+        path = source["path"]
+
+        with open(path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            start = self._get_file_position(path)
 
-                # Dosya küçülmüşse (rotation), baştan başla
-                if file_size < last_position:
-                    last_position = 0
+            # Dosya küçülmüşse (rotation), baştan başla
+            if file_size < start:
+                start = 0
+                self._partials.pop(path, None)
+                self._emitted_partials.pop(path, None)
 
-                f.seek(last_position)
-                line_number = 0
+            f.seek(start)
+            consumed = 0
+            carry = b""
+            line_number = 0
+            skip_continuation = self._emitted_partials.pop(path, None) == start
 
-                for line in f:
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                consumed += len(chunk)
+                lines = chunk.split(b"\n")
+                if skip_continuation:
+                    # Önceden yarım verilmiş satırın devamı
+                    if len(lines) == 1:
+                        continue
+                    lines[0] = b""
+                    skip_continuation = False
+                if carry:
+                    lines[0] = carry + lines[0]
+                carry = lines.pop()
+                for line in lines:
                     line = line.strip()
                     if line:
                         line_number += 1
-                        yield LogEntry(
-                            source_name=name,
-                            source_type=log_type,
-                            line=line,
-                            line_number=line_number
-                        )
+                        yield line_number, line
 
-                self._set_file_position(path, f.tell())
+            end = start + consumed
+            if skip_continuation:
+                # Devamı henüz satır sonuna ulaşmadı; sonraki turda da atlanır
+                self._emitted_partials[path] = end
+            elif carry:
+                # Yazılmakta olan (torn) son satır
+                partial_start = end - len(carry)
+                previous = self._partials.get(path)
+                now = time.monotonic()
+                if previous is None or previous[:2] != (partial_start, len(carry)):
+                    self._partials[path] = (partial_start, len(carry), now)
+                    end = partial_start
+                elif now - previous[2] < self.partial_timeout:
+                    end = partial_start
+                else:
+                    del self._partials[path]
+                    self._emitted_partials[path] = end
+                    line = carry.strip()
+                    if line:
+                        line_number += 1
+                        yield line_number, line
+            else:
+                self._partials.pop(path, None)
 
-        except PermissionError:
-            print(f"[UYARI] {path} dosyasına erişim izni yok")
-        except Exception as e:
-            print(f"[HATA] {path} okunurken hata: {e}")
+            self._set_file_position(path, end)
+
+    def read_new_lines(self, source: dict) -> Generator[LogEntry, None, None]:
+        """Bir log kaynağından yeni satırları oku."""
+        path = source["path"]
+        name = source["name"]
+        log_type = source["type"]
 
-    def read_all_new_lines(self) -> list[LogEntry]:
-        """Tüm kaynaklardan yeni satırları oku."""
+        if not Path(path).exists():
+            return
+
+        line_filter = self._line_filter(source)
+        ingested_at = time.time()
+        with span("read_new_lines", source=name):
+            try:
+                for line_number, raw in self.read_new_raw(source):
+                    # Filtreye takılan satır hiç decode edilmez
+                    if line_filter is not None and not line_filter(raw):
+                        continue
+                    yield LogEntry(
+                        source_name=name,
+                        source_type=log_type,
+                        line=raw.decode("utf-8", errors="ignore"),
+                        line_number=line_number,
+                        ingested_at=ingested_at
+                    )
+
+            except PermissionError:
+                print(f"[UYARI] {path} dosyasına erişim izni yok")
+            except Exception as e:
+                print(f"[HATA] {path} okunurken hata: {e}")
+
+    def read_all_new_lines(self, sources: list[dict] | None = None) -> list[LogEntry]:
+        """Tüm kaynaklardan (veya verilen alt kümeden) yeni satırları oku."""
         entries = []
-        for source in self.log_sources:
+        for source in self.log_sources if sources is None else sources:
             entries.extend(self.read_new_lines(source))
         return entries
 
     def read_last_n_lines(self, source: dict, n: int = 100) -> list[LogEntry]:
-        """Bir log kaynağından son n satırı oku."""
+        """Bir log kaynağından son n tam satırı oku.
+
+        Newline'sız (yazılmakta olan) son satır alınmaz; pozisyon onun
+        başına ayarlanır, tamamlandığında bir sonraki okumada gelir.
+        """
         path = source["path"]
         name = source["name"]
         log_type = source["type"]
@@ -87,23 +236,27 @@ class LogReader:
             return []
 
         entries = []
+        ingested_at = time.time()
         try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                lines = f.readlines()
-                start = max(0, len(lines) - n)
+            with open(path, "rb") as f:
+                data = f.read()
+            lines = data.split(b"\n")
+            torn = lines.pop()
+            start = max(0, len(lines) - n)
 
-                for i, line in enumerate(lines[start:], start=start + 1):
-                    line = line.strip()
-                    if line:
-                        entries.append(LogEntry(
-                            source_name=name,
-                            source_type=log_type,
-                            line=line,
-                            line_number=i
-                        ))
+            for i, line in enumerate(lines[start:], start=start + 1):
+                line = line.strip()
+                if line:
+                    entries.append(LogEntry(
+                        source_name=name,
+                        source_type=log_type,
+                        line=line.decode("utf-8", errors="ignore"),
+                        line_number=i,
+                        ingested_at=ingested_at
+                    ))
 
-            # Pozisyonu dosya sonuna ayarla
-            self._set_file_position(path, os.path.getsize(path))
+            # Pozisyonu son tam satırın sonuna ayarla
+            self._set_file_position(path, len(data) - len(torn))
 
         except PermissionError:
             print(f"[UYARI] {path} dosyasına erişim izni yok")
@@ -112,17 +265,35 @@ class LogReader:
 
         return entries
 
-    def initialize_positions(self) -> None:
-        """Tüm dosyaların pozisyonlarını dosya sonuna ayarla (sadece yeni logları izle)."""
-        for source in self.log_sources:
+    def initialize_positions(self, sources: list[dict] | None = None) -> None:
+        """Tüm dosyaların pozisyonlarını son tam satırın sonuna ayarla (sadece yeni logları izle).
+
+        Dosya yarım bir satırla bitiyorsa pozisyon o satırın başında kalır;
+        aksi halde bir sonraki okuma satırın kalanını ayrı bir parça olarak verirdi.
+        """
+        for source in self.log_sources if sources is None else sources:
             path = source["path"]
             if Path(path).exists():
                 try:
-                    self._set_file_position(path, os.path.getsize(path))
+                    self._set_file_position(path, line_aligned_end(path))
                 except Exception:
                     pass
 
 
+def line_aligned_end(path: str, chunk_size: int = 64 * 1024) -> int:
+    """Dosyadaki son `\\n`'den hemen sonraki offset (newline yoksa 0)."""
+    with open(path, "rb") as f:
+        position = os.fstat(f.fileno()).st_size
+        while position > 0:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            index = f.read(step).rfind(b"\n")
+            if index != -1:
+                return position + index + 1
+    return 0
+
+
 def batch_entries(entries: list[LogEntry], batch_size: int) -> Generator[list[LogEntry], None, None]:
     """Log entry'lerini batch'lere böl."""
     for i in range(0, len(entries), batch_size):
@@ -5,68 +5,400 @@ import argparse
 import signal
 import sys
 import time
+from contextlib import nullcontext
+from datetime import datetime
 from pathlib import Path
 
-from dotenv import load_dotenv
-load_dotenv()
-
-from .alerter import AlertManager, ConsoleAlerter, EmailAlerter
+from .alerter import AlertManager, build_alerters
 from .config import Config
-from .llm_analyzer import LLMAnalyzer
+from .incidents import create_incident_engine
+from .correlation import create_correlator
+from .llm_analyzer import create_analyzer, create_spill_queue, resilience_settings
 from .log_reader import LogReader
+from .scheduler import create_scheduler
+from .tracing import configure_tracing, get_tracer, span
+
+# Daemon'a özgü modüller (cluster, receivers, search_index) ve web
+# bağımlılıkları yalnızca ilgili modda import edilir; smtplib/email,
+# sqlite3 ve cProfile de onları kullanan sınıfın içinde yüklenir.
+# --once CI çalıştırmaları bunların başlangıç maliyetini ödemez.
 
 
 class LogAlarmApp:
     """Ana uygulama sınıfı."""
 
-    def __init__(self, config_path: str | None = None):
+    def __init__(
+        self,
+        config_path: str | None = None,
+        cluster: bool = False,
+        worker_id: str | None = None,
+        daemon: bool = False
+    ):
         self.config = Config(config_path)
         self.running = False
 
+        # Aşama süreleri (kapalıysa span'ler no-op)
+        configure_tracing(self.config.tracing)
+
         # Log reader
         self.log_reader = LogReader(self.config.log_sources)
 
-        # LLM Analyzer
-        self.analyzer = LLMAnalyzer(
-            api_key=self.config.openai_api_key,
-            model=self.config.openai_model,
-            max_tokens=self.config.openai_max_tokens,
-            prompt_template=self.config.prompt_template,
-            severity_threshold=self.config.severity_threshold
-        )
-
-        # Alert Manager
+        # LLM Analyzer ve önündeki kaynak zamanlayıcı
+        # Spill kuyruğu yalnızca onu tekrar oynatan daemon modunda açılır
+        self._daemon = daemon
+        self.analyzer = create_analyzer(self.config, spill=daemon)
+        self.scheduler = create_scheduler(self.config)
+
+        # Daemon bileşenleri run_daemon içinde kurulur
+        self._cluster = cluster
+        self._worker_id = worker_id
+        self.search_index = None
+        self.ingest_buffer = None
+        self.syslog_receiver = None
+        self.coordinator = None
+        self.sampler = None
+        self.stats_store = None
+        self._cluster_alerter = None
+
+        # Hot reload: SIGHUP veya config dosyasının mtime'ı değişince
+        self._reload_requested = False
+        self._config_mtime = self._config_signature()
+
+        # Alert Manager; olay motoru açıksa alarmlar olaylarda toplanır
         self.alert_manager = AlertManager()
         self._setup_alerters()
-
-    def _setup_alerters(self) -> None:
-        """Alerter'ları ayarla."""
-        # Console alerter
-        console_config = self.config.console_alerting
-        if console_config.get("enabled", True):
-            self.alert_manager.add_alerter(
-                ConsoleAlerter(colored=console_config.get("colored", True))
+        self.incidents = create_incident_engine(self.config.incidents)
+
+    def _setup_alerters(self, alerters: list | None = None) -> None:
+        """Alerter'ları ayarla; reload'da önceden kurulmuş liste verilir."""
+        if alerters is None:
+            alerters = build_alerters(self.config)
+
+        # Eskiler kapatılır; cluster modunun SQLite alerter'ı korunur
+        self.alert_manager.close(exclude=[self._cluster_alerter])
+        self.alert_manager.alerters = []
+        if self._cluster_alerter is not None:
+            self.alert_manager.add_alerter(self._cluster_alerter)
+        for alerter in alerters:
+            self.alert_manager.add_alerter(alerter)
+
+    def close(self) -> None:
+        """Alarm kuyruklarını boşalt, hedefleri ve backend bağlantılarını kapat."""
+        self.alert_manager.close()
+        self.analyzer.close()
+        if self.stats_store is not None:
+            self.stats_store.close()
+
+    def _setup_daemon(self) -> None:
+        """Yalnızca daemon modunda gereken bileşenleri kur."""
+        from .receivers import IngestBuffer, create_syslog_receiver
+        from .sampling import create_sampler
+        from .search_index import create_search_index
+        from .stats_store import create_stats_store
+
+        # Yüksek hacimli kaynaklardan LLM'e yalnızca örnek gider
+        self.sampler = create_sampler(self.config.sampling)
+
+        # Zamanlayıcı, örnekleme ve aşama süresi sayaçları web sürecinin
+        # okuyabileceği ortak dosyaya yazılır
+        self.stats_store = create_stats_store(self.config.stats)
+
+        # Alınan satırlar arama indeksine yazılır
+        self.search_index = create_search_index(self.config.search)
+
+        # Ağ kaynakları (syslog) ortak tampona yazar, daemon her turda boşaltır
+        network_config = self.config.network_sources
+        self.ingest_buffer = IngestBuffer(
+            max_size=network_config.get("buffer_size", 10000),
+            max_lines_per_sender=network_config.get("max_lines_per_sender", 0),
+            max_senders=network_config.get("max_senders", 1024),
+            max_sources=network_config.get("max_sources", 256)
+        )
+        self.syslog_receiver = create_syslog_receiver(network_config, self.ingest_buffer)
+
+        # Çok worker'lı mod: kaynaklar paylaşılan lease tablosundan alınır
+        cluster_config = self.config.cluster
+        if self._cluster or cluster_config.get("enabled", False):
+            from .alerter import SQLiteAlerter
+            from .cluster import ClusterCoordinator
+
+            self.coordinator = ClusterCoordinator(
+                self.log_reader,
+                db_path=cluster_config.get("db_path", "./cluster/leases.db"),
+                worker_id=self._worker_id,
+                lease_ttl=cluster_config.get("lease_ttl", 30),
+                heartbeat_interval=cluster_config.get("heartbeat_interval", 10),
+                vnodes=cluster_config.get("vnodes", 64)
             )
 
-        # Email alerter
-        email_config = self.config.email_alerting
-        if email_config.get("enabled", False):
-            self.alert_manager.add_alerter(
-                EmailAlerter(
-                    smtp_host=email_config["smtp_host"],
-                    smtp_port=email_config["smtp_port"],
-                    username=email_config["username"],
-                    password=email_config["password"],
-                    from_addr=email_config["from_addr"],
-                    to_addrs=email_config["to_addrs"]
-                )
+            # Cluster modunda tüm worker'ların alarmları tek depoda birleşir
+            self._cluster_alerter = SQLiteAlerter(
+                cluster_config.get("alerts_db_path", "./cluster/alerts.db"),
+                worker_id=self.coordinator.worker_id
             )
+            self.alert_manager.add_alerter(self._cluster_alerter)
 
     def _handle_signal(self, signum, frame) -> None:
         """SIGINT/SIGTERM handler."""
         print("\n[INFO] Durdurma sinyali alındı, çıkılıyor...")
         self.running = False
 
+    def _handle_reload(self, signum, frame) -> None:
+        """SIGHUP handler; reload bir sonraki tur başında yapılır."""
+        print("\n[INFO] SIGHUP alındı, konfigürasyon yeniden yüklenecek")
+        self._reload_requested = True
+
+    def _handle_profile(self, signum, frame) -> None:
+        """SIGUSR1 handler; bir sonraki tur cProfile ile ölçülür."""
+        print("\n[INFO] SIGUSR1 alındı, bir sonraki tur profillenecek")
+        get_tracer().request_profile()
+
+    def _config_signature(self) -> tuple[int, int] | None:
+        """Config dosyasının (mtime_ns, size) imzası."""
+        try:
+            stat = self.config.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _maybe_reload(self) -> bool:
+        """Gerekiyorsa config'i yeniden yükle ve farkları uygula.
+
+        Turlar arasında çağrılır; böylece yarıda kalan bir batch eski,
+        sonraki batch yeni ayarlarla çalışır. Geçersiz config reddedilir
+        ve çalışan durum değişmez.
+        """
+        signature = self._config_signature()
+        watch = self.config.reload.get("watch", False)
+        if not self._reload_requested and not (watch and signature != self._config_mtime):
+            return False
+        self._reload_requested = False
+        self._config_mtime = signature
+
+        # Önce tüm yeni bileşenler kurulur; herhangi biri başarısız olursa
+        # çalışan durum hiç değişmemiş olur
+        try:
+            new_config = Config(str(self.config.path))
+            changed = self.config.changed_sections(new_config)
+            if not changed:
+                print("[INFO] Konfigürasyonda değişiklik yok")
+                return False
+
+            # Analyzer yalnızca backend tanımları değişince yeniden kurulur;
+            # diğer ayarlar çalışan analyzer'a yerinde uygulanır
+            new_analyzer = new_correlator = new_spill_queue = None
+            if changed & {"openai", "llm_backends"}:
+                new_analyzer = create_analyzer(new_config, spill=self._daemon)
+            else:
+                if "correlation" in changed:
+                    new_correlator = create_correlator(new_config.correlation)
+                if "resilience" in changed:
+                    new_spill_queue = create_spill_queue(resilience_settings(new_config, self._daemon))
+
+            new_sampler = self.sampler
+            if "sampling" in changed:
+                from .sampling import create_sampler
+
+                new_sampler = create_sampler(new_config.sampling)
+
+            incidents_config = new_config.incidents
+            replace_incidents = "incidents" in changed and (
+                self.incidents is None or not incidents_config.get("enabled", False)
+            )
+            new_incidents = create_incident_engine(incidents_config) if replace_incidents else None
+
+            # En son kurulur: başarısız olursa kendi açtıklarını kapatır
+            new_alerters = build_alerters(new_config) if "alerting" in changed else None
+        except Exception as e:
+            print(f"[HATA] Yeni konfigürasyon reddedildi, eski ayarlarla devam: {e}")
+            return False
+
+        self.config = new_config
+
+        if "log_sources" in changed:
+            added, removed = self.log_reader.update_sources(new_config.log_sources)
+            if added and self.coordinator is None:
+                # Yeni kaynaklar da yalnızca bundan sonraki satırlarla başlar
+                self.log_reader.initialize_positions(added)
+            for source in added:
+                print(f"[INFO] Kaynak eklendi: {source['name']}")
+            for source in removed:
+                print(f"[INFO] Kaynak çıkarıldı: {source['name']}")
+
+        if new_analyzer is not None:
+            # Breaker/retry durumu ve varlık indeksi korunur; eski backend'lerin
+            # bağlantı havuzları kapatılır (turlar arasında, istek yokken)
+            old_analyzer = self.analyzer
+            new_analyzer.adopt_state(old_analyzer, keep_correlator="correlation" not in changed)
+            self.analyzer = new_analyzer
+            old_analyzer.close()
+        else:
+            if "log_sources" in changed:
+                self.analyzer.assign_sources(new_config.log_sources)
+            if "correlation" in changed:
+                self.analyzer.correlator = new_correlator
+            if "resilience" in changed:
+                self.analyzer.configure_resilience(
+                    resilience_settings(new_config, self._daemon), new_spill_queue
+                )
+            self.analyzer.prompt_template = new_config.prompt_template
+            self.analyzer.severity_threshold = new_config.severity_threshold
+            self.analyzer.max_tokens = new_config.openai_max_tokens
+
+        self.sampler = new_sampler
+
+        if "stats" in changed and self._daemon:
+            from .stats_store import create_stats_store
+
+            if self.stats_store is not None:
+                self.stats_store.close()
+            self.stats_store = create_stats_store(new_config.stats)
+
+        if "tracing" in changed:
+            configure_tracing(new_config.tracing)
+
+        if changed & {"log_sources", "scheduler"}:
+            self.scheduler.configure(new_config.log_sources, new_config.scheduler)
+        if changed & {"scheduler", "analysis", "openai", "prompt_template"}:
+            self.scheduler.configure_batches(
+                new_config.batch_size, new_config.prompt_template, new_config.openai_max_tokens
+            )
+
+        if replace_incidents:
+            self.incidents = new_incidents
+        elif "incidents" in changed:
+            # Açık olaylar korunur
+            self.incidents.window_seconds = incidents_config.get("window_seconds", 1800)
+            self.incidents.renotify_seconds = incidents_config.get("renotify_seconds", 3600)
+            self.incidents.max_incidents = incidents_config.get("max_incidents", 1000)
+
+        if new_alerters is not None:
+            self._setup_alerters(new_alerters)
+
+        restart_only = changed & {"network_sources", "search", "cluster"}
+        if restart_only:
+            print(f"[UYARI] Şu bölümler yeniden başlatma gerektirir: {', '.join(sorted(restart_only))}")
+
+        print(f"[INFO] Konfigürasyon yeniden yüklendi, değişen bölümler: {', '.join(sorted(changed))}")
+        return True
+
+    def _notify(self, alerts: list) -> None:
+        """Alarmları (olay motoru açıksa olay bildirimleri olarak) gönder."""
+        if not alerts:
+            return
+        if self.incidents is None:
+            self.alert_manager.send_all(alerts)
+            return
+
+        notifications = self.incidents.notifications(alerts)
+        if self.config.incidents.get("notify", "incident") == "alert":
+            self.alert_manager.send_all(alerts)
+        elif notifications:
+            self.alert_manager.send_all(notifications)
+
+    def _select_for_analysis(self, entries: list) -> tuple[list, dict[str, str]]:
+        """Örnekleme ve kota aşamalarından geçir; (LLM'e gidecekler, kaynak özetleri) döndür."""
+        summaries: dict[str, str] = {}
+        candidates = entries
+        if self.sampler is not None:
+            candidates, summaries = self.sampler.process(entries)
+
+        admitted, overflow = self.scheduler.schedule(candidates)
+        if overflow:
+            print(
+                f"[UYARI] Kota aşımı, {len(candidates) - len(admitted)} satır örneklendi: "
+                f"{', '.join(sorted(overflow))}"
+            )
+        for name, text in overflow.items():
+            summaries[name] = f"{summaries[name]}\n{text}" if name in summaries else text
+        return admitted, summaries
+
+    def _analyze(self, entries: list) -> list:
+        """Satırları örnekleme ve kotadan geçirip analiz et; alarmları bildir ve döndür."""
+        with span("select"):
+            admitted, summaries = self._select_for_analysis(entries)
+        with span("analyze_batch", lines=len(admitted)):
+            alerts = self.analyzer.analyze_batch(admitted, self.config.batch_size, summaries)
+
+        if alerts:
+            self._notify(alerts)
+        return alerts
+
+    def _tick(self) -> None:
+        """Daemon'un tek turu: oku, indeksle, seç, analiz et, bildir."""
+        self._maybe_reload()
+
+        # Kesinti sırasında diske bırakılan batch'leri tekrar dene
+        with span("replay_spilled"):
+            replayed = self.analyzer.replay_spilled()
+        if replayed:
+            self._notify(replayed)
+
+        if self.coordinator is None:
+            entries = self.log_reader.read_all_new_lines()
+        else:
+            entries = self.log_reader.read_all_new_lines(self.coordinator.rebalance())
+        entries.extend(self.ingest_buffer.drain())
+
+        if self.search_index is not None:
+            with span("search_index"):
+                self.search_index.add(entries)
+                self.search_index.apply_retention()
+
+        if entries:
+            print(f"[INFO] {len(entries)} yeni log satırı tespit edildi")
+            self._analyze(entries)
+
+        if self.coordinator is not None:
+            self.coordinator.commit_positions()
+
+    def _report_tick(self, profiled: bool) -> None:
+        """Turun aşama dökümünü ve istenmişse cProfile çıktısını yazdır."""
+        tracer = get_tracer()
+        breakdown = tracer.end_tick()
+        if breakdown and self.config.tracing.get("log_ticks", False):
+            stages = ", ".join(
+                f"{name}={seconds * 1000:.0f}ms"
+                for name, seconds in sorted(breakdown.items(), key=lambda item: -item[1])
+            )
+            print(f"[DEBUG] Tur süreleri: {stages}")
+
+        if profiled and tracer.last_profile is not None:
+            profile = tracer.last_profile
+            print(f"\n[PROFILE] {profile['label']} ({profile['duration_ms']} ms)", file=sys.stderr)
+            print(profile["text"], file=sys.stderr)
+
+    @property
+    def _worker_name(self) -> str:
+        """Paylaşılan depolarda bu sürecin adı."""
+        return self.coordinator.worker_id if self.coordinator is not None else "daemon"
+
+    def _publish_stats(self) -> None:
+        """Zamanlayıcı, örnekleme ve aşama süresi sayaçlarını web sürecinin okuduğu depoya yaz."""
+        if self.stats_store is None:
+            return
+        self.stats_store.publish("scheduler", self._worker_name, self.scheduler.stats())
+        if self.sampler is not None:
+            self.stats_store.publish("sampling", self._worker_name, self.sampler.export())
+        tracer = get_tracer()
+        if tracer.enabled:
+            self.stats_store.publish(
+                "timings", self._worker_name, {**tracer.timings(), "last_profile": tracer.last_profile}
+            )
+
+    def _sleep(self, seconds: float) -> None:
+        """Bekle; cluster modunda durdurma sinyaline kısa aralıklarla bakılır.
+
+        Lease'ler koordinatörün heartbeat thread'inde yenilenir.
+        """
+        if self.coordinator is None:
+            time.sleep(seconds)
+            return
+
+        deadline = time.monotonic() + seconds
+        while self.running and time.monotonic() < deadline:
+            time.sleep(min(1.0, max(0.0, deadline - time.monotonic())))
+
     def run_once(self) -> int:
         """Tek seferlik analiz yap ve alarm sayısını döndür."""
         print("[INFO] Loglar okunuyor...")
@@ -86,12 +418,58 @@ class LogAlarmApp:
         alerts = self.analyzer.analyze_batch(entries, self.config.batch_size)
 
         if alerts:
-            self.alert_manager.send_all(alerts)
+            self._notify(alerts)
             return len(alerts)
         else:
             print("[INFO] Alarm üretecek bir durum tespit edilmedi")
             return 0
 
+    def run_backfill(
+        self,
+        since: datetime | None,
+        until: datetime | None,
+        year: int | None = None
+    ) -> int:
+        """Dönmüş/sıkıştırılmış arşivleri zaman penceresine göre analiz et.
+
+        Arşiv satırları canlı kaynaklarla aynı örnekleme ve kota hattından
+        geçer; dosyalar parça parça analiz edilir.
+        """
+        from .backfill import BATCH_LINES, run_backfill
+        from .sampling import create_sampler
+
+        backfill_config = self.config.backfill
+        print(f"[INFO] Backfill: {since or '-'} -> {until or '-'}")
+
+        if self.sampler is None:
+            self.sampler = create_sampler(self.config.sampling)
+
+        alert_count = 0
+        current_path, line_count = None, 0
+        for path, entries in run_backfill(
+            self.config.log_sources,
+            since,
+            until,
+            workers=backfill_config.get("workers", 4),
+            chunk_size=backfill_config.get("chunk_size", 1024 * 1024),
+            year=year,
+            batch_lines=backfill_config.get("batch_lines", BATCH_LINES)
+        ):
+            # Bir dosyanın parçaları art arda gelir
+            if path != current_path:
+                if current_path is not None:
+                    print(f"  - {current_path}: {line_count} satır")
+                current_path, line_count = path, 0
+            line_count += len(entries)
+            if entries:
+                alert_count += len(self._analyze(entries))
+        if current_path is not None:
+            print(f"  - {current_path}: {line_count} satır")
+
+        if alert_count == 0:
+            print("[INFO] Alarm üretecek bir durum tespit edilmedi")
+        return alert_count
+
     def run_daemon(self) -> None:
         """Sürekli izleme modunda çalış."""
         self.running = True
@@ -99,36 +477,95 @@ class LogAlarmApp:
         # Signal handler'ları ayarla
         signal.signal(signal.SIGINT, self._handle_signal)
         signal.signal(signal.SIGTERM, self._handle_signal)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._handle_reload)
+        if hasattr(signal, "SIGUSR1"):
+            signal.signal(signal.SIGUSR1, self._handle_profile)
+
+        self._setup_daemon()
+
+        # Bağlanamazsa RuntimeError ile çıkılır; daemon alıcısız çalışmaz
+        if self.syslog_receiver is not None:
+            self.syslog_receiver.start_background()
 
-        # Pozisyonları başlat (sadece yeni logları izle)
-        self.log_reader.initialize_positions()
+        # Pozisyonları başlat (sadece yeni logları izle); cluster modunda
+        # pozisyonlar lease tablosundan gelir
+        if self.coordinator is None:
+            self.log_reader.initialize_positions()
+        else:
+            print(f"[INFO] Cluster modu, worker: {self.coordinator.worker_id}")
+            self.coordinator.start_heartbeat()
 
         print(f"[INFO] Log izleme başlatıldı (interval: {self.config.interval_seconds}s)")
         print(f"[INFO] İzlenen kaynaklar: {[s['name'] for s in self.config.log_sources]}")
+        print("[INFO] Konfigürasyonu yeniden yüklemek için SIGHUP, bir turu profillemek için SIGUSR1 gönderin")
         print("[INFO] Durdurmak için Ctrl+C")
 
         while self.running:
             try:
-                entries = self.log_reader.read_all_new_lines()
-
-                if entries:
-                    print(f"[INFO] {len(entries)} yeni log satırı tespit edildi")
-                    alerts = self.analyzer.analyze_batch(entries, self.config.batch_size)
-
-                    if alerts:
-                        self.alert_manager.send_all(alerts)
+                tracer = get_tracer()
+                profiled = tracer.profile_requested
+                with tracer.profile("daemon turu"), span("tick"):
+                    self._tick()
+                self._report_tick(profiled)
+                self._publish_stats()
 
-                time.sleep(self.config.interval_seconds)
+                # Bekleme bir sonraki turun dökümünde `poll_wait` olarak görünür
+                with span("poll_wait"):
+                    self._sleep(self.config.interval_seconds)
 
             except Exception as e:
                 print(f"[HATA] Beklenmeyen hata: {e}")
                 time.sleep(5)
 
+        if self.coordinator is not None:
+            self.coordinator.shutdown()
+        if self.syslog_receiver is not None:
+            self.syslog_receiver.stop_background()
+        self.close()
+
         print("[INFO] Uygulama sonlandırıldı")
 
 
-def main():
-    """CLI entry point."""
+def _run_worker(config_path: str | None, index: int) -> None:
+    """Process pool içindeki tek bir worker'ı çalıştır."""
+    from .cluster import default_worker_id
+
+    app = LogAlarmApp(config_path, cluster=True, worker_id=default_worker_id(index), daemon=True)
+    app.run_daemon()
+
+
+def run_workers(config_path: str | None, workers: int) -> None:
+    """Yerel process pool ile N worker'lı daemon başlat."""
+    import multiprocessing
+
+    processes = [
+        multiprocessing.Process(target=_run_worker, args=(config_path, i), name=f"worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    print(f"[INFO] {workers} worker başlatıldı")
+
+    def _forward(signum, frame):
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    signal.signal(signal.SIGINT, _forward)
+    signal.signal(signal.SIGTERM, _forward)
+
+    for process in processes:
+        process.join()
+
+
+def main(profiler=None):
+    """CLI entry point.
+
+    `profiler`, `python -m src` giriş modülünde import'lardan önce kurulmuş
+    ImportProfiler'dır; verilmezse `--profile-startup` burada kurar ve
+    `src.main`'in kendi import'ları dökümde görünmez.
+    """
     parser = argparse.ArgumentParser(
         description="Log Alarm LLM - Log analizi ve alarm sistemi",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -144,8 +581,20 @@ def main():
   python -m src.main --web
   python -m src.main --web --port 3000
 
+  # Arşiv analizi (access.log.1, access.log.2.gz ...)
+  python -m src.main --backfill --since 2025-12-15 --until "2025-12-16 12:00"
+
+  # 4 worker'lı daemon (kaynaklar consistent hashing ile paylaşılır)
+  python -m src.main --daemon --workers 4
+
+  # Birden fazla host: aynı paylaşılan dizindeki lease tablosu
+  python -m src.main --daemon --cluster
+
   # Özel config dosyası
   python -m src.main --config /path/to/config.yaml --daemon
+
+  # Başlangıç süresi dökümü (import'lar dahil)
+  python -m src --once --profile-startup
         """
     )
 
@@ -167,12 +616,64 @@ def main():
         help="Sürekli izleme modunda çalış"
     )
 
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Dönmüş ve sıkıştırılmış arşivleri zaman penceresine göre analiz et"
+    )
+
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Backfill başlangıcı (ISO format, örn. 2025-12-16 veya 2025-12-16T10:00)"
+    )
+
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Backfill bitişi (ISO format)"
+    )
+
+    parser.add_argument(
+        "--year",
+        type=int,
+        default=None,
+        help="Backfill'de yılsız (syslog) zaman damgaları için yıl (varsayılan: dosya mtime'ından)"
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Daemon modunda yerel worker process sayısı"
+    )
+
+    parser.add_argument(
+        "--cluster",
+        action="store_true",
+        help="Daemon'u paylaşılan lease tablosuna katılan tek bir worker olarak çalıştır"
+    )
+
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="Cluster modunda worker kimliği (varsayılan: host-pid)"
+    )
+
     parser.add_argument(
         "--web", "-w",
         action="store_true",
         help="Web arayüzünü başlat"
     )
 
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Çıkışta import ve başlangıç süresi dökümünü yazdır"
+    )
+
     parser.add_argument(
         "--port", "-p",
         type=int,
@@ -183,22 +684,50 @@ def main():
     args = parser.parse_args()
 
     # En az bir mod seçilmeli
-    if not args.once and not args.daemon and not args.web:
+    if not args.once and not args.daemon and not args.web and not args.backfill:
         parser.print_help()
-        print("\n[HATA] --once, --daemon veya --web seçeneğinden birini belirtmelisiniz")
+        print("\n[HATA] --once, --daemon, --backfill veya --web seçeneğinden birini belirtmelisiniz")
         sys.exit(1)
 
+    if args.profile_startup:
+        import atexit
+
+        if profiler is None:
+            from .startup_profile import ImportProfiler
+
+            print(
+                "[UYARI] src.main'in import'ları ölçülemedi; tam döküm için "
+                "`python -m src ... --profile-startup` ya da `python -X importtime` kullanın",
+                file=sys.stderr
+            )
+            profiler = ImportProfiler()
+            profiler.install()
+        atexit.register(profiler.report)
+
     try:
         if args.web:
             import uvicorn
             from .api import app as web_app
             print(f"[INFO] Web arayüzü başlatılıyor: http://localhost:{args.port}")
             uvicorn.run(web_app, host="0.0.0.0", port=args.port)
+        elif args.daemon and args.workers > 1:
+            run_workers(args.config, args.workers)
         else:
-            app = LogAlarmApp(args.config)
+            with profiler.phase("Uygulama kurulumu") if profiler else nullcontext():
+                app = LogAlarmApp(
+                    args.config,
+                    cluster=args.daemon and args.cluster,
+                    worker_id=args.worker_id,
+                    daemon=args.daemon
+                )
 
-            if args.once:
+            if args.backfill:
+                alert_count = app.run_backfill(args.since, args.until, args.year)
+                app.close()
+                sys.exit(0 if alert_count == 0 else 1)
+            elif args.once:
                 alert_count = app.run_once()
+                app.close()
                 sys.exit(0 if alert_count == 0 else 1)
             else:
                 app.run_daemon()
@@ -0,0 +1,360 @@
+"""Ağ üzerinden log alma (syslog UDP/TCP) ve ortak ingest tamponu."""
+
+import asyncio
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from .log_reader import LogEntry
+
+MAX_MESSAGE_SIZE = 64 * 1024
+# Octet-counting uzunluk alanı en fazla bu kadar hane olabilir
+MAX_LENGTH_DIGITS = len(str(MAX_MESSAGE_SIZE))
+
+# Birden fazla worker aynı portu dinleyebilsin (kernel yükü dağıtır)
+REUSE_PORT = hasattr(socket, "SO_REUSEPORT")
+
+RFC5424_PATTERN = re.compile(
+    r"^<(?P<pri>\d{1,3})>(?P<version>\d{1,2}) (?P<timestamp>\S+) (?P<hostname>\S+) "
+    r"(?P<app>\S+) (?P<procid>\S+) (?P<msgid>\S+) "
+    r"(?P<sd>-|(?:\[(?:[^\]\\]|\\.)*\])+)(?: (?P<msg>.*))?$",
+    re.DOTALL
+)
+RFC3164_PATTERN = re.compile(r"^<(?P<pri>\d{1,3})>(?P<rest>.*)$", re.DOTALL)
+
+
+def parse_syslog(message: str) -> dict:
+    """RFC5424 veya RFC3164 syslog mesajını çözümle.
+
+    Dönen `line` alanı, dosyadan okunan syslog satırlarına benzer
+    biçimdedir (`zaman host uygulama: mesaj`), böylece prompt'ta fark
+    yaratmaz.
+    """
+    message = message.strip().lstrip("\ufeff")
+
+    match = RFC5424_PATTERN.match(message)
+    if match:
+        pri = int(match["pri"])
+        msg = (match["msg"] or "").lstrip("\ufeff")
+        app = match["app"] if match["app"] != "-" else ""
+        procid = f"[{match['procid']}]" if match["procid"] != "-" else ""
+        return {
+            "facility": pri // 8,
+            "severity": pri % 8,
+            "hostname": match["hostname"],
+            "app": app,
+            "line": f"{match['timestamp']} {match['hostname']} {app}{procid}: {msg}".strip()
+        }
+
+    match = RFC3164_PATTERN.match(message)
+    if match:
+        pri = int(match["pri"])
+        rest = match["rest"]
+        parts = rest.split(" ", 4)
+        hostname = parts[3] if len(parts) > 3 else ""
+        return {
+            "facility": pri // 8,
+            "severity": pri % 8,
+            "hostname": hostname,
+            "app": "",
+            "line": rest
+        }
+
+    # PRI'siz ham satır
+    return {"facility": None, "severity": None, "hostname": "", "app": "", "line": message}
+
+
+@dataclass
+class SenderStats:
+    """Tek bir göndericinin sayaçları."""
+    received: int = 0
+    dropped: int = 0
+    bytes: int = 0
+    first_seen: float = field(default_factory=time.time)
+    last_seen: float = field(default_factory=time.time)
+    window_start: float = field(default_factory=time.monotonic)
+    window_count: int = 0
+
+    @property
+    def lines_per_second(self) -> float:
+        elapsed = max(time.monotonic() - self.window_start, 1e-6)
+        return self.window_count / elapsed
+
+
+class IngestBuffer:
+    """Ağ kaynaklarından gelen satırlar için sınırlı, thread-safe tampon.
+
+    Tampon doluysa yeni satırlar düşürülür (bellek sınırlı kalır);
+    gönderici başına alınan/düşürülen satır ve bayt sayısı tutulur.
+    `max_lines_per_sender` > 0 ise gönderici başına saniyelik limit uygulanır.
+    Gönderici adresleri (UDP'de taklit edilebilir) LRU ile `max_senders`
+    sayısında tutulur. Her kaynak adı scheduler/sampler'da kalıcı durum
+    açtığı için en fazla `max_sources` farklı ad kabul edilir; sonrakiler
+    reddedilir.
+    """
+
+    RATE_WINDOW = 1.0
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        max_lines_per_sender: int = 0,
+        max_senders: int = 1024,
+        max_sources: int = 256
+    ):
+        self.max_size = max_size
+        self.max_lines_per_sender = max_lines_per_sender
+        self.max_senders = max_senders
+        self.max_sources = max_sources
+        self._entries: deque[LogEntry] = deque()
+        self._senders: OrderedDict[str, SenderStats] = OrderedDict()
+        self._line_numbers: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def accepts_source(self, source_name: str) -> bool:
+        """Kaynak adı biliniyorsa ya da `max_sources` dolmadıysa True."""
+        return source_name in self._line_numbers or len(self._line_numbers) < self.max_sources
+
+    def push(self, sender: str, source_name: str, source_type: str, line: str) -> bool:
+        """Satırı tampona ekle; düşürüldüyse False döner."""
+        line = line.strip()
+        if not line:
+            return True
+
+        with self._lock:
+            stats = self._senders.get(sender)
+            if stats is None:
+                stats = self._senders[sender] = SenderStats()
+                if len(self._senders) > self.max_senders:
+                    self._senders.popitem(last=False)
+            else:
+                self._senders.move_to_end(sender)
+
+            now = time.monotonic()
+            if now - stats.window_start >= self.RATE_WINDOW:
+                stats.window_start = now
+                stats.window_count = 0
+
+            stats.last_seen = time.time()
+            stats.bytes += len(line)
+            stats.window_count += 1
+
+            rate_limited = (
+                self.max_lines_per_sender > 0
+                and stats.window_count > self.max_lines_per_sender
+            )
+            if (
+                rate_limited
+                or len(self._entries) >= self.max_size
+                or not self.accepts_source(source_name)
+            ):
+                stats.dropped += 1
+                return False
+
+            stats.received += 1
+            line_number = self._line_numbers.get(source_name, 0) + 1
+            self._line_numbers[source_name] = line_number
+            self._entries.append(LogEntry(
+                source_name=source_name,
+                source_type=source_type,
+                line=line,
+                line_number=line_number,
+                ingested_at=stats.last_seen
+            ))
+            return True
+
+    def drain(self, max_items: int | None = None) -> list[LogEntry]:
+        """Tampondaki satırları al ve tamponu boşalt."""
+        with self._lock:
+            count = len(self._entries) if max_items is None else min(max_items, len(self._entries))
+            return [self._entries.popleft() for _ in range(count)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Tampon doluluğu ve gönderici bazlı sayaçlar."""
+        with self._lock:
+            return {
+                "buffered": len(self._entries),
+                "capacity": self.max_size,
+                "senders": {
+                    sender: {
+                        "received": s.received,
+                        "dropped": s.dropped,
+                        "bytes": s.bytes,
+                        "lines_per_second": round(s.lines_per_second, 2),
+                        "last_seen": s.last_seen
+                    }
+                    for sender, s in self._senders.items()
+                }
+            }
+
+
+class SyslogUDPProtocol(asyncio.DatagramProtocol):
+    """Her datagram bir syslog mesajıdır."""
+
+    def __init__(self, receiver: "SyslogReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.receiver.handle_message(data, addr[0])
+
+
+class SyslogReceiver:
+    """RFC5424/3164 syslog alıcısı (UDP ve TCP).
+
+    TCP'de hem octet-counting (RFC6587 `LEN SP MSG`) hem de satır sonu
+    ile ayrılmış çerçeveleme desteklenir. Bir çerçeve yalnızca `LEN SP <`
+    ile başlıyorsa octet-counting sayılır; rakamla başlayan PRI'siz satırlar
+    (`2025-12-16 ...`) satır sonu çerçevesi olarak okunur.
+    """
+
+    def __init__(
+        self,
+        buffer: IngestBuffer,
+        source_name: str = "remote_syslog",
+        source_type: str = "system",
+        host: str = "0.0.0.0",
+        udp_port: int | None = 5514,
+        tcp_port: int | None = 5514
+    ):
+        self.buffer = buffer
+        self.source_name = source_name
+        self.source_type = source_type
+        self.host = host
+        self.udp_port = udp_port
+        self.tcp_port = tcp_port
+        self._transport: asyncio.DatagramTransport | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def handle_message(self, data: bytes, sender: str) -> None:
+        """Ham mesajı çözümle ve tampona ekle."""
+        parsed = parse_syslog(data.decode("utf-8", errors="replace"))
+        self.buffer.push(sender, self.source_name, self.source_type, parsed["line"])
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, prefix: bytes) -> bytes:
+        """Önceden okunmuş `prefix` ile başlayan satırı sonuna kadar oku."""
+        if prefix.endswith(b"\n"):
+            return prefix
+        try:
+            return prefix + await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as e:
+            # Bağlantı son satırdan sonra satır sonu olmadan kapandı
+            return prefix + e.partial
+
+    async def _handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        sender = writer.get_extra_info("peername")[0]
+        try:
+            while True:
+                first = await reader.read(1)
+                if not first:
+                    break
+                if first in b"\r\n":
+                    continue
+                if not first.isdigit():
+                    self.handle_message(await self._read_line(reader, first), sender)
+                    continue
+
+                # Octet-counting adayı: "123 <mesaj>"; değilse rakamla başlayan düz satır
+                prefix = first
+                while len(prefix) <= MAX_LENGTH_DIGITS:
+                    byte = await reader.read(1)
+                    prefix += byte
+                    if not byte.isdigit():
+                        break
+                if prefix.endswith(b" ") and prefix[:-1].isdigit():
+                    prefix += await reader.read(1)
+                    if prefix.endswith(b"<"):
+                        length = int(prefix[:-2])
+                        if length > MAX_MESSAGE_SIZE or length < 1:
+                            break
+                        data = b"<" + await reader.readexactly(length - 1)
+                        self.handle_message(data, sender)
+                        continue
+                self.handle_message(await self._read_line(reader, prefix), sender)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Mevcut event loop üzerinde dinlemeye başla."""
+        loop = asyncio.get_running_loop()
+        if self.udp_port is not None:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: SyslogUDPProtocol(self),
+                local_addr=(self.host, self.udp_port),
+                reuse_port=REUSE_PORT
+            )
+            self.udp_port = self._transport.get_extra_info("sockname")[1]
+        if self.tcp_port is not None:
+            self._server = await asyncio.start_server(
+                self._handle_tcp, self.host, self.tcp_port,
+                limit=MAX_MESSAGE_SIZE, reuse_port=REUSE_PORT
+            )
+            self.tcp_port = self._server.sockets[0].getsockname()[1]
+        print(f"[INFO] Syslog dinleniyor: {self.host} udp={self.udp_port} tcp={self.tcp_port}")
+
+    async def stop(self) -> None:
+        """Dinlemeyi durdur."""
+        if self._transport is not None:
+            self._transport.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def start_background(self, timeout: float = 10.0) -> None:
+        """Ayrı bir thread'deki event loop'ta çalıştır (senkron daemon için).
+
+        Port bağlanamazsa (ya da `timeout` içinde açılamazsa) RuntimeError
+        fırlatır; daemon alıcısız çalışmaya devam etmez.
+        """
+        started = threading.Event()
+        errors: list[Exception] = []
+
+        def _run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start())
+            except Exception as e:
+                errors.append(e)
+                self._loop.close()
+                return
+            finally:
+                started.set()
+            self._loop.run_forever()
+
+        threading.Thread(target=_run, name="syslog-receiver", daemon=True).start()
+        if not started.wait(timeout=timeout):
+            raise RuntimeError(f"Syslog alıcısı {timeout}s içinde başlatılamadı")
+        if errors:
+            self._loop = None
+            raise RuntimeError(f"Syslog alıcısı başlatılamadı ({self.host}): {errors[0]}")
+
+    def stop_background(self) -> None:
+        """Arka plan event loop'unu durdur."""
+        if self._loop is not None:
+            future = asyncio.run_coroutine_threadsafe(self.stop(), self._loop)
+            future.result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+def create_syslog_receiver(network_config: dict, buffer: IngestBuffer) -> SyslogReceiver | None:
+    """`network_sources.syslog` ayarlarından alıcı oluştur (kapalıysa None)."""
+    syslog_config = network_config.get("syslog") or {}
+    if not syslog_config.get("enabled", False):
+        return None
+    return SyslogReceiver(
+        buffer,
+        source_name=syslog_config.get("name", "remote_syslog"),
+        source_type=syslog_config.get("type", "system"),
+        host=syslog_config.get("host", "0.0.0.0"),
+        udp_port=syslog_config.get("udp_port", 5514),
+        tcp_port=syslog_config.get("tcp_port", 5514)
+    )
@@ -0,0 +1,200 @@
+"""LLM çağrıları için dayanıklılık araçları (circuit breaker, retry budget, spill kuyruğu)."""
+
+import json
+import os
+import random
+import socket
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+from .log_reader import LogEntry
+
+
+class CircuitBreaker:
+    """Ardışık hatalarda backend'e istek göndermeyi durduran devre kesici.
+
+    Durumlar: `closed` (normal), `open` (istek yok), `half_open`
+    (reset süresi doldu, tek bir deneme isteğine izin var).
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """İstek gönderilebilir mi?"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                return True
+            return False
+
+    def record_success(self) -> None:
+        """Başarılı çağrıyı kaydet, devreyi kapat."""
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        """Başarısız çağrıyı kaydet, eşik aşıldıysa devreyi aç."""
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"[UYARI] Circuit breaker açıldı ({self.failures} ardışık hata)")
+                self.state = "open"
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+
+class RetryBudget:
+    """Tüm backend'ler için ortak retry bütçesi.
+
+    Her istek `ratio` kadar jeton biriktirir, her retry bir jeton harcar.
+    Böylece kesinti sırasında retry'lar toplam trafiği katlayamaz.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """İlk denemeyi kaydet (bütçeye jeton ekler)."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_acquire(self) -> bool:
+        """Retry için jeton al; bütçe tükendiyse False döner."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def available(self) -> float:
+        return self._tokens
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Üstel backoff, full jitter ile."""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class SpillQueue:
+    """Analiz edilemeyen batch'leri yerel diskte tutan kuyruk.
+
+    Her batch ayrı bir JSON dosyasıdır; dosya adı zaman damgası olduğu
+    için sıralama eklenme sırasını korur. Sahiplenilen batch
+    `<zaman>.<host>_<pid>.inflight` adını alır; sahibi ölen ya da
+    `inflight_timeout`'tan uzun süredir işlenen batch'ler açılışta
+    kuyruğa geri konur.
+    """
+
+    def __init__(self, directory: str, max_batches: int = 1000, inflight_timeout: float = 600.0):
+        self.directory = Path(directory)
+        self.max_batches = max_batches
+        self.inflight_timeout = inflight_timeout
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._owner = f"{socket.gethostname()}_{os.getpid()}"
+        self.reclaim_stale()
+
+    @staticmethod
+    def _owner_alive(owner: str) -> bool | None:
+        """Aynı host'taki sahibin süreci yaşıyor mu (başka host ise None)."""
+        host, _, pid = owner.rpartition("_")
+        if host != socket.gethostname() or not pid.isdigit():
+            return None
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def reclaim_stale(self) -> int:
+        """Sahibi ölmüş ya da zaman aşımına uğramış `.inflight` batch'leri kuyruğa geri koy."""
+        reclaimed = 0
+        now = time.time()
+        for path in self.directory.glob("*.inflight"):
+            owner = path.name[:-len(".inflight")].split(".", 1)[-1]
+            try:
+                expired = now - path.stat().st_mtime >= self.inflight_timeout
+            except FileNotFoundError:
+                continue
+            if owner == self._owner or not (expired or self._owner_alive(owner) is False):
+                continue
+            try:
+                self.unclaim(path)
+                reclaimed += 1
+            except FileNotFoundError:
+                continue
+        if reclaimed:
+            print(f"[INFO] Spill kuyruğunda yarım kalan {reclaimed} batch geri alındı")
+        return reclaimed
+
+    def push(self, backend_name: str, entries: list[LogEntry]) -> None:
+        """Batch'i diske yaz."""
+        with self._lock:
+            pending = self.pending()
+            if len(pending) >= self.max_batches:
+                # Disk sınırsız büyümesin, en eski batch düşer
+                print(f"[UYARI] Spill kuyruğu dolu, en eski batch siliniyor: {pending[0].name}")
+                pending[0].unlink(missing_ok=True)
+
+            path = self.directory / f"{time.time_ns()}.json"
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"backend": backend_name, "entries": [asdict(e) for e in entries]},
+                    f,
+                    ensure_ascii=False
+                )
+            os.replace(tmp_path, path)
+
+    def pending(self) -> list[Path]:
+        """Bekleyen batch dosyalarını eskiden yeniye döndür."""
+        return sorted(self.directory.glob("*.json"))
+
+    def claim(self, path: Path) -> Path | None:
+        """Batch'i atomik olarak sahiplen; başka bir worker aldıysa None döner."""
+        claimed = path.with_name(f"{path.stem}.{self._owner}.inflight")
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            return None
+        # Zaman aşımı sahiplenme anından sayılır
+        os.utime(claimed)
+        return claimed
+
+    def unclaim(self, claimed: Path) -> None:
+        """Sahiplenilen batch'i kuyruğa geri koy."""
+        os.rename(claimed, claimed.with_name(f"{claimed.name.split('.', 1)[0]}.json"))
+
+    def load(self, path: Path) -> tuple[str, list[LogEntry]]:
+        """Batch dosyasını oku."""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data["backend"], [LogEntry(**e) for e in data["entries"]]
+
+    def remove(self, path: Path) -> None:
+        """İşlenen batch'i kuyruktan sil."""
+        path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self.pending())
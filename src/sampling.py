@@ -0,0 +1,350 @@
+"""Yüksek hacimli kaynaklar için sabit bellekli sayım ve uyarlanabilir örnekleme."""
+
+import base64
+import hashlib
+import heapq
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .correlation import extract_entities
+from .log_reader import LogEntry
+from .scheduler import TEMPLATE_PATTERN
+from .search_index import extract_level
+
+# Bu seviyedeki satırlar örneklenmeden her zaman LLM'e gider
+ALWAYS_FORWARD_LEVELS = {"ERROR", "CRITICAL"}
+
+
+def line_template(line: str) -> str:
+    """Satırı değişken kısımları (sayı, hex, IP) atılmış kalıba indirge."""
+    return TEMPLATE_PATTERN.sub("#", line)[:160]
+
+
+class CountMinSketch:
+    """Sabit boyutlu yaklaşık frekans sayacı.
+
+    Tahmin hiçbir zaman gerçek sayının altında kalmaz; hata en fazla
+    toplam / width kadardır (depth satırdan en küçüğü alınır).
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows = [[0] * width for _ in range(depth)]
+        # Kalıplar çok tekrar eder; hash'ler sınırlı bir önbellekte tutulur
+        self._index_cache: dict[str, list[int]] = {}
+
+    def _indexes(self, key: str) -> list[int]:
+        indexes = self._index_cache.get(key)
+        if indexes is None:
+            digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4 * self.depth).digest()
+            indexes = [
+                int.from_bytes(digest[i * 4:i * 4 + 4], "little") % self.width
+                for i in range(self.depth)
+            ]
+            if len(self._index_cache) >= 4096:
+                self._index_cache.clear()
+            self._index_cache[key] = indexes
+        return indexes
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Sayacı artır ve yeni tahmini döndür."""
+        self.total += count
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += count
+            estimate = row[index] if estimate is None else min(estimate, row[index])
+        return estimate
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
+class HyperLogLog:
+    """Farklı değer sayısı için sabit bellekli tahminci (2^p register, ~%1.6 hata p=12)."""
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.size = 1 << precision
+        self._registers = bytearray(self.size)
+        self._alpha = 0.7213 / (1 + 1.079 / self.size)
+
+    def add(self, value: str) -> None:
+        h = int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+        index = h >> (64 - self.precision)
+        rest = h & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self._registers[index]:
+            self._registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Başka bir HLL'in kümesini bu HLL'e kat (birleşim: register bazında en büyük)."""
+        if other.precision != self.precision:
+            raise ValueError("Farklı hassasiyetteki HyperLogLog'lar birleştirilemez")
+        self._registers = bytearray(map(max, self._registers, other._registers))
+
+    def to_base64(self) -> str:
+        return base64.b64encode(bytes(self._registers)).decode("ascii")
+
+    @classmethod
+    def from_base64(cls, data: str, precision: int) -> "HyperLogLog":
+        hll = cls(precision)
+        registers = base64.b64decode(data)
+        if len(registers) != hll.size:
+            raise ValueError("HyperLogLog register sayısı hassasiyetle uyuşmuyor")
+        hll._registers = bytearray(registers)
+        return hll
+
+    def count(self) -> int:
+        estimate = self._alpha * self.size ** 2 / sum(2.0 ** -r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * self.size and zeros:
+            # Küçük kümelerde linear counting daha doğru
+            estimate = self.size * math.log(self.size / zeros)
+        return round(estimate)
+
+
+@dataclass
+class SourceSketch:
+    """Bir kaynağın pencere içindeki sayaçları."""
+    templates: CountMinSketch
+    ips: HyperLogLog
+    users: HyperLogLog
+    window_start: float
+    lines: int = 0
+    levels: Counter = field(default_factory=Counter)
+    # kalıp -> tahmini sayı; boyutu sınırlı aday listesi (heavy hitters)
+    top: dict = field(default_factory=dict)
+    previous_rate: float | None = None  # önceki pencerenin satır/sn değeri
+
+
+class AdaptiveSampler:
+    """LogReader ile analyzer arasında duran örnekleme aşaması.
+
+    Her satır sayılır: seviye sayıları kesin, kalıp sayıları count-min
+    sketch, farklı IP/kullanıcı sayıları HyperLogLog ile tutulur. Bir turda
+    `threshold_lines`'ı aşan kaynaktan yalnızca hata seviyesindeki satırlar,
+    pencerede nadir görülen kalıplar ve sabit boyutlu bir reservoir örneği
+    LLM'e gider; sayaç özetleri prompt'a eklenir. Bellek kaynak başına
+    sabittir ve sayaçlar her `window_seconds`'ta sıfırlanır.
+    """
+
+    def __init__(
+        self,
+        threshold_lines: int = 1000,
+        reservoir_size: int = 200,
+        rare_threshold: int = 3,
+        window_seconds: float = 300,
+        cms_width: int = 2048,
+        cms_depth: int = 4,
+        hll_precision: int = 12,
+        top_templates: int = 5
+    ):
+        self.threshold_lines = threshold_lines
+        self.reservoir_size = reservoir_size
+        self.rare_threshold = rare_threshold
+        self.window_seconds = window_seconds
+        self.cms_width = cms_width
+        self.cms_depth = cms_depth
+        self.hll_precision = hll_precision
+        self.top_templates = top_templates
+        self.sketches: dict[str, SourceSketch] = {}
+        self._random = random.Random()
+
+    def _new_sketch(self, now: float) -> SourceSketch:
+        return SourceSketch(
+            templates=CountMinSketch(self.cms_width, self.cms_depth),
+            ips=HyperLogLog(self.hll_precision),
+            users=HyperLogLog(self.hll_precision),
+            window_start=now
+        )
+
+    def _sketch(self, name: str, now: float) -> SourceSketch:
+        """Kaynağın sayaçları; pencere dolduysa yenisi (önceki hız taban çizgisi olarak saklanır)."""
+        sketch = self.sketches.get(name)
+        if sketch is None:
+            sketch = self.sketches[name] = self._new_sketch(now)
+        elif now - sketch.window_start >= self.window_seconds:
+            rate = sketch.lines / max(now - sketch.window_start, 1e-9)
+            sketch = self.sketches[name] = self._new_sketch(now)
+            sketch.previous_rate = rate
+        return sketch
+
+    def _track_top(self, sketch: SourceSketch, template: str, estimate: int) -> None:
+        """Sınırlı aday listesinde en sık kalıpları tut."""
+        top = sketch.top
+        if template in top or len(top) < self.top_templates * 4:
+            top[template] = estimate
+            return
+        smallest = min(top, key=top.get)
+        if top[smallest] < estimate:
+            del top[smallest]
+            top[template] = estimate
+
+    def process(self, entries: list[LogEntry]) -> tuple[list[LogEntry], dict[str, str]]:
+        """Satırları say, örnekle; (LLM'e gidecek satırlar, kaynak -> sayaç özeti) döndür."""
+        now = time.time()
+        by_source: dict[str, list[LogEntry]] = {}
+        for entry in entries:
+            by_source.setdefault(entry.source_name, []).append(entry)
+
+        forwarded: list[LogEntry] = []
+        summaries: dict[str, str] = {}
+        for name, source_entries in by_source.items():
+            sketch = self._sketch(name, now)
+            sample = len(source_entries) > self.threshold_lines
+
+            kept: list[tuple[int, LogEntry]] = []
+            reservoir: list[tuple[int, LogEntry]] = []
+            seen = 0  # reservoir'a aday olan (sıradan) satır sayısı
+            tick_levels: Counter = Counter()
+            tick_entities: set[tuple[str, str]] = set()  # HLL'e tur başına bir kez
+            for position, entry in enumerate(source_entries):
+                template = line_template(entry.line)
+                estimate = sketch.templates.add(template)
+                self._track_top(sketch, template, estimate)
+                level = extract_level(entry.line) or "NONE"
+                tick_levels[level] += 1
+                tick_entities.update(extract_entities(entry.line))
+
+                if not sample or level in ALWAYS_FORWARD_LEVELS or estimate <= self.rare_threshold:
+                    kept.append((position, entry))
+                    continue
+
+                # Reservoir sampling (Algorithm R)
+                if seen < self.reservoir_size:
+                    reservoir.append((position, entry))
+                else:
+                    j = self._random.randint(0, seen)
+                    if j < self.reservoir_size:
+                        reservoir[j] = (position, entry)
+                seen += 1
+
+            for kind, value in tick_entities:
+                if kind == "ip":
+                    sketch.ips.add(value)
+                elif kind == "user":
+                    sketch.users.add(value)
+            sketch.lines += len(source_entries)
+            sketch.levels.update(tick_levels)
+
+            # Kaynak içi sıra korunur
+            forwarded.extend(entry for _, entry in heapq.merge(kept, sorted(reservoir, key=lambda item: item[0]), key=lambda item: item[0]))
+            if sample:
+                summaries[name] = self.summarize(
+                    name, sketch, now, len(source_entries), tick_levels, len(kept) + len(reservoir)
+                )
+
+        return forwarded, summaries
+
+    def summarize(
+        self,
+        name: str,
+        sketch: SourceSketch,
+        now: float,
+        tick_lines: int,
+        tick_levels: Counter,
+        forwarded: int
+    ) -> str:
+        """Kaynağın tur ve pencere sayaçlarını prompt için metne dök."""
+        elapsed = max(now - sketch.window_start, 1.0)
+        levels = ", ".join(f"{level}={count}" for level, count in tick_levels.most_common())
+        lines = [
+            f"- {name}: bu turda {tick_lines} satır ({levels}), {forwarded} tanesi yukarıda; "
+            f"kalanı örneklendi",
+            f"    son {int(elapsed)}s: {sketch.lines} satır ({sketch.lines / elapsed:.1f}/s"
+            + (f", önceki pencere {sketch.previous_rate:.1f}/s" if sketch.previous_rate is not None else "")
+            + f"), ~{sketch.ips.count()} farklı IP, ~{sketch.users.count()} farklı kullanıcı",
+        ]
+        for template, _ in sorted(sketch.top.items(), key=lambda item: -item[1])[:self.top_templates]:
+            lines.append(f"    ~{sketch.templates.estimate(template)}x kalıp: {template}")
+        return "\n".join(lines)
+
+    def export(self) -> dict:
+        """Süreçler arası birleştirilebilir pencere sayaçları (HLL register'ları dahil)."""
+        return {
+            name: {
+                "window_start": sketch.window_start,
+                "lines": sketch.lines,
+                "levels": dict(sketch.levels),
+                "previous_rate": sketch.previous_rate,
+                "hll_precision": self.hll_precision,
+                "ips": sketch.ips.to_base64(),
+                "users": sketch.users.to_base64()
+            }
+            for name, sketch in self.sketches.items()
+        }
+
+    def stats(self) -> dict:
+        """Kaynak bazlı pencere sayaçları."""
+        return merge_stats([self.export()])
+
+
+def merge_stats(exports: list[dict]) -> dict:
+    """Birden fazla sürecin (web, daemon worker'ları) `export()` çıktılarını birleştir.
+
+    Satır ve seviye sayıları ile hızlar toplanır; farklı IP/kullanıcı
+    sayıları HLL birleşimiyle hesaplanır, böylece iki süreçte görülen
+    aynı IP bir kez sayılır.
+    """
+    merged: dict[str, dict] = {}
+    for export in exports:
+        for name, data in export.items():
+            precision = data["hll_precision"]
+            ips = HyperLogLog.from_base64(data["ips"], precision)
+            users = HyperLogLog.from_base64(data["users"], precision)
+            target = merged.get(name)
+            if target is None:
+                merged[name] = {
+                    "window_start": data["window_start"],
+                    "lines": data["lines"],
+                    "levels": Counter(data["levels"]),
+                    "previous_rate": data["previous_rate"],
+                    "ips": ips,
+                    "users": users
+                }
+                continue
+            target["window_start"] = min(target["window_start"], data["window_start"])
+            target["lines"] += data["lines"]
+            target["levels"].update(data["levels"])
+            if data["previous_rate"] is not None:
+                target["previous_rate"] = (target["previous_rate"] or 0.0) + data["previous_rate"]
+            if ips.precision == target["ips"].precision:
+                target["ips"].merge(ips)
+                target["users"].merge(users)
+            else:
+                # Hassasiyeti farklı (reload sırasında) süreçler için alt sınır
+                target["ips"] = max(target["ips"], ips, key=HyperLogLog.count)
+                target["users"] = max(target["users"], users, key=HyperLogLog.count)
+
+    return {
+        name: {
+            "window_start": data["window_start"],
+            "lines": data["lines"],
+            "levels": dict(data["levels"]),
+            "distinct_ips": data["ips"].count(),
+            "distinct_users": data["users"].count(),
+            "previous_rate": data["previous_rate"]
+        }
+        for name, data in merged.items()
+    }
+
+
+def create_sampler(sampling_config: dict) -> AdaptiveSampler | None:
+    """`sampling` ayarlarından örnekleyici oluştur (kapalıysa None)."""
+    if not sampling_config.get("enabled", False):
+        return None
+    return AdaptiveSampler(
+        threshold_lines=sampling_config.get("threshold_lines", 1000),
+        reservoir_size=sampling_config.get("reservoir_size", 200),
+        rare_threshold=sampling_config.get("rare_threshold", 3),
+        window_seconds=sampling_config.get("window_seconds", 300),
+        cms_width=sampling_config.get("cms_width", 2048),
+        cms_depth=sampling_config.get("cms_depth", 4),
+        hll_precision=sampling_config.get("hll_precision", 12),
+        top_templates=sampling_config.get("top_templates", 5)
+    )
@@ -0,0 +1,295 @@
+"""Kaynak bazlı öncelik, token kotası ve ağırlıklı adil (weighted-fair) zamanlama."""
+
+import heapq
+import math
+import random
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .llm_backends import SYSTEM_PROMPT
+from .log_reader import LogEntry
+
+# Taşan satırları kalıplara indirgemek için sayılar ve hex değerler tek işarete iner
+# (IP'ler #.#.#.# olur)
+TEMPLATE_PATTERN = re.compile(r"0x[0-9a-fA-F]+|\d+")
+
+
+class TokenBucket:
+    """Dakikalık hızla dolan token kovası.
+
+    `rate_per_minute` 0 ise sınırsızdır. Kapasite varsayılan olarak bir
+    dakikalık kotadır; boş başlayan bir kaynak ilk turda tüm kotasını
+    harcayabilir.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        self.rate_per_minute = rate_per_minute
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate_per_minute <= 0
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_minute / 60)
+        self._updated = now
+
+    def can_consume(self, amount: float) -> bool:
+        return self.unlimited or self.tokens >= amount
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self.tokens -= amount
+
+    def reconfigure(self, rate_per_minute: float) -> None:
+        """Hızı değiştir; mevcut doluluk oranı korunur."""
+        self.refill()
+        ratio = self.tokens / self.capacity if self.capacity > 0 else 1.0
+        self.rate_per_minute = rate_per_minute
+        self.capacity = rate_per_minute
+        self.tokens = self.capacity * ratio
+
+    @property
+    def usage(self) -> float:
+        """Kotanın kullanılan oranı (0-1)."""
+        if self.unlimited or self.capacity <= 0:
+            return 0.0
+        self.refill()
+        return round(1 - self.tokens / self.capacity, 3)
+
+
+@dataclass
+class SourceState:
+    """Bir kaynağın zamanlama ayarları ve sayaçları."""
+    priority: float = 1.0
+    max_lines_per_tick: int = 0  # 0: sınırsız
+    bucket: TokenBucket = field(default_factory=lambda: TokenBucket(0))
+    admitted_lines: int = 0
+    overflow_lines: int = 0
+    tokens_used: int = 0
+    last_admitted: int = 0
+    last_overflow: int = 0
+    throttled_since: float | None = None
+
+
+class SourceScheduler:
+    """Analyzer'ın önünde duran, kaynakları öncelik ağırlığıyla paylaştıran zamanlayıcı.
+
+    Her turda kaynak önce `max_lines_per_tick` ile kırpılır. Kalan satırlar,
+    en düşük `alınan token / priority` değerine sahip kaynaktan başlanarak
+    tek tek kabul edilir (start-time fair queuing); her satır hem kaynağın
+    hem de ortak (OpenAI limiti) kovadan token harcar. Her `batch_size`
+    satırlık batch'i açan satır ortak kovadan ayrıca prompt şablonu ve
+    yanıt rezervi (`max_tokens`) kadar harcar; kaynak kovaları bu maliyeti
+    satır başına eşit pay olarak öder. Kotaya sığmayan satırlar
+    kuyruklanmaz: sayılır, örneklenir ve prompt'a özet olarak girer.
+    """
+
+    def __init__(
+        self,
+        max_tokens_per_minute: float = 0,
+        chars_per_token: float = 4.0,
+        overflow_samples: int = 5,
+        default_priority: float = 1.0
+    ):
+        self.bucket = TokenBucket(max_tokens_per_minute)
+        self.chars_per_token = chars_per_token
+        self.overflow_samples = overflow_samples
+        self.default_priority = default_priority
+        self.batch_size = 1
+        self.batch_overhead_tokens = 0
+        self.sources: dict[str, SourceState] = {}
+        self._random = random.Random()
+
+    def configure(self, log_sources: list[dict], scheduler_config: dict | None = None) -> None:
+        """Kaynak ayarlarını uygula; mevcut sayaçlar ve kova dolulukları korunur."""
+        scheduler_config = scheduler_config or {}
+        self.bucket.reconfigure(scheduler_config.get("max_tokens_per_minute", 0))
+        self.chars_per_token = scheduler_config.get("chars_per_token", 4.0)
+        self.overflow_samples = scheduler_config.get("overflow_samples", 5)
+        self.default_priority = scheduler_config.get("default_priority", 1.0)
+
+        for source in log_sources:
+            state = self.sources.setdefault(source["name"], SourceState())
+            state.priority = source.get("priority", self.default_priority)
+            state.max_lines_per_tick = source.get("max_lines_per_tick", 0)
+            state.bucket.reconfigure(source.get("max_tokens_per_minute", 0))
+
+    def configure_batches(self, batch_size: int, prompt_template: str, completion_tokens: int) -> None:
+        """Batch başına sabit maliyeti ayarla: sistem prompt'u + şablon + yanıt rezervi."""
+        self.batch_size = max(1, batch_size)
+        template_chars = len(SYSTEM_PROMPT) + len(prompt_template.replace("{logs}", ""))
+        self.batch_overhead_tokens = math.ceil(template_chars / self.chars_per_token) + completion_tokens
+
+    def _state(self, name: str) -> SourceState:
+        """Kaynağın durumu; config'de olmayan (ağ) kaynaklar varsayılanlarla eklenir."""
+        if name not in self.sources:
+            self.sources[name] = SourceState(priority=self.default_priority)
+        return self.sources[name]
+
+    def estimate_tokens(self, entry: LogEntry) -> int:
+        """Satırın prompt'ta kaplayacağı yaklaşık token sayısı."""
+        # `[kaynak:satır] ` öneki dahil
+        chars = len(entry.line) + len(entry.source_name) + 10
+        return max(1, math.ceil(chars / self.chars_per_token))
+
+    def schedule(self, entries: list[LogEntry]) -> tuple[list[LogEntry], dict[str, str]]:
+        """Turun satırlarını kotalara göre ayır.
+
+        (kabul edilen satırlar, kaynak -> taşma özeti) döndürür. Kabul
+        edilenler önceliğe göre sıralıdır; kaynak içi sıra korunur.
+        """
+        now = time.monotonic()
+        by_source: dict[str, list[LogEntry]] = {}
+        for entry in entries:
+            by_source.setdefault(entry.source_name, []).append(entry)
+
+        self.bucket.refill()
+        overflow: dict[str, list[LogEntry]] = {}
+        heap = []
+        for order, (name, source_entries) in enumerate(by_source.items()):
+            state = self._state(name)
+            state.bucket.refill()
+            limit = state.max_lines_per_tick
+            if limit and len(source_entries) > limit:
+                overflow[name] = source_entries[limit:]
+                source_entries = source_entries[:limit]
+            heapq.heappush(heap, (0.0, order, name, source_entries, 0))
+
+        admitted: dict[str, list[LogEntry]] = {name: [] for name in by_source}
+        served: Counter = Counter()  # bu turda kaynağın aldığı token
+        overhead_share = math.ceil(self.batch_overhead_tokens / self.batch_size)
+        admitted_count = 0
+        while heap:
+            _, order, name, source_entries, index = heapq.heappop(heap)
+            state = self.sources[name]
+            entry = source_entries[index]
+            line_cost = self.estimate_tokens(entry)
+            cost = line_cost + overhead_share
+            # Yeni bir batch açan satır, batch'in sabit maliyetini ortak kovaya yazar
+            global_cost = line_cost
+            if admitted_count % self.batch_size == 0:
+                global_cost += self.batch_overhead_tokens
+
+            if not (state.bucket.can_consume(cost) and self.bucket.can_consume(global_cost)):
+                # Kaynağın (ya da ortak kovanın) kotası bitti; kalanı taşar
+                overflow[name] = source_entries[index:] + overflow.get(name, [])
+                continue
+
+            state.bucket.consume(cost)
+            self.bucket.consume(global_cost)
+            admitted_count += 1
+            served[name] += cost
+            state.tokens_used += cost
+            admitted[name].append(entry)
+            if index + 1 < len(source_entries):
+                # Turda az pay almış kaynak öne geçer; priority payı büyütür
+                heapq.heappush(
+                    heap, (served[name] / state.priority, order, name, source_entries, index + 1)
+                )
+
+        for name in by_source:
+            state = self.sources[name]
+            dropped = len(overflow.get(name, []))
+            state.last_admitted = len(admitted[name])
+            state.last_overflow = dropped
+            state.admitted_lines += state.last_admitted
+            state.overflow_lines += dropped
+            if dropped and state.throttled_since is None:
+                state.throttled_since = now
+            elif not dropped:
+                state.throttled_since = None
+
+        ordered = sorted(admitted, key=lambda n: -self.sources[n].priority)
+        result = [entry for name in ordered for entry in admitted[name]]
+        summaries = {name: self.summarize_overflow(name, lines) for name, lines in overflow.items() if lines}
+        return result, summaries
+
+    def summarize_overflow(self, name: str, lines: list[LogEntry], top: int = 3) -> str:
+        """Taşan satırları en sık kalıplar ve rastgele örneklerle özetle."""
+        templates = Counter(TEMPLATE_PATTERN.sub("#", e.line)[:160] for e in lines)
+
+        # Reservoir sampling: satır sayısından bağımsız, eşit olasılıklı örnek
+        samples: list[LogEntry] = []
+        for i, entry in enumerate(lines):
+            if i < self.overflow_samples:
+                samples.append(entry)
+            else:
+                j = self._random.randint(0, i)
+                if j < self.overflow_samples:
+                    samples[j] = entry
+
+        parts = [f"- {name}: {len(lines)} satır kota nedeniyle analiz edilmedi"]
+        for template, count in templates.most_common(top):
+            parts.append(f"    {count}x kalıp: {template}")
+        for entry in sorted(samples, key=lambda e: e.line_number):
+            parts.append(f"    örnek ({entry.line_number}): {entry.line[:200]}")
+        return "\n".join(parts)
+
+    def stats(self) -> dict:
+        """Kaynak bazlı gecikme ve kota kullanımı."""
+        now = time.monotonic()
+        return {
+            "global": {
+                "max_tokens_per_minute": self.bucket.rate_per_minute,
+                "budget_usage": self.bucket.usage
+            },
+            "sources": {
+                name: {
+                    "priority": state.priority,
+                    "max_tokens_per_minute": state.bucket.rate_per_minute,
+                    "max_lines_per_tick": state.max_lines_per_tick,
+                    "budget_usage": state.bucket.usage,
+                    "tokens_used": state.tokens_used,
+                    "admitted_lines": state.admitted_lines,
+                    "overflow_lines": state.overflow_lines,
+                    "last_tick_admitted": state.last_admitted,
+                    "last_tick_overflow": state.last_overflow,
+                    # Kaynak kesintisiz kotaya takıldığı süre (0: tüm satırlar analiz ediliyor)
+                    "lag_seconds": round(now - state.throttled_since, 1) if state.throttled_since else 0.0
+                }
+                for name, state in self.sources.items()
+            }
+        }
+
+
+# Süreçler arasında toplanan sayaçlar; diğer alanlarda en yüksek değer alınır
+SUMMED_FIELDS = ("tokens_used", "admitted_lines", "overflow_lines", "last_tick_admitted", "last_tick_overflow")
+MAX_FIELDS = ("budget_usage", "lag_seconds")
+
+
+def merge_stats(stats_list: list[dict]) -> dict:
+    """Birden fazla sürecin (web, daemon worker'ları) `stats()` çıktılarını birleştir.
+
+    Sayaçlar toplanır; kota kullanımı ve gecikme için en kötü (en yüksek)
+    değer alınır. Ayarlar (priority, kotalar) ilk görülen süreçten gelir.
+    """
+    merged: dict = {"global": {}, "sources": {}}
+    for stats in stats_list:
+        for key, value in stats.get("global", {}).items():
+            merged["global"][key] = max(merged["global"].get(key, value), value)
+        for name, source in stats.get("sources", {}).items():
+            target = merged["sources"].get(name)
+            if target is None:
+                merged["sources"][name] = dict(source)
+                continue
+            for key in SUMMED_FIELDS:
+                if key in source:
+                    target[key] = target.get(key, 0) + source[key]
+            for key in MAX_FIELDS:
+                if key in source:
+                    target[key] = max(target.get(key, 0), source[key])
+    return merged
+
+
+def create_scheduler(config) -> SourceScheduler:
+    """Config'deki `scheduler` bölümü ve kaynak ayarlarından zamanlayıcı oluştur."""
+    scheduler = SourceScheduler()
+    scheduler.configure(config.log_sources, config.scheduler)
+    scheduler.configure_batches(config.batch_size, config.prompt_template, config.openai_max_tokens)
+    return scheduler
@@ -0,0 +1,312 @@
+"""Alınan log satırları için artımlı, günlük bölümlenmiş SQLite FTS5 arama indeksi."""
+
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .log_reader import LogEntry
+
+LEVELS = r"(CRITICAL|FATAL|ERROR|WARN(?:ING)?|INFO|DEBUG)"
+# Tek başına seviye alanı: `INFO`, `[ERROR]`, `<warn>`, `DEBUG:`
+LEVEL_TOKEN = re.compile(r"[\[<(]?" + LEVELS + r"[\]>)]?:?", re.IGNORECASE)
+# Python logging varsayılan biçimi: `ERROR:root:mesaj`, `WARNING:app.db:mesaj`
+LOGGER_LEVEL = re.compile(LEVELS + r":[\w.-]+:")
+# Anahtarlı seviye: `level=error`, `"level": "warn"`, `severity=INFO`
+KEYED_LEVEL = re.compile(
+    r"(?:^|[\s{,\"'])(?:level|severity|lvl)[\"']?\s*[=:]\s*[\"']?" + LEVELS + r"\b",
+    re.IGNORECASE
+)
+# RFC3164 başlığı: `Dec 16 10:00:01 host app[123]: `
+SYSLOG_HEADER = re.compile(r"(?:<\d+>)?[A-Z][a-z]{2} +\d{1,2} \d{2}:\d{2}:\d{2} \S+ [^\s:]+: *")
+# Seviyeden önce gelebilecek en fazla başlık alanı (tarih, saat, logger adı...)
+LEVEL_FIELDS = 4
+SEPARATORS = ("-", "|")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    source_name TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    line_number INTEGER NOT NULL,
+    level TEXT,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_source_ts ON entries(source_name, ts);
+CREATE INDEX IF NOT EXISTS idx_entries_source_id ON entries(source_name, id);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    line, content='entries', content_rowid='id', tokenize='unicode61'
+);
+"""
+
+
+def extract_level(line: str) -> str | None:
+    """Satırdaki log seviyesini normalize ederek döndür.
+
+    Seviye yalnızca alan konumunda aranır: anahtarlı (`level=...`), syslog
+    başlığından hemen sonra ya da satır başındaki başlık alanlarının
+    (rakam içeren, köşeli parantezli ya da `-`/`|` ile ayrılan, en fazla
+    `LEVEL_FIELDS`) ardından. Python logging'in `LEVEL:logger:mesaj`
+    biçimi de alan konumunda tanınır. `GET /api/debug/...` gibi mesaj
+    içindeki kelimeler sayılmaz.
+    """
+    match = KEYED_LEVEL.search(line, 0, 200)
+    if match is None:
+        header = SYSLOG_HEADER.match(line)
+        limit = 1 if header else LEVEL_FIELDS
+        fields = line[header.end() if header else 0:][:120].split()
+        seen = 0
+        for i, field in enumerate(fields):
+            if field in SEPARATORS:
+                continue
+            match = LEVEL_TOKEN.fullmatch(field) or LOGGER_LEVEL.match(field)
+            if match is not None:
+                break
+            seen += 1
+            header_field = (
+                any(c.isdigit() for c in field)
+                or field[0] in "[<("
+                or fields[i + 1:i + 2] in (["-"], ["|"])
+            )
+            if seen >= limit or not header_field:
+                break
+    if match is None:
+        return None
+    level = match.group(1).upper()
+    return {"WARN": "WARNING", "FATAL": "CRITICAL"}.get(level, level)
+
+
+def fts_query(term: str) -> str:
+    """Kullanıcı terimini güvenli bir FTS5 sorgusuna çevir.
+
+    Her kelime tırnaklı bir ifade olur (IP, path gibi noktalı terimler
+    sözdizimi hatası vermez); `*` ile biten kelimeler önek araması yapar.
+    """
+    parts = []
+    for token in term.split():
+        prefix = token.endswith("*")
+        token = token.rstrip("*")
+        if not token:
+            continue
+        quoted = '"' + token.replace('"', '""') + '"'
+        parts.append(quoted + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+class SearchIndex:
+    """Günlük SQLite dosyalarına bölümlenmiş tam metin ve alan arama indeksi.
+
+    Her gün ayrı bir `logs-YYYYMMDD.db` dosyasıdır; saklama süresi dolan
+    bölümler dosya olarak silinir, böylece retention O(1) kalır.
+    """
+
+    def __init__(self, directory: str, retention_days: int = 7):
+        self.directory = Path(directory)
+        self.retention_days = retention_days
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._connections: dict[str, sqlite3.Connection] = {}
+        self._lock = threading.Lock()
+
+    def _partition_path(self, day: datetime) -> Path:
+        return self.directory / f"logs-{day:%Y%m%d}.db"
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        """Bölüm dosyasına (önbellekli) bağlantı aç."""
+        key = str(path)
+        conn = self._connections.get(key)
+        if conn is None:
+            conn = sqlite3.connect(key, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._connections[key] = conn
+        return conn
+
+    def _partitions(self, since: float | None, until: float | None) -> list[Path]:
+        """Zaman aralığıyla kesişen mevcut bölümler, yeniden eskiye."""
+        paths = sorted(self.directory.glob("logs-*.db"), reverse=True)
+        result = []
+        for path in paths:
+            day = datetime.strptime(path.stem[5:], "%Y%m%d")
+            start, end = day.timestamp(), (day + timedelta(days=1)).timestamp()
+            if since is not None and end <= since:
+                continue
+            if until is not None and start > until:
+                continue
+            result.append(path)
+        return result
+
+    def add(self, entries: list[LogEntry], ts: float | None = None) -> None:
+        """Entry'leri içinde bulunulan günün bölümüne ekle (tek transaction)."""
+        if not entries:
+            return
+
+        ts = ts or time.time()
+        with self._lock:
+            conn = self._connect(self._partition_path(datetime.fromtimestamp(ts)))
+            # Daemon ve web aynı bölüme yazabilir; id aralığı kilit altında ayrılır
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries")
+                next_id = cursor.fetchone()[0] + 1
+                rows = [
+                    (next_id + i, ts, e.source_name, e.source_type, e.line_number,
+                     extract_level(e.line), e.line)
+                    for i, e in enumerate(entries)
+                ]
+                conn.executemany(
+                    "INSERT INTO entries(id, ts, source_name, source_type, line_number, level, line) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                conn.executemany(
+                    "INSERT INTO entries_fts(rowid, line) VALUES (?, ?)",
+                    [(row[0], row[6]) for row in rows]
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def search(
+        self,
+        term: str = "",
+        source: str | None = None,
+        source_type: str | None = None,
+        level: str | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        page: int = 1,
+        page_size: int = 50
+    ) -> dict:
+        """Terim, alan ve zaman aralığına göre ara; en yeni sonuçlar önce."""
+        query = fts_query(term)
+        conditions, params = [], []
+        if query:
+            conditions.append("e.id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?)")
+            params.append(query)
+        if source:
+            conditions.append("e.source_name = ?")
+            params.append(source)
+        if source_type:
+            conditions.append("e.source_type = ?")
+            params.append(source_type)
+        if level:
+            conditions.append("e.level = ?")
+            params.append(level.upper())
+        if since is not None:
+            conditions.append("e.ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("e.ts <= ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = (
+            "SELECT e.id, e.ts, e.source_name, e.source_type, e.line_number, e.level, e.line "
+            f"FROM entries e {where} ORDER BY e.ts DESC, e.id DESC LIMIT ?"
+        )
+
+        offset = (page - 1) * page_size
+        needed = offset + page_size + 1  # +1: sonraki sayfa var mı?
+        rows = []
+        with self._lock:
+            for path in self._partitions(since, until):
+                partition = path.stem[5:]
+                cursor = self._connect(path).execute(sql, [*params, needed - len(rows)])
+                rows.extend((partition, *row) for row in cursor.fetchall())
+                if len(rows) >= needed:
+                    break
+
+        page_rows = rows[offset:offset + page_size]
+        return {
+            "page": page,
+            "page_size": page_size,
+            "has_more": len(rows) > offset + page_size,
+            "results": [self._row_to_dict(row) for row in page_rows]
+        }
+
+    def context(self, partition: str, entry_id: int, before: int = 5, after: int = 5) -> list[dict]:
+        """Bir satırın aynı kaynaktaki öncesi ve sonrası."""
+        if not (partition.isdigit() and len(partition) == 8):
+            return []
+        path = self.directory / f"logs-{partition}.db"
+        if not path.exists():
+            return []
+
+        with self._lock:
+            conn = self._connect(path)
+            row = conn.execute("SELECT source_name FROM entries WHERE id = ?", (entry_id,)).fetchone()
+            if row is None:
+                return []
+            columns = "id, ts, source_name, source_type, line_number, level, line"
+            older = conn.execute(
+                f"SELECT {columns} FROM entries WHERE source_name = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (row[0], entry_id, before)
+            ).fetchall()
+            newer = conn.execute(
+                f"SELECT {columns} FROM entries WHERE source_name = ? AND id >= ? ORDER BY id LIMIT ?",
+                (row[0], entry_id, after + 1)
+            ).fetchall()
+
+        return [self._row_to_dict((partition, *r)) for r in [*reversed(older), *newer]]
+
+    def find_line(self, source: str, line: str) -> dict | None:
+        """Bir kaynaktaki satırın en yeni kaydını bul (alarm -> bağlam bağlantısı için)."""
+        query = fts_query(line)
+        sql = (
+            "SELECT id, ts, source_name, source_type, line_number, level, line FROM entries "
+            "WHERE source_name = ? AND line = ? "
+            + ("AND id IN (SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?) " if query else "")
+            + "ORDER BY id DESC LIMIT 1"
+        )
+        params = (source, line, query) if query else (source, line)
+
+        with self._lock:
+            for path in self._partitions(None, None):
+                row = self._connect(path).execute(sql, params).fetchone()
+                if row is not None:
+                    return self._row_to_dict((path.stem[5:], *row))
+        return None
+
+    def apply_retention(self) -> int:
+        """Saklama süresi dolmuş bölümleri sil; silinen bölüm sayısını döndür."""
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        removed = 0
+        with self._lock:
+            for path in self.directory.glob("logs-*.db"):
+                if path.stem[5:] >= cutoff:
+                    continue
+                conn = self._connections.pop(str(path), None)
+                if conn is not None:
+                    conn.close()
+                for suffix in ("", "-wal", "-shm"):
+                    Path(f"{path}{suffix}").unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _row_to_dict(row: tuple) -> dict:
+        partition, entry_id, ts, source_name, source_type, line_number, level, line = row
+        return {
+            "id": f"{partition}:{entry_id}",
+            "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            "source": source_name,
+            "type": source_type,
+            "line_number": line_number,
+            "level": level,
+            "line": line
+        }
+
+
+def create_search_index(search_config: dict) -> SearchIndex | None:
+    """`search` ayarlarından indeks oluştur (kapalıysa None)."""
+    if not search_config.get("enabled", False):
+        return None
+    return SearchIndex(
+        search_config.get("directory", "./index"),
+        retention_days=search_config.get("retention_days", 7)
+    )
@@ -0,0 +1,97 @@
+"""`--profile-startup` için import süresi ölçümü."""
+
+import importlib.abc
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _TimedLoader:
+    """Gerçek loader'ı saran ve `exec_module` süresini ölçen vekil."""
+
+    def __init__(self, loader, profiler: "ImportProfiler", name: str):
+        self._loader = loader
+        self._profiler = profiler
+        self._name = name
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(self._name, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Kurulduktan sonraki tüm import'ların kümülatif ve kendi sürelerini toplar.
+
+    Kümülatif süre alt import'ları içerir; kendi süresi (self) yalnızca
+    modülün kendi gövdesidir. `-X importtime` çıktısının süreç içi karşılığı.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records: list[tuple[str, float, float]] = []  # (modül, kümülatif, self)
+        self.phases: list[tuple[str, float]] = []
+        self._child_time: list[float] = []
+
+    def install(self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self, fullname)
+            return spec
+        return None
+
+    def _enter(self) -> None:
+        self._child_time.append(0.0)
+
+    def _exit(self, name: str, elapsed: float) -> None:
+        children = self._child_time.pop()
+        self.records.append((name, elapsed, elapsed - children))
+        if self._child_time:
+            self._child_time[-1] += elapsed
+
+    @contextmanager
+    def phase(self, name: str):
+        """Bir başlangıç aşamasının duvar saati süresini ölç."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, top: int = 15) -> None:
+        """Özet raporu stderr'e yaz."""
+        self.uninstall()
+        total = time.perf_counter() - self.started
+        import_total = sum(self_time for _, _, self_time in self.records)
+
+        out = sys.stderr
+        print("\n[PROFILE] Başlangıç profili", file=out)
+        print(f"  Toplam süre:        {total * 1000:8.1f} ms", file=out)
+        print(f"  Import süresi:      {import_total * 1000:8.1f} ms ({len(self.records)} modül)", file=out)
+        for name, elapsed in self.phases:
+            print(f"  {name + ':':<20}{elapsed * 1000:8.1f} ms", file=out)
+
+        print(f"\n  En yavaş {top} import (kümülatif / self, ms):", file=out)
+        for name, cumulative, self_time in sorted(self.records, key=lambda r: r[1], reverse=True)[:top]:
+            print(f"    {cumulative * 1000:8.1f} {self_time * 1000:8.1f}  {name}", file=out)
@@ -0,0 +1,87 @@
+"""Daemon worker'larının çalışma istatistiklerini web süreciyle paylaşan SQLite deposu."""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+
+class StatsStore:
+    """Tür (`scheduler`, `sampling` ...) ve worker başına tek satırlık istatistik deposu.
+
+    Her daemon worker'ı kendi satırlarını her turda üzerine yazar; web
+    süreci aynı dosyayı okuyup kendi sayaçlarıyla birleştirir. Web
+    süreci dosyayı yalnızca okur (`readonly`), tablo oluşturmaz.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS stats (
+        kind TEXT NOT NULL,
+        worker_id TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (kind, worker_id)
+    )
+    """
+
+    def __init__(self, db_path: str, readonly: bool = False):
+        self.db_path = db_path
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5, check_same_thread=False)
+        else:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(self.SCHEMA)
+        self._lock = threading.Lock()
+
+    def publish(self, kind: str, worker_id: str, data: dict) -> None:
+        """Worker'ın `kind` istatistiklerini yaz (öncekinin üzerine)."""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO stats(kind, worker_id, updated_at, data) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(kind, worker_id) DO UPDATE SET "
+                    "updated_at = excluded.updated_at, data = excluded.data",
+                    (kind, worker_id, time.time(), json.dumps(data))
+                )
+        except sqlite3.Error as e:
+            print(f"[UYARI] {kind} istatistikleri yazılamadı: {e}")
+
+    def read(self, kind: str, max_age: float | None = None) -> dict[str, dict]:
+        """worker -> {"updated_at": ISO zaman, "data": ...}; `max_age`'den eski satırlar atlanır."""
+        since = time.time() - max_age if max_age else 0
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT worker_id, updated_at, data FROM stats "
+                    "WHERE kind = ? AND updated_at >= ? ORDER BY worker_id",
+                    (kind, since)
+                ).fetchall()
+        except sqlite3.Error as e:
+            # Daemon tabloyu henüz oluşturmamış olabilir
+            print(f"[UYARI] {kind} istatistikleri okunamadı: {e}")
+            return {}
+        return {
+            worker: {"updated_at": datetime.fromtimestamp(updated_at).isoformat(), "data": json.loads(data)}
+            for worker, updated_at, data in rows
+        }
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def create_stats_store(stats_config: dict, readonly: bool = False) -> StatsStore | None:
+    """`stats.path` ayarlıysa paylaşılan istatistik deposunu aç.
+
+    `readonly` (web süreci) iken dosya henüz yoksa (daemon çalışmamışsa)
+    None döner; dosya oluşturulmaz.
+    """
+    path = stats_config.get("path")
+    if not path:
+        return None
+    if readonly and not Path(path).exists():
+        return None
+    return StatsStore(path, readonly=readonly)
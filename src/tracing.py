@@ -0,0 +1,254 @@
+"""Aşama bazlı süre ölçümü (span) ve isteğe bağlı OpenTelemetry köprüsü."""
+
+import io
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from datetime import datetime
+
+
+class _NoopSpan:
+    """Tracing kapalıyken kullanılan, hiçbir şey yapmayan span."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """Bir aşamanın süresini ölçen context manager.
+
+    Çıkışta süre tracer'ın aşama penceresine yazılır; OpenTelemetry
+    köprüsü açıksa aynı adla bir OTel span'i de açılıp kapanır (iç içe
+    span'ler OTel tarafında da parent-child ilişkisi kurar).
+    """
+
+    __slots__ = ("tracer", "name", "attributes", "_start", "_otel_cm", "_otel_span")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: dict):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self._otel_cm = None
+        self._otel_span = None
+
+    def __enter__(self):
+        if self.tracer.otel_tracer is not None:
+            self._otel_cm = self.tracer.otel_tracer.start_as_current_span(
+                self.name, attributes=self.attributes or None
+            )
+            self._otel_span = self._otel_cm.__enter__()
+        self._start = time.perf_counter()
+        return self
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+        if self._otel_span is not None:
+            self._otel_span.set_attribute(key, value)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracer.record(self.name, time.perf_counter() - self._start)
+        if self._otel_cm is not None:
+            return self._otel_cm.__exit__(exc_type, exc, tb)
+        return False
+
+
+class Tracer:
+    """Aşama sürelerini kayan pencerelerde tutan tracer.
+
+    Her aşama için son `window` ölçüm saklanır; yüzdelikler istek anında
+    bu pencereden hesaplanır. Ayrıca bir turun aşama toplamları
+    (`end_tick`) ve istek üzerine tek bir bloğun cProfile dökümü tutulur.
+    """
+
+    enabled = True
+
+    def __init__(self, window: int = 1000, otel_tracer=None):
+        self.window = window
+        self.otel_tracer = otel_tracer
+        self.stages: dict[str, deque] = {}
+        self.counts: dict[str, int] = {}
+        self.last_tick: dict[str, float] = {}
+        self.last_profile: dict | None = None
+        self._tick: dict[str, float] = {}
+        self._profile_requested = False
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes) -> Span:
+        return Span(self, name, attributes)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Bir aşama ölçümünü pencereye ve tur toplamına ekle."""
+        with self._lock:
+            samples = self.stages.get(name)
+            if samples is None:
+                samples = self.stages[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+            self.counts[name] = self.counts.get(name, 0) + 1
+            self._tick[name] = self._tick.get(name, 0.0) + seconds
+
+    def end_tick(self) -> dict[str, float]:
+        """Turun aşama toplamlarını (saniye) döndür ve sıfırla."""
+        with self._lock:
+            self.last_tick, self._tick = self._tick, {}
+        return self.last_tick
+
+    def timings(self) -> dict:
+        """Aşama bazlı p50/p90/p99/max (ms) ve son turun dökümü."""
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self.stages.items()}
+            counts = dict(self.counts)
+            last_tick = dict(self.last_tick)
+
+        def percentile(values: list[float], p: float) -> float:
+            return round(values[min(len(values) - 1, int(p * len(values)))] * 1000, 2)
+
+        return {
+            "window": self.window,
+            "stages": {
+                name: {
+                    "count": counts[name],
+                    "p50_ms": percentile(values, 0.50),
+                    "p90_ms": percentile(values, 0.90),
+                    "p99_ms": percentile(values, 0.99),
+                    "max_ms": round(values[-1] * 1000, 2),
+                    "mean_ms": round(sum(values) / len(values) * 1000, 2)
+                }
+                for name, values in sorted(snapshot.items())
+            },
+            "last_tick_ms": {name: round(seconds * 1000, 2) for name, seconds in last_tick.items()}
+        }
+
+    def request_profile(self) -> None:
+        """Bir sonraki `profile` bloğunun cProfile ile ölçülmesini iste."""
+        self._profile_requested = True
+
+    @property
+    def profile_requested(self) -> bool:
+        return self._profile_requested
+
+    def profile(self, label: str):
+        """İstek varsa bloğu cProfile ile ölç, yoksa no-op."""
+        if not self._profile_requested:
+            return _NOOP_SPAN
+        self._profile_requested = False
+        return _ProfileBlock(self, label)
+
+
+class _ProfileBlock:
+    """`Tracer.profile` bloğu; çıkışta en pahalı fonksiyonları metin olarak saklar."""
+
+    def __init__(self, tracer: Tracer, label: str, top: int = 30):
+        self.tracer = tracer
+        self.label = label
+        self.top = top
+        # cProfile/pstats yalnızca bir profil istendiğinde yüklenir
+        import cProfile
+
+        self._profiler = cProfile.Profile()
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        import pstats
+
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats("cumulative").print_stats(self.top)
+        self.tracer.last_profile = {
+            "label": self.label,
+            "captured_at": datetime.now().isoformat(),
+            "duration_ms": round((time.perf_counter() - self._start) * 1000, 2),
+            "text": out.getvalue()
+        }
+        return False
+
+
+class NoopTracer(Tracer):
+    """Varsayılan tracer: span'ler ölçülmez, yalnızca profil isteği çalışır."""
+
+    enabled = False
+
+    def span(self, name: str, **attributes) -> _NoopSpan:
+        return _NOOP_SPAN
+
+    def record(self, name: str, seconds: float) -> None:
+        pass
+
+
+_tracer: Tracer = NoopTracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def span(name: str, **attributes):
+    """Aktif tracer'da span aç (`with span("analyze"):`)."""
+    return _tracer.span(name, **attributes)
+
+
+def stamp_notify_latency(alerts: list) -> list:
+    """Hedefe gönderilmeden hemen önce `notify_latency` alanı güncellenmiş kopyalar döndür.
+
+    Aynı alarmlar birden fazla hedefin thread'ine gider; asıllar değiştirilmez.
+    """
+    now = time.time()
+    return [
+        replace(alert, notify_latency=round(now - alert.ingested_at, 3)) if alert.ingested_at else replace(alert)
+        for alert in alerts
+    ]
+
+
+def record_notify_latency(alerts: list, sink: str | None = None) -> None:
+    """Başarılı teslimden sonra okuma -> bildirim gecikmesini `ingest_to_notify` aşamasına yaz.
+
+    `sink` verilirse ölçüm ayrıca `ingest_to_notify:<sink>` aşamasına da yazılır.
+    """
+    now = time.time()
+    for alert in alerts:
+        if alert.ingested_at:
+            latency = now - alert.ingested_at
+            _tracer.record("ingest_to_notify", latency)
+            if sink is not None:
+                _tracer.record(f"ingest_to_notify:{sink}", latency)
+
+
+def configure_tracing(tracing_config: dict) -> Tracer:
+    """`tracing` ayarlarından süreç genelindeki tracer'ı kur.
+
+    Kapalıysa no-op tracer kullanılır. `opentelemetry: true` ise span'ler
+    `opentelemetry-api` üzerinden de açılır; exporter/SDK kurulumu
+    uygulamanın dışındadır (kurulu değilse OTel API'si de no-op'tur).
+    """
+    global _tracer
+
+    if not tracing_config.get("enabled", False):
+        _tracer = NoopTracer()
+        return _tracer
+
+    otel_tracer = None
+    if tracing_config.get("opentelemetry", False):
+        try:
+            from opentelemetry import trace
+
+            otel_tracer = trace.get_tracer("log-alarm-llm")
+        except ImportError:
+            print("[UYARI] opentelemetry-api kurulu değil, span'ler yalnızca yerel olarak ölçülecek")
+
+    _tracer = Tracer(window=tracing_config.get("window", 1000), otel_tracer=otel_tracer)
+    return _tracer
@@ -0,0 +1,31 @@
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.config import Config
+
+DEFAULT_CONFIG = Path(__file__).parent.parent / "config" / "config.yaml"
+
+
+@pytest.fixture
+def make_config(tmp_path):
+    """Varsayılan config'i verilen üst seviye bölümlerle ezip yükle.
+
+    Varsayılan backend ağa çıkmayan kural tabanlı backend'dir; tek log
+    kaynağı `tmp_path/app.log` dosyasıdır.
+    """
+    def _make(**sections) -> Config:
+        raw = yaml.safe_load(DEFAULT_CONFIG.read_text(encoding="utf-8"))
+        raw["openai"]["api_key"] = "test"
+        raw["llm_backends"] = {"rules": {"type": "rules"}}
+        raw["log_sources"] = [
+            {"name": "app", "path": str(tmp_path / "app.log"), "type": "application", "backend": "rules"}
+        ]
+        raw["search"] = {"enabled": False}
+        raw.update(sections)
+        path = tmp_path / "config.yaml"
+        path.write_text(yaml.safe_dump(raw, allow_unicode=True), encoding="utf-8")
+        return Config(str(path))
+
+    return _make
@@ -0,0 +1,173 @@
+import json
+import smtplib
+import threading
+import time
+from email import message_from_string
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.alerter import (
+    AlertManager,
+    BaseAlerter,
+    EmailAlerter,
+    QueuedAlerter,
+    SlackAlerter,
+    TeamsAlerter,
+    WebhookAlerter,
+)
+from src.llm_analyzer import Alert
+
+
+def _alert(severity: str = "error", summary: str = "Disk dolu", **fields) -> Alert:
+    return Alert(
+        severity=severity,
+        summary=summary,
+        details="/var doldu",
+        log_line="ERROR no space left on device",
+        recommendation="Eski logları temizleyin",
+        source_name="app",
+        source_type="application",
+        **fields
+    )
+
+
+@pytest.fixture
+def http_sink():
+    """Loopback'te POST gövdelerini kaydeden HTTP sunucusu; `/fail` 500 döner."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            received.append((self.path, json.loads(body)))
+            self.send_response(500 if self.path == "/fail" else 200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", received
+    server.shutdown()
+    server.server_close()
+
+
+def test_webhook_posts_generic_payload(http_sink):
+    url, received = http_sink
+    alerter = WebhookAlerter(f"{url}/hook", headers={"X-Token": "t"})
+
+    assert alerter.send([_alert(), _alert("warning", "Yavaş sorgu")])
+    alerter.close()
+
+    path, body = received[0]
+    assert path == "/hook"
+    assert body["count"] == 2
+    assert [a["summary"] for a in body["alerts"]] == ["Disk dolu", "Yavaş sorgu"]
+
+
+def test_webhook_non_2xx_is_a_failure(http_sink):
+    url, received = http_sink
+    alerter = WebhookAlerter(f"{url}/fail")
+
+    assert not alerter.send([_alert()])
+    alerter.close()
+    assert len(received) == 1
+
+
+def test_slack_payload(http_sink):
+    url, received = http_sink
+    alerter = SlackAlerter(url, name="slack")
+
+    assert alerter.send([_alert("critical", degraded=True)])
+    alerter.close()
+
+    body = received[0][1]
+    assert body["text"] == "Log Alarm: 1 yeni alarm"
+    attachment = body["attachments"][0]
+    assert attachment["title"] == "[CRITICAL] Disk dolu"
+    assert attachment["footer"] == "app (application)"
+    assert "kural tabanlı yedek analiz" in attachment["text"]
+
+
+def test_teams_payload_uses_peak_severity_color(http_sink):
+    url, received = http_sink
+    alerter = TeamsAlerter(url, name="teams")
+
+    assert alerter.send([_alert("warning"), _alert("critical", "Servis düştü")])
+    alerter.close()
+
+    body = received[0][1]
+    assert body["@type"] == "MessageCard"
+    assert body["themeColor"] == "dc3545"
+    assert [s["activityTitle"] for s in body["sections"]] == ["[WARNING] Disk dolu", "[CRITICAL] Servis düştü"]
+    assert body["sections"][0]["facts"][1] == {"name": "Öneri", "value": "Eski logları temizleyin"}
+
+
+class StubSMTP:
+    sent: list[tuple[str, list[str], str]] = []
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        pass
+
+    def sendmail(self, from_addr, to_addrs, message):
+        self.sent.append((from_addr, to_addrs, message))
+
+
+def test_queued_email_batches_alerts_into_one_message(monkeypatch):
+    StubSMTP.sent = []
+    monkeypatch.setattr(smtplib, "SMTP", StubSMTP)
+    email = EmailAlerter("smtp.local", 587, "u", "p", "alarm@local", ["ops@local"])
+    alerter = QueuedAlerter(email, batch_size=20, linger_seconds=5)
+
+    alerter.send([_alert(summary=f"Alarm {i}") for i in range(3)])
+    alerter.close()
+
+    assert len(StubSMTP.sent) == 1
+    from_addr, to_addrs, raw = StubSMTP.sent[0]
+    assert (from_addr, to_addrs) == ("alarm@local", ["ops@local"])
+    assert message_from_string(raw)["Subject"] == "[LOG ALARM] 3 yeni alarm tespit edildi"
+    assert alerter.stats()["sent"] == 3
+
+
+class RecordingAlerter(BaseAlerter):
+    def __init__(self, name: str):
+        self.name = name
+        self.batches: list[list[Alert]] = []
+
+    def send(self, alerts: list[Alert]) -> bool:
+        self.batches.append(alerts)
+        return True
+
+
+def test_each_sink_gets_its_own_stamped_copies():
+    manager = AlertManager()
+    direct = RecordingAlerter("direct")
+    queued = RecordingAlerter("queued")
+    manager.add_alerter(direct)
+    manager.add_alerter(QueuedAlerter(queued, linger_seconds=0))
+    alert = _alert(ingested_at=time.time() - 2)
+
+    manager.send_all([alert])
+    manager.close()
+
+    direct_copy, queued_copy = direct.batches[0][0], queued.batches[0][0]
+    assert alert.notify_latency is None
+    assert direct_copy is not alert and queued_copy is not alert and direct_copy is not queued_copy
+    assert direct_copy.notify_latency >= 2 and queued_copy.notify_latency >= 2
+    assert direct_copy.summary == queued_copy.summary == "Disk dolu"
@@ -0,0 +1,105 @@
+import gzip
+import os
+import time
+from datetime import datetime
+
+from src.backfill import expand_source_files, run_backfill
+
+
+def _touch(path, content: bytes = b"", age: float = 0.0):
+    if path.suffix == ".gz":
+        with gzip.open(path, "wb") as f:
+            f.write(content)
+    else:
+        path.write_bytes(content)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def test_numeric_rotation_runs_oldest_first(tmp_path):
+    base = tmp_path / "access.log"
+    for name, age in [("access.log", 0), ("access.log.1", 10), ("access.log.2.gz", 20), ("access.log.10.gz", 30)]:
+        _touch(tmp_path / name, age=age)
+
+    names = [p.name for p in expand_source_files({"path": str(base)})]
+
+    assert names == ["access.log.10.gz", "access.log.2.gz", "access.log.1", "access.log"]
+
+
+def test_date_suffixes_sort_by_date_not_as_index(tmp_path):
+    base = tmp_path / "access.log"
+    # mtime'lar bilerek ters: sıralama dosya adındaki tarihten gelmeli
+    for name, age in [
+        ("access.log", 0),
+        ("access.log-20251216", 30),
+        ("access.log-20251215.gz", 10),
+        ("access.log-20251130.gz", 20),
+        ("access.log-2025-12-17", 40),
+    ]:
+        _touch(tmp_path / name, age=age)
+
+    names = [p.name for p in expand_source_files({"path": str(base)})]
+
+    assert names == [
+        "access.log-20251130.gz",
+        "access.log-20251215.gz",
+        "access.log-20251216",
+        "access.log-2025-12-17",
+        "access.log"
+    ]
+
+
+def test_scan_streams_bounded_batches_in_file_order(tmp_path):
+    base = tmp_path / "app.log"
+    old = b"".join(b"2025-12-15 10:00:%02d old %d\n" % (i, i) for i in range(5))
+    new = b"".join(b"2025-12-16 10:00:%02d new %d\n" % (i, i) for i in range(3))
+    _touch(tmp_path / "app.log.1.gz", old, age=60)
+    _touch(base, new)
+    source = {"name": "app", "type": "application", "path": str(base)}
+
+    batches = list(run_backfill([source], None, None, workers=2, batch_lines=2))
+
+    assert [(p.name, len(entries)) for p, entries in batches] == [
+        ("app.log.1.gz", 2), ("app.log.1.gz", 2), ("app.log.1.gz", 1),
+        ("app.log", 2), ("app.log", 1)
+    ]
+    lines = [e.line for _, entries in batches for e in entries]
+    assert lines[0].endswith("old 0") and lines[4].endswith("old 4") and lines[-1].endswith("new 2")
+
+
+def test_scan_respects_time_window(tmp_path):
+    base = tmp_path / "app.log"
+    _touch(base, b"".join(b"2025-12-16 %02d:00:00 line %d\n" % (h, h) for h in range(10)))
+    source = {"name": "app", "type": "application", "path": str(base)}
+
+    batches = list(run_backfill(
+        [source], datetime(2025, 12, 16, 3), datetime(2025, 12, 16, 5), workers=1
+    ))
+
+    assert [e.line.split()[-1] for _, entries in batches for e in entries] == ["3", "4", "5"]
+
+
+def test_backfill_goes_through_scheduler_quota(make_config, tmp_path):
+    from src.main import LogAlarmApp
+
+    lines = b"".join(b"2025-12-16 10:00:%02d GET /?q=1 UNION SELECT %d\n" % (i, i) for i in range(40))
+    _touch(tmp_path / "app.log", lines)
+    config = make_config(
+        log_sources=[{
+            "name": "app", "path": str(tmp_path / "app.log"), "type": "application",
+            "backend": "rules", "max_lines_per_tick": 10
+        }],
+        backfill={"workers": 1, "batch_lines": 20},
+        incidents={"enabled": False},
+        sampling={"enabled": False}
+    )
+    app = LogAlarmApp(str(config.path))
+    try:
+        alert_count = app.run_backfill(None, None)
+    finally:
+        app.close()
+
+    # İki parça, her biri tur limitiyle kırpılır
+    stats = app.scheduler.stats()["sources"]["app"]
+    assert (stats["admitted_lines"], stats["overflow_lines"]) == (20, 20)
+    assert alert_count == 20
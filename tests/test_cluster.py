@@ -0,0 +1,82 @@
+import time
+
+from src.cluster import ClusterCoordinator, HashRing, LeaseTable
+from src.log_reader import LogReader
+
+SOURCES = [f"source-{i}" for i in range(200)]
+
+
+def test_hash_ring_is_deterministic_and_balanced():
+    ring = HashRing(["w1", "w2", "w3"])
+    owners = [ring.owner(s) for s in SOURCES]
+
+    assert owners == [HashRing(["w3", "w1", "w2"]).owner(s) for s in SOURCES]
+    for worker in ("w1", "w2", "w3"):
+        assert owners.count(worker) > len(SOURCES) / 6
+    assert HashRing([]).owner("x") is None
+
+
+def test_hash_ring_moves_only_the_removed_workers_keys():
+    before = HashRing(["w1", "w2", "w3"])
+    after = HashRing(["w1", "w2"])
+
+    for source in SOURCES:
+        if before.owner(source) != "w3":
+            assert after.owner(source) == before.owner(source)
+
+
+def test_lease_is_exclusive_until_it_expires(tmp_path):
+    table = LeaseTable(str(tmp_path / "leases.db"))
+
+    assert table.acquire("nginx", "w1", ttl=0.2) == (True, None)
+    assert table.acquire("nginx", "w2", ttl=0.2)[0] is False
+    assert table.save_position("nginx", "w1", 1234)
+    assert not table.save_position("nginx", "w2", 99)
+
+    time.sleep(0.25)
+    # Süresi dolan lease devralınır, offset korunur; eski sahip artık yazamaz
+    assert table.acquire("nginx", "w2", ttl=10) == (True, 1234)
+    assert not table.save_position("nginx", "w1", 5000)
+    assert table.owners() == {"nginx": "w2"}
+
+
+def test_released_lease_keeps_position(tmp_path):
+    table = LeaseTable(str(tmp_path / "leases.db"))
+    table.acquire("auth", "w1", ttl=30)
+    table.save_position("auth", "w1", 42)
+    table.release("auth", "w1")
+
+    assert table.acquire("auth", "w2", ttl=30) == (True, 42)
+
+
+def test_live_workers_follow_heartbeats(tmp_path):
+    table = LeaseTable(str(tmp_path / "leases.db"))
+    table.heartbeat("w1")
+    table.heartbeat("w2")
+    table.remove_worker("w2")
+
+    assert table.live_workers(ttl=30) == ["w1"]
+
+
+def test_coordinators_split_sources_and_take_over(tmp_path):
+    db_path = str(tmp_path / "leases.db")
+    sources = []
+    for i in range(8):
+        path = tmp_path / f"app{i}.log"
+        path.write_text("eski\n")
+        sources.append({"name": f"app{i}", "type": "application", "path": str(path)})
+
+    first = ClusterCoordinator(LogReader(sources), db_path, worker_id="w1", lease_ttl=30)
+    second = ClusterCoordinator(LogReader(sources), db_path, worker_id="w2", lease_ttl=30)
+    first.table.heartbeat("w1")
+    second.table.heartbeat("w2")
+
+    owned_first = {s["name"] for s in first.rebalance()}
+    owned_second = {s["name"] for s in second.rebalance()}
+    assert owned_first.isdisjoint(owned_second)
+    assert owned_first | owned_second == {s["name"] for s in sources}
+
+    # w2 düzgün kapanınca kaynakları w1'e geçer
+    second.shutdown()
+    assert {s["name"] for s in first.rebalance()} == {s["name"] for s in sources}
+    first.shutdown()
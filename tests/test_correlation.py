@@ -0,0 +1,119 @@
+from src.correlation import CorrelationEngine, EntityIndex, extract_entities
+from src.llm_analyzer import LLMAnalyzer
+from src.log_reader import LogEntry
+
+from tests.test_llm_backends import TEMPLATE, RecordingBackend
+
+
+def _entry(source: str, line: str, number: int = 1) -> LogEntry:
+    return LogEntry(source_name=source, source_type="application", line=line, line_number=number)
+
+
+def _lines(units) -> list[list[str]]:
+    return [[e.line for e in unit] for unit, _ in units]
+
+
+def test_extract_entities():
+    entities = extract_entities("Dec 16 10:00:01 web01 sshd[1]: Failed password for admin from 10.0.0.5 port 22")
+
+    assert entities == {("ip", "10.0.0.5"), ("user", "admin"), ("host", "web01")}
+
+
+def test_union_find_chains_shared_entities_transitively():
+    engine = CorrelationEngine()
+    entries = [
+        _entry("nginx", "10.0.0.1 GET /login", 1),
+        _entry("app", "login failed user=alice ip 10.0.0.2", 2),
+        _entry("nginx", "10.0.0.3 GET /", 3),
+        _entry("auth", "Failed password for alice from 10.0.0.1 port 22", 4),
+    ]
+
+    units = engine.group(entries, batch_size=3)
+
+    # 1 ve 4 IP, 2 ve 4 kullanıcı üzerinden tek birim; 3 ilişkisiz
+    assert _lines(units) == [
+        [entries[0].line, entries[1].line, entries[3].line],
+        [entries[2].line]
+    ]
+
+
+def test_host_does_not_group_lines():
+    engine = CorrelationEngine()
+    entries = [
+        _entry("syslog", "Dec 16 10:00:01 web01 cron[1]: job started", 1),
+        _entry("syslog", "Dec 16 10:00:02 web01 kernel: eth0 link up", 2),
+    ]
+
+    units = engine.group(entries, batch_size=1)
+
+    assert len(units) == 2
+
+
+def test_large_groups_are_split_and_small_ones_packed():
+    engine = CorrelationEngine()
+    entries = [_entry("nginx", f"10.0.0.9 GET /{i}", i) for i in range(5)]
+    entries += [_entry("nginx", f"10.0.1.{i} GET /", 10 + i) for i in range(3)]
+
+    units = engine.group(entries, batch_size=4)
+
+    assert [len(unit) for unit, _ in units] == [4, 1, 3]
+    assert all("10.0.0.9" in line for line in _lines(units)[0])
+
+
+def test_context_mentions_history_from_earlier_ticks():
+    engine = CorrelationEngine()
+    engine.group([_entry("auth", "Failed password for bob from 10.0.0.7 port 22")], batch_size=10)
+
+    (_, context), = engine.group([_entry("nginx", "10.0.0.7 GET /admin")], batch_size=10)
+
+    assert "ip 10.0.0.7" in context
+    assert "auth(1)" in context and "nginx(1)" in context
+
+
+def test_entity_index_evicts_least_recently_seen():
+    index = EntityIndex(max_entities=2)
+    entry = _entry("nginx", "x")
+    index.observe(("ip", "a"), entry, now=1)
+    index.observe(("ip", "b"), entry, now=2)
+    index.observe(("ip", "a"), entry, now=3)
+    index.observe(("ip", "c"), entry, now=4)
+
+    assert len(index) == 2
+    assert index.get(("ip", "b")) is None
+    assert index.get(("ip", "a")).count == 2
+
+
+def test_entity_index_expires_outside_window():
+    index = EntityIndex(window_seconds=10)
+    entry = _entry("nginx", "x")
+    index.observe(("ip", "old"), entry, now=0)
+    index.observe(("ip", "new"), entry, now=8)
+
+    index.expire(now=15)
+
+    assert index.get(("ip", "old")) is None
+    assert index.get(("ip", "new")) is not None
+
+
+def test_correlation_spans_sources_on_different_backends():
+    default = RecordingBackend("default")
+    local = RecordingBackend("local")
+    analyzer = LLMAnalyzer(
+        backend=default,
+        prompt_template=TEMPLATE,
+        source_backends={"auth": local},
+        resilience={"degraded_rules": False},
+        correlator=CorrelationEngine()
+    )
+
+    analyzer.analyze_batch([
+        _entry("nginx", "10.0.0.7 GET /admin", 1),
+        _entry("auth", "Failed password for bob from 10.0.0.7 port 22", 2),
+    ], batch_size=10)
+
+    # Birim backend başına bölünür; iki parça da ortak varlık geçmişini taşır
+    assert len(default.prompts) == 1 and len(local.prompts) == 1
+    assert "[auth:2]" not in default.prompts[0]
+    for prompt in (default.prompts[0], local.prompts[0]):
+        assert "ip 10.0.0.7" in prompt
+        assert "nginx(1)" in prompt and "auth(1)" in prompt
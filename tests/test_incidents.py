@@ -0,0 +1,42 @@
+from src.incidents import IncidentEngine
+from src.llm_analyzer import Alert
+
+
+def _alert(summary: str, ip: str) -> Alert:
+    return Alert(
+        severity="critical",
+        summary=summary,
+        details="",
+        log_line=f"{ip} - - \"GET /index.php HTTP/1.1\" 200",
+        recommendation="",
+        source_name="nginx",
+        source_type="webserver"
+    )
+
+
+def test_entity_match_does_not_chain_unrelated_alerts():
+    engine = IncidentEngine()
+    alerts = [
+        _alert("SQL injection denemesi", "1.1.1.1"),
+        _alert("XSS denemesi", "1.1.1.1"),
+        _alert("XSS denemesi", "9.9.9.9"),
+        _alert("Directory traversal denemesi", "9.9.9.9"),
+        _alert("Directory traversal denemesi", "7.7.7.7"),
+    ]
+
+    notified = engine.notifications(alerts)
+
+    first, second, third = engine.incidents.values()
+    assert (first.count, second.count, third.count) == (2, 2, 1)
+    assert second.title == "XSS denemesi"
+    assert third.title == "Directory traversal denemesi"
+    assert [a.incident_id for a in alerts] == [1, 1, 2, 2, 3]
+    assert len(notified) == 3
+
+
+def test_fingerprint_match_still_groups():
+    engine = IncidentEngine()
+    engine.notifications([_alert("SQL injection denemesi", "1.1.1.1")])
+    engine.notifications([_alert("SQL injection denemesi", "2.2.2.2")])
+
+    assert len(engine.incidents) == 1
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+
+import pytest
+
+from src.llm_analyzer import LLMAnalyzer
+from src.llm_backends import (
+    BaseLLMBackend,
+    OpenAICompatibleBackend,
+    RuleBasedBackend,
+    create_backend
+)
+from src.log_reader import LogEntry
+
+TEMPLATE = "Loglar:\n{logs}"
+
+
+class RecordingBackend(BaseLLMBackend):
+    """Gelen prompt'ları saklayan, alarmsız yanıt dönen backend."""
+
+    def __init__(self, name: str, max_concurrency: int = 4, delay: float = 0.0):
+        super().__init__(name, max_concurrency)
+        self.prompts: list[str] = []
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+            self.prompts.append(prompt)
+        return json.dumps({"alerts": [], "has_issues": False})
+
+
+def _entry(source: str, line: str, number: int = 1) -> LogEntry:
+    return LogEntry(source_name=source, source_type="application", line=line, line_number=number)
+
+
+def test_create_backend_types():
+    assert isinstance(create_backend("r", {"type": "rules"}), RuleBasedBackend)
+
+    local = create_backend("local", {"type": "openai_compatible", "base_url": "http://127.0.0.1:8080/v1"})
+    assert isinstance(local, OpenAICompatibleBackend)
+    assert local.base_url == "http://127.0.0.1:8080/v1"
+    assert local.api_key == "not-needed"
+
+    with pytest.raises(ValueError):
+        create_backend("x", {"type": "unknown"})
+
+
+def test_rule_backend_answers_in_llm_format():
+    backend = RuleBasedBackend()
+    prompt = TEMPLATE.format(logs="[nginx:1] GET /?id=1 UNION SELECT password\n[nginx:2] GET / 200")
+
+    data = json.loads(backend.complete(prompt, 100))
+
+    assert data["has_issues"] is True
+    assert [a["log_line"] for a in data["alerts"]] == ["GET /?id=1 UNION SELECT password"]
+    assert data["alerts"][0]["severity"] == "critical"
+
+
+def test_sources_are_routed_to_their_backend():
+    default = RecordingBackend("default")
+    local = RecordingBackend("local")
+    analyzer = LLMAnalyzer(
+        backend=default,
+        prompt_template=TEMPLATE,
+        source_backends={"auth": local},
+        resilience={"degraded_rules": False}
+    )
+
+    analyzer.analyze_batch([_entry("nginx", "a"), _entry("auth", "b"), _entry("nginx", "c")], batch_size=10)
+
+    assert len(default.prompts) == 1 and len(local.prompts) == 1
+    assert "[nginx:1] a" in default.prompts[0] and "[auth:1] b" not in default.prompts[0]
+    assert "[auth:1] b" in local.prompts[0]
+
+
+def test_backend_concurrency_is_limited():
+    backend = RecordingBackend("slow", max_concurrency=2, delay=0.05)
+    threads = [threading.Thread(target=backend.complete, args=("p", 10)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.peak == 2
+    assert len(backend.prompts) == 6
@@ -0,0 +1,71 @@
+from src.log_reader import LogReader
+
+
+def _source(path) -> dict:
+    return {"name": "app", "type": "application", "path": str(path)}
+
+
+def test_initialize_positions_skips_torn_tail(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"eski satir\nyarim sat")
+    source = _source(path)
+    reader = LogReader([source])
+    reader.initialize_positions()
+
+    with open(path, "ab") as f:
+        f.write(b"ir\nyeni satir\n")
+
+    assert [e.line for e in reader.read_new_lines(source)] == ["yarim satir", "yeni satir"]
+
+
+def test_read_last_n_lines_leaves_torn_tail_for_next_read(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"bir\niki\nuc\nyari")
+    source = _source(path)
+    reader = LogReader([source])
+
+    assert [e.line for e in reader.read_last_n_lines(source, n=2)] == ["iki", "uc"]
+
+    with open(path, "ab") as f:
+        f.write(b"m\n")
+
+    assert [e.line for e in reader.read_new_lines(source)] == ["yarim"]
+
+
+def test_timed_out_partial_is_not_emitted_twice(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    source = _source(path)
+    reader = LogReader([source], partial_timeout=0)
+    reader.initialize_positions()
+
+    with open(path, "ab") as f:
+        f.write(b"ilk satir\nuzun sat")
+    assert [e.line for e in reader.read_new_lines(source)] == ["ilk satir"]
+    assert [e.line for e in reader.read_new_lines(source)] == ["uzun sat"]
+
+    # Yazan satırı parça parça tamamlar
+    with open(path, "ab") as f:
+        f.write(b"ir devam")
+    assert list(reader.read_new_lines(source)) == []
+
+    with open(path, "ab") as f:
+        f.write(b"ediyor\nyeni satir\n")
+    assert [e.line for e in reader.read_new_lines(source)] == ["yeni satir"]
+
+
+def test_emitted_partial_record_is_dropped_on_rotation(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_bytes(b"")
+    source = _source(path)
+    reader = LogReader([source], partial_timeout=0)
+    reader.initialize_positions()
+
+    with open(path, "ab") as f:
+        f.write(b"uzun bir yarim satir")
+    list(reader.read_new_lines(source))
+    assert [e.line for e in reader.read_new_lines(source)] == ["uzun bir yarim satir"]
+
+    path.write_bytes(b"yeni\n")
+
+    assert [e.line for e in reader.read_new_lines(source)] == ["yeni"]
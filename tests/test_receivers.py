@@ -0,0 +1,171 @@
+import asyncio
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+from src import api
+from src.alerter import AlertManager, BaseAlerter
+from src.receivers import IngestBuffer, SyslogReceiver, parse_syslog
+from src.scheduler import create_scheduler
+
+
+def _wait_for(buffer: IngestBuffer, count: int, timeout: float = 5.0) -> list:
+    """Tamponda `count` satır birikene kadar bekle ve hepsini al."""
+    entries = []
+    deadline = time.monotonic() + timeout
+    while len(entries) < count and time.monotonic() < deadline:
+        entries += buffer.drain()
+        time.sleep(0.01)
+    return entries
+
+
+@pytest.fixture
+def receiver():
+    buffer = IngestBuffer()
+    receiver = SyslogReceiver(buffer, host="127.0.0.1", udp_port=0, tcp_port=0)
+    receiver.start_background()
+    yield receiver
+    receiver.stop_background()
+
+
+def test_parse_syslog_rfc5424_and_rfc3164():
+    rfc5424 = parse_syslog("<165>1 2025-12-16T10:00:00Z web01 nginx 42 - - upstream timed out")
+    rfc3164 = parse_syslog("<38>Dec 16 10:00:00 web01 sshd[42]: Failed password for root")
+
+    assert rfc5424["line"].endswith("upstream timed out")
+    assert "web01" in rfc5424["line"]
+    assert rfc3164["line"].endswith("Failed password for root")
+
+
+def test_udp_datagram_reaches_buffer(receiver):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.sendto(b"<38>Dec 16 10:00:00 web01 sshd[42]: Failed password for root", ("127.0.0.1", receiver.udp_port))
+
+    entries = _wait_for(receiver.buffer, 1)
+
+    assert len(entries) == 1
+    assert entries[0].source_name == "remote_syslog"
+    assert entries[0].line.endswith("Failed password for root")
+
+
+def _send_tcp(port: int, payload: bytes) -> None:
+    with socket.create_connection(("127.0.0.1", port)) as sock:
+        sock.sendall(payload)
+
+
+def test_tcp_octet_counted_frames(receiver):
+    messages = [b"<13>Dec 16 10:00:00 host app: first", b"<13>Dec 16 10:00:01 host app: second\nline"]
+    payload = b"".join(b"%d %s" % (len(m), m) for m in messages)
+
+    _send_tcp(receiver.tcp_port, payload)
+    entries = _wait_for(receiver.buffer, 2)
+
+    assert [e.line.split("app: ", 1)[1] for e in entries] == ["first", "second\nline"]
+
+
+def test_tcp_non_transparent_frames(receiver):
+    _send_tcp(receiver.tcp_port, b"<13>Dec 16 10:00:00 host app: first\r\n<13>Dec 16 10:00:01 host app: second\n")
+    entries = _wait_for(receiver.buffer, 2)
+
+    assert [e.line.rstrip("\r\n").split("app: ", 1)[1] for e in entries] == ["first", "second"]
+
+
+def test_tcp_digit_led_line_without_pri_is_not_dropped(receiver):
+    _send_tcp(
+        receiver.tcp_port,
+        b"2025-12-16 10:00:01 ERROR disk full\n"
+        b"12 workers started\n"
+        b"<13>Dec 16 10:00:02 host app: after\n"
+    )
+    entries = _wait_for(receiver.buffer, 3)
+    lines = [e.line.rstrip("\n") for e in entries]
+
+    assert lines[0] == "2025-12-16 10:00:01 ERROR disk full"
+    assert lines[1] == "12 workers started"
+    assert lines[2].endswith("app: after")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_http_ingest_over_loopback(make_config, monkeypatch):
+    import uvicorn
+
+    monkeypatch.setattr(api, "config", make_config())
+    monkeypatch.setattr(api, "ingest_buffer", IngestBuffer())
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(api.app, host="127.0.0.1", port=port, lifespan="off", log_level="error"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not server.started and time.monotonic() < deadline:
+            time.sleep(0.01)
+        body = "\n".join([
+            json.dumps({"source": "edge", "type": "webserver", "line": "GET /../../etc/passwd"}),
+            json.dumps("düz satır"),
+            "{bozuk"
+        ])
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("POST", "/api/ingest", body=body.encode("utf-8"))
+        response = conn.getresponse()
+        counts = json.loads(response.read())
+        conn.close()
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+    assert response.status == 202
+    assert counts == {"accepted": 2, "dropped": 0, "rejected": 1}
+    entries = api.ingest_buffer.drain()
+    assert [(e.source_name, e.line) for e in entries] == [
+        ("edge", "GET /../../etc/passwd"),
+        ("http", "düz satır")
+    ]
+
+
+class RecordingAlerter(BaseAlerter):
+    def __init__(self):
+        self.received = []
+
+    def send(self, alerts) -> bool:
+        self.received.extend(alerts)
+        return True
+
+
+def test_ingested_alerts_reach_alert_sinks(make_config, monkeypatch):
+    from src.llm_analyzer import create_analyzer
+
+    config = make_config(incidents={"enabled": False})
+    recorder = RecordingAlerter()
+    manager = AlertManager()
+    manager.add_alerter(recorder)
+    monkeypatch.setattr(api, "config", config)
+    monkeypatch.setattr(api, "ingest_buffer", IngestBuffer())
+    monkeypatch.setattr(api, "analyzer", create_analyzer(config))
+    monkeypatch.setattr(api, "scheduler", create_scheduler(config))
+    monkeypatch.setattr(api, "sampler", None)
+    monkeypatch.setattr(api, "search_index", None)
+    monkeypatch.setattr(api, "incident_engine", None)
+    monkeypatch.setattr(api, "alert_manager", manager)
+    monkeypatch.setattr(api, "alert_history", [])
+
+    async def run():
+        task = asyncio.create_task(api._flush_ingest_buffer(0.01))
+        api.ingest_buffer.push("10.0.0.1", "app", "application", "GET /?q=1 UNION SELECT password FROM users")
+        deadline = time.monotonic() + 5
+        while not recorder.received and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        task.cancel()
+
+    asyncio.run(run())
+
+    assert [a.summary for a in recorder.received] == ["SQL injection denemesi"]
+    assert api.alert_history[-1]["summary"] == "SQL injection denemesi"
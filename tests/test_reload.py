@@ -0,0 +1,83 @@
+import pytest
+
+from src.main import LogAlarmApp
+
+BACKENDS = {"rules": {"type": "rules"}, "strict": {"type": "rules"}}
+
+
+@pytest.fixture
+def app(make_config):
+    config = make_config(llm_backends=BACKENDS, correlation={"enabled": True})
+    app = LogAlarmApp(str(config.path))
+    yield app
+    app.close()
+
+
+def _reload(app, make_config, **sections) -> set:
+    before = app.config
+    make_config(**{"llm_backends": BACKENDS, "correlation": {"enabled": True}, **sections})
+    app._reload_requested = True
+    assert app._maybe_reload()
+    return before.changed_sections(app.config)
+
+
+def _track_closes(analyzer) -> list[str]:
+    closed = []
+    for backend in analyzer.backends.values():
+        backend.close = lambda name=backend.name: closed.append(name)
+    return closed
+
+
+def test_source_changes_update_analyzer_in_place(app, make_config, tmp_path):
+    analyzer = app.analyzer
+    closed = _track_closes(analyzer)
+    correlator = analyzer.correlator
+
+    _reload(app, make_config, log_sources=[
+        {"name": "app", "path": str(tmp_path / "app.log"), "type": "application", "backend": "rules"},
+        {"name": "auth", "path": str(tmp_path / "auth.log"), "type": "system", "backend": "strict"},
+    ])
+
+    assert app.analyzer is analyzer
+    assert analyzer.correlator is correlator
+    assert analyzer.source_backends["auth"] is analyzer.backends["strict"]
+    assert closed == []
+
+
+def test_resilience_changes_keep_breaker_state(app, make_config):
+    analyzer = app.analyzer
+    breaker = analyzer._breaker_for(analyzer.backends["rules"])
+    breaker.failures = 2
+
+    _reload(app, make_config, resilience={"failure_threshold": 9, "reset_timeout": 5})
+
+    assert app.analyzer is analyzer
+    assert analyzer.breakers["rules"] is breaker
+    assert (breaker.failures, breaker.failure_threshold, breaker.reset_timeout) == (2, 9, 5)
+
+
+def test_backend_changes_rebuild_and_close_old_backends(app, make_config):
+    old = app.analyzer
+    closed = _track_closes(old)
+    breaker = old._breaker_for(old.backends["rules"])
+    breaker.failures = 3
+    budget = old.retry_budget
+    correlator = old.correlator
+
+    changed = _reload(app, make_config, llm_backends={"rules": {"type": "rules", "max_concurrency": 2}})
+
+    assert changed == {"llm_backends"}
+    assert app.analyzer is not old
+    assert sorted(closed) == ["default", "rules", "strict"]
+    assert app.analyzer.breakers["rules"] is breaker
+    assert app.analyzer.retry_budget is budget
+    assert app.analyzer.correlator is correlator
+
+
+def test_close_closes_backends(make_config):
+    app = LogAlarmApp(str(make_config().path))
+    closed = _track_closes(app.analyzer)
+
+    app.close()
+
+    assert sorted(closed) == ["default", "rules"]
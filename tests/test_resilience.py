@@ -0,0 +1,152 @@
+import json
+import os
+import socket
+import time
+
+from src.llm_analyzer import LLMAnalyzer
+from src.llm_backends import BaseLLMBackend
+from src.log_reader import LogEntry
+from src.resilience import CircuitBreaker, RetryBudget, SpillQueue, backoff_delay
+
+
+class FlakyBackend(BaseLLMBackend):
+    """İlk `failures` çağrıda hata veren backend."""
+
+    def __init__(self, failures: int):
+        super().__init__("flaky")
+        self.failures = failures
+        self.calls = 0
+
+    def _complete(self, prompt: str, max_tokens: int) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("bağlantı reddedildi")
+        return json.dumps({"alerts": [], "has_issues": False})
+
+
+def _entries(count: int = 2) -> list[LogEntry]:
+    return [
+        LogEntry(source_name="app", source_type="application", line=f"ERROR db timeout {i}", line_number=i)
+        for i in range(1, count + 1)
+    ]
+
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.is_open and not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+    # Yarı açıkken tek hata devreyi tekrar açar
+    breaker.record_failure()
+    assert breaker.is_open
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_retry_budget_limits_retries_to_request_ratio():
+    budget = RetryBudget(ratio=0.5, max_tokens=2)
+    assert budget.try_acquire() and budget.try_acquire()
+    assert not budget.try_acquire()
+
+    budget.record_request()
+    assert not budget.try_acquire()
+    budget.record_request()
+    assert budget.try_acquire()
+
+
+def test_backoff_delay_is_capped():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, 1.0, 5.0) <= 5.0
+
+
+def test_spill_queue_claim_is_exclusive(tmp_path):
+    queue = SpillQueue(str(tmp_path))
+    queue.push("default", _entries())
+    [path] = queue.pending()
+
+    claimed = queue.claim(path)
+    assert claimed is not None and claimed.suffix == ".inflight"
+    assert queue.claim(path) is None
+    assert queue.pending() == []
+
+    backend, entries = queue.load(claimed)
+    assert backend == "default" and [e.line for e in entries] == [e.line for e in _entries()]
+
+    queue.unclaim(claimed)
+    assert queue.pending() == [path]
+    queue.remove(queue.claim(path))
+    assert len(queue) == 0
+
+
+def test_spill_queue_drops_oldest_when_full(tmp_path):
+    queue = SpillQueue(str(tmp_path), max_batches=2)
+    for backend in ("a", "b", "c"):
+        queue.push(backend, _entries(1))
+
+    assert [queue.load(p)[0] for p in queue.pending()] == ["b", "c"]
+
+
+def _write_inflight(directory, owner: str, age: float = 0.0):
+    path = directory / f"{time.time_ns()}.{owner}.inflight"
+    path.write_text(json.dumps({"backend": "default", "entries": []}))
+    if age:
+        past = time.time() - age
+        os.utime(path, (past, past))
+    return path
+
+
+def test_reclaim_returns_batches_of_dead_or_expired_owners(tmp_path):
+    host = socket.gethostname()
+    # Yaşayan bir süreç (bu test) ve kesinlikle yaşamayan bir pid
+    alive = _write_inflight(tmp_path, f"{host}_{os.getppid()}")
+    dead = _write_inflight(tmp_path, f"{host}_{2 ** 22 + 12345}")
+    remote_expired = _write_inflight(tmp_path, "other-host_1", age=120)
+
+    queue = SpillQueue(str(tmp_path), inflight_timeout=60)
+
+    assert alive.exists()
+    assert not dead.exists() and not remote_expired.exists()
+    assert len(queue.pending()) == 2
+
+
+def test_unreachable_backend_spills_and_degrades(tmp_path):
+    backend = FlakyBackend(failures=100)
+    analyzer = LLMAnalyzer(
+        backend=backend,
+        prompt_template="{logs}",
+        resilience={"max_retries": 1, "base_delay": 0, "spill_dir": str(tmp_path)}
+    )
+
+    alerts = analyzer.analyze(_entries())
+
+    assert backend.calls == 2
+    assert len(analyzer.spill_queue) == 1
+    assert alerts and all(a.degraded for a in alerts)
+
+    # Backend düzelince kuyruk tekrar oynatılır ve boşalır
+    backend.failures = 0
+    analyzer.replay_spilled()
+    assert len(analyzer.spill_queue) == 0
+
+
+def test_open_circuit_skips_backend(tmp_path):
+    backend = FlakyBackend(failures=100)
+    analyzer = LLMAnalyzer(
+        backend=backend,
+        prompt_template="{logs}",
+        resilience={"max_retries": 0, "failure_threshold": 1, "reset_timeout": 60, "spill_dir": str(tmp_path)}
+    )
+
+    analyzer.analyze(_entries())
+    analyzer.analyze(_entries())
+
+    assert backend.calls == 1
+    assert len(analyzer.spill_queue) == 2
@@ -0,0 +1,132 @@
+import asyncio
+from collections import Counter
+
+import pytest
+
+from src import api
+from src.log_reader import LogEntry
+from src.sampling import AdaptiveSampler, CountMinSketch, HyperLogLog, merge_stats
+from src.stats_store import create_stats_store
+
+
+def _entries(lines: list[str], source: str = "nginx") -> list[LogEntry]:
+    return [
+        LogEntry(source_name=source, source_type="webserver", line=line, line_number=i)
+        for i, line in enumerate(lines, start=1)
+    ]
+
+
+def test_count_min_sketch_never_underestimates():
+    sketch = CountMinSketch(width=64, depth=4)
+    truth = Counter()
+    for i in range(2000):
+        key = f"k{i % 300}"
+        truth[key] += 1
+        sketch.add(key)
+
+    for key, count in truth.items():
+        estimate = sketch.estimate(key)
+        assert count <= estimate <= count + 2 * sketch.total / sketch.width
+
+
+def test_hyperloglog_estimates_distinct_count():
+    hll = HyperLogLog(precision=12)
+    for i in range(20000):
+        hll.add(f"10.0.{i // 256 % 256}.{i % 256}-{i}")
+        hll.add(f"10.0.{i // 256 % 256}.{i % 256}-{i}")
+
+    assert hll.count() == pytest.approx(20000, rel=0.05)
+    assert HyperLogLog().count() == 0
+
+
+def test_hyperloglog_merge_is_a_union_and_survives_serialization():
+    a, b = HyperLogLog(10), HyperLogLog(10)
+    for i in range(1000):
+        a.add(f"ip-{i}")
+        b.add(f"ip-{i + 500}")
+
+    restored = HyperLogLog.from_base64(a.to_base64(), 10)
+    restored.merge(b)
+
+    assert restored.count() == pytest.approx(1500, rel=0.08)
+    with pytest.raises(ValueError):
+        restored.merge(HyperLogLog(12))
+
+
+def test_sampler_forwards_everything_below_threshold():
+    sampler = AdaptiveSampler(threshold_lines=10)
+    entries = _entries([f"GET /page/{i} 200" for i in range(5)])
+
+    forwarded, summaries = sampler.process(entries)
+
+    assert forwarded == entries
+    assert summaries == {}
+
+
+def test_sampler_keeps_errors_rare_lines_and_a_bounded_reservoir():
+    sampler = AdaptiveSampler(threshold_lines=50, reservoir_size=10, rare_threshold=1)
+    lines = [f"2025-12-16 10:00:00 INFO GET /health 200 from 10.0.0.{i % 50}" for i in range(500)]
+    lines[100] = "2025-12-16 10:00:00 ERROR upstream timed out"
+    lines[200] = "kernel: eth0 link down"
+
+    forwarded, summaries = sampler.process(_entries(lines))
+    forwarded_lines = [e.line for e in forwarded]
+
+    assert "2025-12-16 10:00:00 ERROR upstream timed out" in forwarded_lines
+    assert "kernel: eth0 link down" in forwarded_lines
+    assert len(forwarded) <= 10 + 3
+    assert [e.line_number for e in forwarded] == sorted(e.line_number for e in forwarded)
+    assert "bu turda 500 satır" in summaries["nginx"]
+    assert "~50 farklı IP" in summaries["nginx"]
+
+
+def test_window_rollover_keeps_previous_rate(monkeypatch):
+    from src import sampling
+
+    now = [1000.0]
+    monkeypatch.setattr(sampling.time, "time", lambda: now[0])
+    sampler = AdaptiveSampler(window_seconds=10)
+    sampler.process(_entries(["a"] * 50))
+
+    now[0] += 10
+    sampler.process(_entries(["b"]))
+
+    stats = sampler.stats()["nginx"]
+    assert stats["lines"] == 1
+    assert stats["previous_rate"] == pytest.approx(5.0)
+
+
+def test_merge_stats_unions_distinct_counts_across_processes():
+    web, daemon = AdaptiveSampler(), AdaptiveSampler()
+    web.process(_entries([f"GET / from 10.0.0.{i}" for i in range(20)], source="http"))
+    daemon.process(_entries([f"GET / from 10.0.0.{i}" for i in range(10, 30)], source="http"))
+    daemon.process(_entries(["Failed password for bob from 10.1.0.1 port 22"], source="auth"))
+
+    merged = merge_stats([web.export(), daemon.export()])
+
+    assert merged["http"]["lines"] == 40
+    assert merged["http"]["distinct_ips"] == 30
+    assert merged["auth"]["distinct_users"] == 1
+
+
+def test_daemon_sampling_stats_are_merged_into_endpoint(make_config, tmp_path, monkeypatch):
+    from src.main import LogAlarmApp
+
+    config = make_config(stats={"path": str(tmp_path / "stats.db")}, sampling={"enabled": True})
+    daemon = LogAlarmApp(str(config.path))
+    daemon.stats_store = create_stats_store(config.stats)
+    daemon.sampler = AdaptiveSampler()
+    daemon.sampler.process(_entries([f"GET / from 10.0.0.{i}" for i in range(5)], source="app"))
+    daemon._publish_stats()
+
+    monkeypatch.setattr(api, "config", config)
+    monkeypatch.setattr(api, "sampler", None)
+    monkeypatch.setattr(api, "stats_store", None)
+
+    response = asyncio.run(api.get_sampling_stats())
+    api.stats_store.close()
+    daemon.close()
+
+    assert list(response["daemons"]) == ["daemon"]
+    assert response["sources"]["app"]["lines"] == 5
+    assert response["sources"]["app"]["distinct_ips"] == 5
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from src import api, scheduler as scheduler_module
+from src.log_reader import LogEntry
+from src.scheduler import SourceScheduler, TokenBucket, merge_stats
+from src.stats_store import StatsStore, create_stats_store
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(scheduler_module.time, "monotonic", clock)
+    return clock
+
+
+def _entries(source: str, count: int, length: int = 30) -> list[LogEntry]:
+    return [
+        LogEntry(source_name=source, source_type="application", line="x" * length, line_number=i)
+        for i in range(count)
+    ]
+
+
+def test_token_bucket_refills_at_rate(clock):
+    bucket = TokenBucket(60)
+    bucket.consume(60)
+    assert not bucket.can_consume(1)
+
+    clock.now += 10
+    bucket.refill()
+
+    assert bucket.tokens == pytest.approx(10)
+    assert bucket.can_consume(10) and not bucket.can_consume(11)
+
+
+def test_token_bucket_caps_at_capacity_and_keeps_ratio_on_reconfigure(clock):
+    bucket = TokenBucket(100)
+    bucket.consume(75)
+    clock.now += 3600
+    bucket.refill()
+    assert bucket.tokens == 100
+
+    bucket.consume(50)
+    bucket.reconfigure(200)
+
+    assert (bucket.capacity, bucket.tokens) == (200, 100)
+    assert TokenBucket(0).unlimited and TokenBucket(0).can_consume(10 ** 9)
+
+
+def test_max_lines_per_tick_overflows_into_summary(clock):
+    scheduler = SourceScheduler(overflow_samples=2)
+    scheduler.configure([{"name": "nginx", "max_lines_per_tick": 3}])
+
+    admitted, overflow = scheduler.schedule(_entries("nginx", 10))
+
+    assert [e.line_number for e in admitted] == [0, 1, 2]
+    assert "7 satır kota nedeniyle analiz edilmedi" in overflow["nginx"]
+    stats = scheduler.stats()["sources"]["nginx"]
+    assert (stats["admitted_lines"], stats["overflow_lines"], stats["last_tick_overflow"]) == (3, 7, 7)
+
+
+def test_shared_budget_is_split_by_priority(clock):
+    scheduler = SourceScheduler()
+    scheduler.configure(
+        [{"name": "nginx", "priority": 1}, {"name": "auth", "priority": 3}],
+        {"max_tokens_per_minute": 1200, "chars_per_token": 1}
+    )
+
+    admitted, overflow = scheduler.schedule(_entries("nginx", 60, length=10) + _entries("auth", 60, length=10))
+
+    counts = {name: sum(e.source_name == name for e in admitted) for name in ("nginx", "auth")}
+    assert counts["nginx"] >= 10
+    assert counts["auth"] == pytest.approx(3 * counts["nginx"], abs=2)
+    assert set(overflow) == {"nginx", "auth"}
+    # Öncelikli kaynak önce gelir
+    assert admitted[0].source_name == "auth"
+
+
+def test_lag_grows_while_throttled(clock):
+    scheduler = SourceScheduler()
+    scheduler.configure([{"name": "nginx", "max_lines_per_tick": 1}])
+
+    scheduler.schedule(_entries("nginx", 2))
+    clock.now += 30
+    scheduler.schedule(_entries("nginx", 2))
+    assert scheduler.stats()["sources"]["nginx"]["lag_seconds"] == 30
+
+    scheduler.schedule(_entries("nginx", 1))
+    assert scheduler.stats()["sources"]["nginx"]["lag_seconds"] == 0
+
+
+def test_merge_stats_sums_counters_and_takes_worst_usage():
+    web = {
+        "global": {"max_tokens_per_minute": 1000, "budget_usage": 0.1},
+        "sources": {"http": {"priority": 1, "admitted_lines": 5, "overflow_lines": 0, "budget_usage": 0.1, "lag_seconds": 0}}
+    }
+    daemon = {
+        "global": {"max_tokens_per_minute": 1000, "budget_usage": 0.8},
+        "sources": {
+            "http": {"priority": 1, "admitted_lines": 2, "overflow_lines": 4, "budget_usage": 0.6, "lag_seconds": 12},
+            "nginx": {"priority": 2, "admitted_lines": 9, "overflow_lines": 1, "budget_usage": 0.3, "lag_seconds": 0}
+        }
+    }
+
+    merged = merge_stats([web, daemon])
+
+    assert merged["global"]["budget_usage"] == 0.8
+    assert merged["sources"]["http"] == {
+        "priority": 1, "admitted_lines": 7, "overflow_lines": 4, "budget_usage": 0.6, "lag_seconds": 12
+    }
+    assert merged["sources"]["nginx"]["admitted_lines"] == 9
+    # Girdiler değiştirilmez
+    assert web["sources"]["http"]["admitted_lines"] == 5
+
+
+def test_stats_store_readonly_does_not_create_file(tmp_path):
+    path = tmp_path / "stats.db"
+
+    assert create_stats_store({"path": str(path)}, readonly=True) is None
+    assert not path.exists()
+    assert create_stats_store({}) is None
+
+
+def test_stats_store_publish_overwrites_and_filters_stale(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.db"))
+    store.publish("scheduler", "w1", {"n": 1})
+    store.publish("scheduler", "w1", {"n": 2})
+    store.publish("sampling", "w1", {"other": True})
+    with store._conn:
+        store._conn.execute("INSERT INTO stats VALUES ('scheduler', 'dead', 0, '{}')")
+
+    reader = StatsStore(str(tmp_path / "stats.db"), readonly=True)
+    rows = reader.read("scheduler", max_age=300)
+
+    assert list(rows) == ["w1"]
+    assert rows["w1"]["data"] == {"n": 2}
+    assert set(reader.read("scheduler")) == {"dead", "w1"}
+    reader.close()
+    store.close()
+
+
+def test_daemon_scheduler_stats_are_merged_into_endpoint(make_config, tmp_path, monkeypatch):
+    from src.main import LogAlarmApp
+
+    stats_path = tmp_path / "data" / "stats.db"
+    config = make_config(stats={"path": str(stats_path), "max_age": 300})
+    daemon = LogAlarmApp(str(config.path))
+    daemon.stats_store = create_stats_store(config.stats)
+    daemon.scheduler.schedule(_entries("app", 4))
+    daemon._publish_stats()
+
+    web_scheduler = SourceScheduler()
+    web_scheduler.configure(config.log_sources)
+    web_scheduler.schedule(_entries("app", 3) + _entries("http", 2))
+    monkeypatch.setattr(api, "config", config)
+    monkeypatch.setattr(api, "scheduler", web_scheduler)
+    monkeypatch.setattr(api, "stats_store", None)
+
+    response = asyncio.run(api.get_scheduler_stats())
+    api.stats_store.close()
+    daemon.close()
+
+    assert list(response["daemons"]) == ["daemon"]
+    assert response["sources"]["app"]["admitted_lines"] == 7
+    assert response["sources"]["http"]["admitted_lines"] == 2
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.log_reader import LogEntry
+from src.search_index import SearchIndex, extract_level
+
+
+@pytest.mark.parametrize("line, level", [
+    ("2025-12-16 10:00:01 INFO  Application started successfully", "INFO"),
+    ("2025-12-16 10:00:01 [ERROR] InnoDB: Table is marked as crashed", "ERROR"),
+    ("2025-12-16 10:00:01,123 - payments - WARN - retrying", "WARNING"),
+    ("Dec 16 10:00:01 app-server myapp[42]: FATAL: out of memory", "CRITICAL"),
+    ('{"ts": 1734343201, "level": "debug", "msg": "cache miss"}', "DEBUG"),
+    ("ts=2025-12-16T10:00:01Z level=error msg=timeout", "ERROR"),
+    ("ERROR:root:database connection lost", "ERROR"),
+    ("WARNING:app.db:slow query (2.3s)", "WARNING"),
+    ("2025-12-16 10:00:01,123 CRITICAL:payments-worker:queue full", "CRITICAL"),
+])
+def test_extract_level_from_level_field(line, level):
+    assert extract_level(line) == level
+
+
+@pytest.mark.parametrize("line", [
+    '192.168.1.50 - - [16/Dec/2025:10:00:01] "GET /api/debug/timings HTTP/1.1" 200 1234',
+    'Dec 16 10:00:15 app-server nginx: 192.168.1.50 - - "GET /api/debug HTTP/1.1" 200 1234',
+    "2025-12-16 10:00:01 INFO-less message that later mentions an ERROR",
+    "Dec 16 10:00:01 server sshd[1234]: Accepted publickey for debug from 192.168.1.10",
+    "Retrying after ERROR:timeout:upstream",
+])
+def test_extract_level_ignores_words_in_message(line):
+    assert extract_level(line) is None
+
+
+def _entries(*lines: str) -> list[LogEntry]:
+    return [
+        LogEntry(source_name="app", source_type="application", line=line, line_number=i)
+        for i, line in enumerate(lines, start=1)
+    ]
+
+
+def test_search_by_term_and_level(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add(_entries(
+        "2025-12-16 10:00:01 INFO GET /api/users from 10.0.0.5",
+        "ERROR:root:connection to 10.0.0.5 refused",
+        "2025-12-16 10:00:03 ERROR disk full on /var",
+    ))
+
+    by_ip = index.search("10.0.0.5")
+    errors = index.search(level="error")
+    both = index.search("10.0.0.5", level="ERROR")
+
+    assert len(by_ip["results"]) == 2
+    assert [r["line_number"] for r in errors["results"]] == [3, 2]
+    assert [r["line"] for r in both["results"]] == ["ERROR:root:connection to 10.0.0.5 refused"]
+
+
+def test_search_pages_and_prefix_terms(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add(_entries(*(f"2025-12-16 10:00:{i:02d} INFO worker-{i} started" for i in range(5))))
+
+    first = index.search("start*", page=1, page_size=2)
+    last = index.search("start*", page=3, page_size=2)
+
+    assert first["has_more"] is True and len(first["results"]) == 2
+    assert last["has_more"] is False and len(last["results"]) == 1
+
+
+def test_context_returns_neighbours_from_same_source(tmp_path):
+    index = SearchIndex(str(tmp_path))
+    index.add(_entries("a", "b", "c", "d", "e"))
+    target = index.find_line("app", "c")
+
+    partition, entry_id = target["id"].split(":")
+    context = index.context(partition, int(entry_id), before=1, after=1)
+
+    assert [r["line"] for r in context] == ["b", "c", "d"]
+
+
+def test_retention_drops_old_partitions(tmp_path):
+    index = SearchIndex(str(tmp_path), retention_days=2)
+    index.add(_entries("old"), ts=(datetime.now() - timedelta(days=5)).timestamp())
+    index.add(_entries("new"))
+
+    assert index.apply_retention() == 1
+    assert [r["line"] for r in index.search()["results"]] == ["new"]
@@ -0,0 +1,43 @@
+import importlib
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+# --once yolunda yüklenmemesi gereken modüller
+HEAVY_MODULES = ["smtplib", "email.mime.text", "sqlite3", "cProfile", "pstats", "fastapi", "openai", "uvicorn"]
+
+ONCE_SCRIPT = """
+import json, sys
+from src.main import LogAlarmApp
+
+app = LogAlarmApp(sys.argv[1])
+app.run_once()
+app.close()
+print(json.dumps([m for m in json.loads(sys.argv[2]) if m in sys.modules]))
+"""
+
+
+def test_once_does_not_import_daemon_or_web_modules(make_config, tmp_path):
+    (tmp_path / "app.log").write_text("2025-12-16 10:00:01 ERROR out of memory\n", encoding="utf-8")
+    config = make_config(incidents={"enabled": False}, tracing={"enabled": False})
+
+    result = subprocess.run(
+        [sys.executable, "-c", ONCE_SCRIPT, str(config.path), json.dumps(HEAVY_MODULES)],
+        cwd=ROOT, capture_output=True, text=True, timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_importing_package_main_does_not_start_the_app(monkeypatch):
+    # spawn ile başlayan worker'lar giriş modülünü __main__ dışında bir adla import eder
+    monkeypatch.setattr(sys, "argv", ["worker"])
+    sys.modules.pop("src.__main__", None)
+
+    module = importlib.import_module("src.__main__")
+
+    assert not hasattr(module, "profiler")
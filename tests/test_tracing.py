@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+from src import api
+from src.llm_analyzer import Alert
+from src.stats_store import create_stats_store
+from src.tracing import configure_tracing, get_tracer, span, stamp_notify_latency
+
+
+@pytest.fixture(autouse=True)
+def reset_tracer():
+    yield
+    configure_tracing({})
+
+
+def _alert(ingested_at: float = 0.0) -> Alert:
+    return Alert("error", "Disk dolu", "", "ERROR disk", "", ingested_at=ingested_at)
+
+
+def test_stamp_notify_latency_returns_copies():
+    alerts = [_alert(time.time() - 3), _alert()]
+
+    stamped = stamp_notify_latency(alerts)
+
+    assert [a.notify_latency for a in alerts] == [None, None]
+    assert stamped[0] is not alerts[0] and stamped[0].notify_latency >= 3
+    assert stamped[1] is not alerts[1] and stamped[1].notify_latency is None
+
+
+def test_spans_are_recorded_only_when_enabled():
+    with span("analyze"):
+        pass
+    assert get_tracer().timings()["stages"] == {}
+
+    configure_tracing({"enabled": True, "window": 10})
+    with span("analyze"):
+        pass
+
+    assert get_tracer().timings()["stages"]["analyze"]["count"] == 1
+
+
+def _daemon(make_config, tmp_path, tracing_enabled: bool):
+    from src.main import LogAlarmApp
+
+    config = make_config(stats={"path": str(tmp_path / "stats.db")}, tracing={"enabled": tracing_enabled})
+    daemon = LogAlarmApp(str(config.path))
+    daemon.stats_store = create_stats_store(config.stats)
+    return config, daemon
+
+
+def test_daemon_timings_are_shown_in_endpoint(make_config, tmp_path, monkeypatch):
+    config, daemon = _daemon(make_config, tmp_path, tracing_enabled=True)
+    with span("tick"):
+        pass
+    daemon._publish_stats()
+
+    monkeypatch.setattr(api, "config", config)
+    monkeypatch.setattr(api, "stats_store", None)
+    response = asyncio.run(api.get_debug_timings())
+    api.stats_store.close()
+    daemon.close()
+
+    timings = response["daemons"]["daemon"]
+    assert timings["stages"]["tick"]["count"] == 1
+    assert "updated_at" in timings and timings["last_profile"] is None
+
+
+def test_timings_are_not_published_when_tracing_is_disabled(make_config, tmp_path):
+    config, daemon = _daemon(make_config, tmp_path, tracing_enabled=False)
+    daemon._publish_stats()
+
+    assert daemon.stats_store.read("timings") == {}
+    assert set(daemon.stats_store.read("scheduler")) == {"daemon"}
+    daemon.close()
+
+
+def test_timings_endpoint_does_not_create_the_store(make_config, tmp_path, monkeypatch):
+    config = make_config(stats={"path": str(tmp_path / "stats.db")})
+    monkeypatch.setattr(api, "config", config)
+    monkeypatch.setattr(api, "stats_store", None)
+
+    response = asyncio.run(api.get_debug_timings())
+
+    assert response["daemons"] == {}
+    assert not (tmp_path / "stats.db").exists()